@@ -0,0 +1,186 @@
+"""
+백그라운드 자동 저장 (디바운스 + 병합)
+
+- 화면 스레드는 직렬화한 상태를 넘기기만 하고(submit) 디스크 I/O는 저장소별 쓰기 스레드가 함
+- 디바운스 창(TIME_APP_AUTOSAVE_MS, 기본 500ms) 안에 들어온 요청은 마지막 것 하나로 병합
+  계속 클릭이 이어져도 max_delay(기본 5초)마다는 한 번씩 기록
+- 쓰기는 저장소의 원자성에 맡김: 저널은 추가 후 fsync(깨진 꼬리는 불러올 때 잘라냄),
+  스냅샷은 임시 파일 → os.replace
+- 저장소는 디스크 기록에 성공한 뒤에만 '마지막 기록 상태'를 바꿈(저널: 추가+fsync 후, SQLite: 커밋 후)
+  → 실패하면 다음 저장에서 같은 변경분이 다시 기록됨 (tests/test_autosave.py)
+- 세션이 끝날 때(세션 상태와 함께 SessionFlush가 수거될 때)와 프로세스 종료(atexit) 때 flush
+"""
+import atexit
+import copy
+import os
+import threading
+import time
+import weakref
+
+DEBOUNCE_SEC = float(os.environ.get("TIME_APP_AUTOSAVE_MS", "500")) / 1000
+MAX_DELAY_SEC = 5.0
+
+
+class AutosaveWriter:
+    def __init__(self, store, debounce: float = DEBOUNCE_SEC, max_delay: float = MAX_DELAY_SEC, name: str = ""):
+        self.store = store
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._cond = threading.Condition()
+        self._pending = None      # (payload, month) — 아직 기록하지 않은 마지막 요청
+        self._first_at = 0.0      # 대기 중인 요청이 처음 들어온 시각
+        self._last_at = 0.0       # 마지막 요청 시각
+        self._busy = False
+        self._flush_now = False
+        self._closed = False
+        self.stats = {"submitted": 0, "written": 0, "coalesced": 0, "dropped": 0, "failed": 0, "records": 0}
+        self.last_error = None
+        self.last_write_ms = None
+        self._thread = threading.Thread(target=self._loop, name=f"autosave-{name}", daemon=True)
+        self._thread.start()
+
+    # ---- 화면 스레드 ----
+    def submit(self, payload: dict, month=None):
+        """직렬화된 상태를 맡김. 세션 객체와 분리되도록 여기서 복사"""
+        payload = copy.deepcopy(payload)
+        with self._cond:
+            if self._closed:
+                self.stats["dropped"] += 1
+                return
+            now = time.monotonic()
+            if self._pending is not None:
+                self.stats["coalesced"] += 1
+            else:
+                self._first_at = now
+            self._pending = (payload, month)
+            self._last_at = now
+            self.stats["submitted"] += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """대기 중인 요청을 바로 기록하고 끝날 때까지 기다림 (시간 안에 끝나면 True)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if self._pending is not None:
+                self._flush_now = True
+                self._cond.notify_all()
+            while self._pending is not None or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def discard(self):
+        """대기 중인 요청 버리기 (초기화 직전 등)"""
+        with self._cond:
+            if self._pending is not None:
+                self._pending = None
+                self.stats["dropped"] += 1
+            self._cond.notify_all()
+
+    def close(self, timeout: float = 10.0) -> bool:
+        ok = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            if self._pending is not None:
+                self._pending = None
+                self.stats["dropped"] += 1
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return ok
+
+    @property
+    def pending(self) -> bool:
+        return self._pending is not None or self._busy
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return dict(self.stats, pending=self.pending, last_error=self.last_error, last_write_ms=self.last_write_ms)
+
+    # ---- 쓰기 스레드 ----
+    def _next(self):
+        """기록할 요청을 디바운스 후 꺼냄. 닫히면 None"""
+        with self._cond:
+            while True:
+                if self._pending is None:
+                    if self._closed:
+                        return None
+                    self._cond.wait()
+                    continue
+                if self._flush_now or self._closed:
+                    break
+                due = min(self._last_at + self.debounce, self._first_at + self.max_delay)
+                wait = due - time.monotonic()
+                if wait <= 0:
+                    break
+                self._cond.wait(wait)
+            item = self._pending
+            self._pending = None
+            self._flush_now = False
+            self._busy = True
+            return item
+
+    def _loop(self):
+        while True:
+            item = self._next()
+            if item is None:
+                return
+            payload, month = item
+            t0 = time.perf_counter()
+            try:
+                n = self.store.save(payload, month=month)
+                error = None
+            except Exception as e:  # 다음 저장에서 같은 변경분이 다시 기록됨
+                n = 0
+                error = f"{type(e).__name__}: {e}"
+            with self._cond:
+                if error is None:
+                    self.stats["written"] += 1
+                    self.stats["records"] += n
+                else:
+                    self.stats["failed"] += 1
+                self.last_error = error
+                self.last_write_ms = (time.perf_counter() - t0) * 1e3
+                self._busy = False
+                self._cond.notify_all()
+
+
+_WRITERS = {}  # id(store) → AutosaveWriter
+_WRITERS_LOCK = threading.Lock()
+
+
+def get_autosave(store) -> AutosaveWriter:
+    """저장소당 쓰기 스레드 1개 (같은 사용자의 여러 세션은 같은 writer를 공유)"""
+    with _WRITERS_LOCK:
+        writer = _WRITERS.get(id(store))
+        if writer is None or writer.store is not store:
+            writer = _WRITERS[id(store)] = AutosaveWriter(store, name=type(store).__name__)
+        return writer
+
+
+def flush_all(timeout: float = 10.0) -> bool:
+    with _WRITERS_LOCK:
+        writers = list(_WRITERS.values())
+    return all(w.flush(timeout) for w in writers)
+
+
+atexit.register(flush_all)
+
+
+class SessionFlush:
+    """
+    세션 상태에 넣어 두는 표식. 세션이 끝나 상태와 함께 수거되면 그 세션이 쓰던 writer를 flush
+    """
+
+    def __init__(self):
+        self.writers = weakref.WeakSet()
+        self._finalizer = weakref.finalize(self, _flush_writers, self.writers)
+
+    def track(self, writer: AutosaveWriter):
+        self.writers.add(writer)
+
+
+def _flush_writers(writers):
+    for w in list(writers):
+        w.flush()
@@ -0,0 +1,163 @@
+"""
+목표 엑셀 일괄 처리 (Streamlit 없이 실행)
+
+폴더 안의 모든 xlsx에 대해 월별로
+  - coverage.csv        : 최대선/최소선 커버리지
+  - suggestions.csv     : 배치/승격 제안
+  - virtual_plan.csv    : 제안을 반영한 가상 계획
+  - virtual_diff.csv    : 원본 vs. 가상 diff
+  - week_plan_<주>.csv  : 주별 요일 블록(자동 제안)
+  - day_plans.csv       : 그 달 전체 주 × 요일 한 장 (주차/날짜 포함)
+을 만들어 출력 폴더/<파일명>/<월>/ 아래에 저장합니다.
+워크북 하나를 프로세스 하나가 처리합니다.
+변환 결과는 디스크 캐시(TIME_APP_DISK_CACHE)에 남으므로 같은 파일을 다시 돌리면 openpyxl을 거치지 않습니다.
+
+사용 예)
+  python batch_plan.py ./workbooks -o ./plans -j 4
+  python batch_plan.py ./workbooks --year 2026 --months 10월 11월
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from calendar_index import get_calendar_index
+from day_plans import DayPlanCache
+from day_scheduler import schedule_month
+from goal_registry import GoalRegistry
+from goal_table import goals_for_month, parse_goal_table
+from planner import (
+    MONTH_MAP, _build_virtual_plan, compute_coverage, coverage_rows,
+    generate_calendar_weeks, load_goal_workbook, suggestion_rows, virtual_diff_rows,
+    virtual_plan_rows, week_plan_rows,
+)
+from workbook_cache import get_workbook_cache
+
+
+def _write_csv(rows, path: Path, columns=None):
+    pd.DataFrame(rows, columns=columns).to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def plan_month(goal_table, month: str, year: int, weekly_plan=None):
+    """
+    한 달치 계획 산출물 (화면과 같은 파이프라인)
+    weekly_plan이 없으면 빈 계획에서 시작해 제안만으로 가상 계획을 만듦
+    """
+    weekly_plan = weekly_plan or {}
+    weeks = generate_calendar_weeks(year, MONTH_MAP[month])
+    _, month_goals = goals_for_month(goal_table, month)
+    registry = GoalRegistry.from_month_goals(month_goals)
+    cov_res = compute_coverage(weeks, weekly_plan, month_goals, registry)
+    virtual_plan, applied = _build_virtual_plan(
+        weekly_plan, cov_res["suggestions"], cov_res["swaps"], month_goals, registry
+    )
+
+    # 요일 배치는 한 달치를 한 번에 (포커스가 없는 주는 빠짐)
+    cal = get_calendar_index()
+    month_blocks = schedule_month(virtual_plan, weeks.values())
+    week_tables = {wk: week_plan_rows(blocks, {}, cal.dates_of(wk)) for wk, blocks in month_blocks.items()}
+    day_plans = DayPlanCache().table(weeks, virtual_plan)
+
+    return {
+        "weeks": weeks,
+        "month_goals": month_goals,
+        "coverage": cov_res,
+        "coverage_rows": coverage_rows(month_goals, cov_res),
+        "suggestion_rows": suggestion_rows(cov_res, month_goals),
+        "virtual_plan_rows": virtual_plan_rows(weeks, virtual_plan),
+        "virtual_diff_rows": virtual_diff_rows(weeks, weekly_plan, virtual_plan),
+        "applied": applied,
+        "week_tables": week_tables,
+        "day_plans": day_plans,
+    }
+
+
+def process_workbook(path: str, out_dir: str, year: int, months=None) -> dict:
+    """워커 1개: 워크북 1개 처리 후 통계 반환"""
+    t0 = time.perf_counter()
+    src = Path(path)
+    stats = {"file": src.name, "bytes": 0, "months": 0, "goals": 0, "weeks": 0, "files": 0,
+             "cached": False, "seconds": 0.0, "error": None}
+    try:
+        data = src.read_bytes()
+        stats["bytes"] = len(data)
+        wb_cache = get_workbook_cache()
+        entry = wb_cache.get_or_load(data, load_goal_workbook)
+        stats["cached"] = entry.on_disk
+        frame = entry.frame
+        goal_table = wb_cache.derive(entry, "goal_table", parse_goal_table)
+        wanted = [m for m in frame["월"].dropna().unique() if m in MONTH_MAP]
+        if months:
+            wanted = [m for m in wanted if m in months]
+        for month in sorted(wanted, key=MONTH_MAP.get):
+            res = plan_month(goal_table, month, year)
+            dest = Path(out_dir) / src.stem / month
+            dest.mkdir(parents=True, exist_ok=True)
+            _write_csv(res["coverage_rows"], dest / "coverage.csv")
+            _write_csv(res["suggestion_rows"], dest / "suggestions.csv", ["주차", "조치", "대상", "설명"])
+            _write_csv(res["virtual_plan_rows"], dest / "virtual_plan.csv")
+            _write_csv(res["virtual_diff_rows"], dest / "virtual_diff.csv")
+            res["day_plans"].to_csv(dest / "day_plans.csv", index=False, encoding="utf-8-sig")
+            for wk, rows in res["week_tables"].items():
+                _write_csv(rows, dest / f"week_plan_{wk}.csv")
+            stats["months"] += 1
+            stats["goals"] += len(res["month_goals"])
+            stats["weeks"] += len(res["weeks"])
+            stats["files"] += 5 + len(res["week_tables"])
+    except Exception as e:  # 한 파일 실패가 전체를 멈추지 않도록
+        stats["error"] = f"{type(e).__name__}: {e}"
+    stats["seconds"] = time.perf_counter() - t0
+    return stats
+
+
+def run_batch(input_dir, out_dir, workers=None, year=None, months=None, log=print) -> list:
+    paths = sorted(str(p) for p in Path(input_dir).glob("*.xlsx") if not p.name.startswith("~$"))
+    year = year or datetime.date.today().year
+    if not paths:
+        log(f"xlsx 파일이 없습니다: {input_dir}")
+        return []
+    t0 = time.perf_counter()
+    results = []
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process_workbook, p, out_dir, year, months): p for p in paths}
+        for fut in as_completed(futures):
+            res = fut.result()
+            results.append(res)
+            if res["error"]:
+                log(f"  ✗ {res['file']}: {res['error']}")
+            else:
+                cached = " (캐시)" if res["cached"] else ""
+                log(f"  ✓ {res['file']}{cached}: {res['months']}개월, 목표 {res['goals']}개, {res['seconds']:.2f}s")
+    elapsed = time.perf_counter() - t0
+
+    ok = [r for r in results if not r["error"]]
+    total_mb = sum(r["bytes"] for r in results) / 1e6
+    log("---- 요약 ----")
+    log(f"워크북 {len(ok)}/{len(results)}개 성공, 워커 {workers}개, 총 {elapsed:.2f}s")
+    if elapsed > 0:
+        log(f"처리량: {len(results) / elapsed:.2f} 워크북/s, {total_mb / elapsed:.2f} MB/s, "
+            f"{sum(r['months'] for r in ok) / elapsed:.1f} 월/s, {sum(r['goals'] for r in ok) / elapsed:.1f} 목표/s")
+    log(f"생성 파일 {sum(r['files'] for r in ok)}개 → {out_dir}")
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="목표 엑셀 폴더 → 월별 커버리지/가상 계획/주간 CSV 일괄 생성")
+    ap.add_argument("input_dir", help="xlsx 파일이 있는 폴더")
+    ap.add_argument("-o", "--out", default="batch_output", help="출력 폴더 (기본: batch_output)")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    ap.add_argument("--year", type=int, default=None, help="달력 연도 (기본: 올해)")
+    ap.add_argument("--months", nargs="*", default=None, help="처리할 월만 지정 (예: 10월 11월)")
+    args = ap.parse_args(argv)
+    results = run_batch(args.input_dir, args.out, args.workers, args.year, args.months)
+    return 1 if any(r["error"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+벤치마크용 결정적(시드 고정) 데이터 생성기
+
+- 목표 워크북: 프로젝트 N개 × 12개월, 셀마다 항목 M개
+  ([소주제] 줄 + • 항목 / "[소주제] • 항목" 한 줄 / 소주제 없는 • 항목을 섞음)
+- 주간 CSV: 요일마다 태스크 K개 ("|" / 줄바꿈 / "," 구분자를 섞음)
+- 주간 계획 / 요일 상세 / 완료 상태
+- 체크 이벤트 (날마다 표시 + 체크/해제 몇 번)
+"""
+import datetime
+import io
+import random
+
+import pandas as pd
+
+from calendar_index import get_calendar_index
+from check_log import EVENT_OFF, EVENT_ON, EVENT_SEEN
+from planner import DAYS_KR, GOAL_COLUMNS, GOAL_SHEET, MONTH_MAP
+
+_SECTIONS = ["건강", "학습", "업무", "관계", "재정", "취미", "정리", "글쓰기"]
+_VERBS = ["주 3회", "매일 30분", "월 1회", "2권", "마무리", "초안", "정리", "점검"]
+
+
+def _item(rng: random.Random, p: int, i: int) -> str:
+    return f"P{p} 항목{i} {rng.choice(_VERBS)}"
+
+
+def goal_cell(rng: random.Random, p: int, n_items: int) -> str:
+    """[소주제] 블록 / 인라인 / 소주제 없는 항목을 섞은 셀 텍스트"""
+    lines = []
+    i = 0
+    while i < n_items:
+        layout = rng.random()
+        if layout < 0.15:
+            lines.append(f"[{rng.choice(_SECTIONS)}] • {_item(rng, p, i)}")
+            i += 1
+        elif layout < 0.25 and not lines:
+            lines.append(f"• {_item(rng, p, i)}")  # 소주제 없음 → 기타
+            i += 1
+        else:
+            lines.append(f"[{rng.choice(_SECTIONS)}]")
+            for _ in range(min(rng.randint(1, 4), n_items - i)):
+                lines.append(f"  • {_item(rng, p, i)}")
+                i += 1
+        if rng.random() < 0.1:
+            lines.append("")  # 빈 줄
+    return "\n".join(lines)
+
+
+def goal_frame(n_projects: int, n_items: int, seed: int = 0) -> pd.DataFrame:
+    """load_goal_workbook 결과와 같은 모양의 목표 df (프로젝트 × 12개월)"""
+    rng = random.Random(seed)
+    rows = []
+    for p in range(n_projects):
+        for month in MONTH_MAP:
+            rows.append({
+                "프로젝트": f"프로젝트{p}",
+                "월": month,
+                "최소선": goal_cell(rng, p, max(1, n_items // 2)),
+                "최대선": goal_cell(rng, p, n_items),
+                "측정지표": f"지표{p}",
+            })
+    return pd.DataFrame(rows, columns=GOAL_COLUMNS)
+
+
+def goal_workbook_bytes(n_projects: int, n_items: int, seed: int = 0) -> bytes:
+    """'최대선_최소선' 시트가 있는 xlsx 바이트"""
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as xw:
+        goal_frame(n_projects, n_items, seed).to_excel(xw, sheet_name=GOAL_SHEET, index=False)
+    return buf.getvalue()
+
+
+def week_csv_bytes(n_tasks: int, seed: int = 0, encoding: str = "utf-8-sig") -> bytes:
+    """요일 7행, 메인/배경 칸에 태스크 n_tasks개씩 (구분자 섞음)"""
+    rng = random.Random(seed)
+    start = datetime.date(2026, 10, 5)
+    rows = []
+    for i, day in enumerate(DAYS_KR):
+        cells = []
+        for kind in ("메인", "배경"):
+            tasks = [f"{kind}{i}-{t} {rng.choice(_VERBS)}".replace(",", "") for t in range(n_tasks)]
+            sep = rng.choice([" | ", "\n", ", "])
+            cells.append(sep.join(tasks))
+        rows.append({
+            "요일": day,
+            "날짜": (start + datetime.timedelta(days=i)).isoformat(),
+            "자동 제안(메인)": "",
+            "자동 제안(배경)": "",
+            "상세 플랜(메인)": cells[0],
+            "상세 플랜(배경)": cells[1],
+        })
+    return pd.DataFrame(rows).to_csv(index=False).encode(encoding)
+
+
+def weekly_plan(weeks: dict, month_goals: dict, n_routine: int = 3, seed: int = 0) -> dict:
+    """주마다 focus 0~2개 + routine n_routine개 (월 목표 라벨 중 무작위)"""
+    rng = random.Random(seed)
+    labels = [g["label"] for g in month_goals.values()]
+    plan = {}
+    for wk in weeks.values():
+        if not labels:
+            plan[wk] = {"focus": [], "routine": []}
+            continue
+        plan[wk] = {
+            "focus": rng.sample(labels, min(len(labels), rng.randint(0, 2))),
+            "routine": rng.sample(labels, min(len(labels), n_routine)),
+        }
+    return plan
+
+
+def session_state(n_weeks: int, n_tasks: int, seed: int = 0, legacy_labels: bool = False) -> dict:
+    """
+    STATE_KEYS 모양의 세션 상태 (n_weeks주, 요일마다 태스크 n_tasks개)
+    legacy_labels면 completed_by_day를 과거 형식(라벨 집합)으로
+    """
+    rng = random.Random(seed)
+    cal = get_calendar_index()
+    first = cal.week_of(datetime.date(2026, 1, 5))
+    keys = cal.keys[cal.keys.index(first):][:n_weeks]
+    state = {"weekly_plan": {}, "day_detail": {}, "completed_by_day": {}, "weekly_review": {}}
+    for wk in keys:
+        state["weekly_plan"][wk] = {
+            "focus": [f"{rng.choice(_SECTIONS)} - 목표{rng.randint(0, 99)}" for _ in range(2)],
+            "routine": [f"{rng.choice(_SECTIONS)} - 루틴{rng.randint(0, 99)}" for _ in range(3)],
+        }
+        state["day_detail"][wk] = {
+            d: {"main": [f"{d} 메인{t}" for t in range(n_tasks)], "routine": [f"{d} 배경{t}" for t in range(n_tasks)]}
+            for d in DAYS_KR
+        }
+        for date in cal.dates_of(wk):
+            labels = [f"[메인] {t}" for t in range(n_tasks)] + [f"[배경] {t}" for t in range(n_tasks)]
+            if legacy_labels:
+                done = {lab for lab in labels if rng.random() < 0.5}
+            else:
+                done = rng.getrandbits(len(labels))
+            state["completed_by_day"][(wk, date.isoformat())] = done
+        state["weekly_review"][wk] = f"{wk} 회고 " * 5
+    return state
+
+
+def check_events(n_days: int, n_tasks: int, seed: int = 0) -> list:
+    """2026-01-01부터 n_days일, 날마다 태스크 n_tasks개(메인/배경 반반)의 (ts, 주, 날짜, 라벨, position, kind, event)"""
+    rng = random.Random(seed)
+    start = datetime.date(2026, 1, 1)
+    t0 = int(datetime.datetime(2026, 1, 1).timestamp() * 1000)
+    events = []
+    for i in range(n_days):
+        day = start + datetime.timedelta(days=i)
+        wk = get_calendar_index().week_of(day)
+        ts = t0 + i * 86_400_000
+        for p in range(n_tasks):
+            kind = "[메인]" if p < n_tasks // 2 else "[배경]"
+            label = f"{kind} {rng.choice(_SECTIONS)} - 항목{p}"
+            events.append((ts, wk, day.isoformat(), label, p, kind, EVENT_SEEN))
+            for k in range(rng.randint(0, 3)):
+                events.append((ts + k + 1, wk, day.isoformat(), label, p, kind, EVENT_OFF if k % 2 else EVENT_ON))
+    return events
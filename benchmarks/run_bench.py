@@ -0,0 +1,249 @@
+"""
+규모별(small/medium/year) 성능 측정 + 기준값(JSON) 비교
+
+사용 예)
+  python -m benchmarks.run_bench                          # 측정만
+  python -m benchmarks.run_bench --save                   # benchmarks/baseline.json 갱신
+  python -m benchmarks.run_bench --check --threshold 1.3  # 기준 대비 30% 넘게 느려지면 종료 코드 1
+  python -m benchmarks.run_bench --scales small --only parse_goals compute_coverage
+"""
+import argparse
+import atexit
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks import generators as gen
+from check_analytics import completion_rates
+from check_log import CheckEventLog
+from coverage_model import CoverageModel
+from day_plans import DayPlanCache
+from day_scheduler import schedule_month
+from disk_cache import DiskCache
+from goal_registry import GoalRegistry
+from goal_table import goals_for_month, parse_goal_table
+from planner import (
+    MONTH_MAP, _build_virtual_plan, build_month_goals, compute_coverage, generate_calendar_weeks,
+    load_goal_workbook, parse_goals,
+)
+from scenario_search import search_scenarios
+from state_snapshot import SnapshotReader, dump_snapshot
+from state_store import _deserialize_state, _serialize_state
+from week_csv import load_week_like
+from week_tasks import build_task_table
+
+BASELINE = Path(__file__).with_name("baseline.json")
+YEAR = 2026
+
+# projects × 12개월 × items(셀당 항목), 요일당 tasks, 상태 weeks주, months는 월별 계산 대상
+# 체크 이벤트는 event_days일 × 하루 tasks개
+SCALES = {
+    "small": {"projects": 3, "items": 4, "tasks": 5, "weeks": 5, "months": ["10월"], "event_days": 35},
+    "medium": {"projects": 20, "items": 10, "tasks": 40, "weeks": 13, "months": ["10월", "11월", "12월"],
+               "event_days": 91},
+    "year": {"projects": 60, "items": 20, "tasks": 200, "weeks": 52, "months": list(MONTH_MAP), "event_days": 365},
+}
+
+
+def measure(fn, min_time: float = 0.3, min_runs: int = 3, max_runs: int = 50) -> dict:
+    """min_time초 또는 max_runs회까지 반복해 중앙값/최솟값(초)"""
+    times = []
+    start = time.perf_counter()
+    while len(times) < min_runs or (time.perf_counter() - start < min_time and len(times) < max_runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"median": statistics.median(times), "min": min(times), "runs": len(times)}
+
+
+def build_cases(cfg: dict) -> dict:
+    """이름 → 인자 없는 호출 (입력 데이터는 여기서 미리 만들어 둠)"""
+    xlsx = gen.goal_workbook_bytes(cfg["projects"], cfg["items"])
+    frame = gen.goal_frame(cfg["projects"], cfg["items"])
+    cells = [str(x) for col in ("최대선", "최소선") for x in frame[col].dropna()]
+    months = cfg["months"]
+    table = parse_goal_table(frame)
+
+    per_month = []
+    for m in months:
+        weeks = generate_calendar_weeks(YEAR, MONTH_MAP[m])
+        _, month_goals = goals_for_month(table, m)
+        registry = GoalRegistry.from_month_goals(month_goals)
+        plan = gen.weekly_plan(weeks, month_goals, seed=MONTH_MAP[m])
+        cov = compute_coverage(weeks, plan, month_goals, registry)
+        per_month.append((weeks, plan, month_goals, registry, cov))
+
+    # 주 하나의 포커스를 두 선택 사이에서 번갈아 바꾸는 편집 (솔버 제외, 커버리지 갱신만)
+    models = []
+    for weeks, plan, month_goals, registry, _ in per_month:
+        model = CoverageModel(weeks, registry)
+        model.sync(plan)
+        wk = next(iter(plan))
+        labels = [g["label"] for g in month_goals.values()][:2]
+        models.append((model, wk, plan[wk]["routine"], [labels[:1], labels[1:2]]))
+
+    weeks0, plan0, goals0, registry0, cov0 = per_month[0]
+    day_plan_caches = [DayPlanCache() for _ in per_month]
+    for c, (w, p, *_) in zip(day_plan_caches, per_month):
+        c.table(w, p)
+
+    def coverage_edit():
+        for model, wk, routine, choices in models:
+            for focus in choices:
+                model.set_week(wk, focus, routine)
+                model.coverage()
+
+    state = gen.session_state(cfg["weeks"], cfg["tasks"])
+    serialized = json.loads(json.dumps(_serialize_state(state), ensure_ascii=False))
+    legacy = gen.session_state(cfg["weeks"], cfg["tasks"], legacy_labels=True)
+    week_csv = gen.week_csv_bytes(cfg["tasks"])
+    week_df = load_week_like(week_csv)
+    tmp_dir = tempfile.mkdtemp(prefix="bench_")
+    atexit.register(shutil.rmtree, tmp_dir, True)
+    snap_path = Path(tmp_dir) / "state.snap"
+    snap_path.write_bytes(dump_snapshot(serialized))
+    month_weeks = set(list(serialized["weekly_plan"])[-5:])
+    state_json = json.dumps(serialized, ensure_ascii=False)
+
+    event_log = CheckEventLog(Path(tmp_dir) / "check_events.log")
+    event_log.append(gen.check_events(cfg["event_days"], cfg["tasks"]))
+    events = event_log.read()
+
+    disk = DiskCache(Path(tmp_dir) / "wbc")
+    _, goal_frame = load_goal_workbook(xlsx)
+    disk.put("bench", [], {"frame": goal_frame, "goal_table": parse_goal_table(goal_frame)})
+
+    def snapshot_month():
+        with SnapshotReader(snap_path) as r:
+            return r.load(weeks=month_weeks)
+
+    return {
+        "load_goal_workbook": lambda: load_goal_workbook(xlsx),
+        "parse_goals": lambda: [parse_goals(c) for c in cells],
+        "build_month_goals": lambda: [build_month_goals(frame[frame["월"] == m]) for m in months],
+        "parse_goal_table": lambda: parse_goal_table(frame),
+        "disk_cache_load": lambda: disk.get("bench"),
+        "compute_coverage": lambda: [compute_coverage(w, p, g, r) for w, p, g, r, _ in per_month],
+        "coverage_edit": coverage_edit,
+        # 한 달 계획에 후보 100개 (현재 프로세스에서 순서대로 — 풀 시작 비용 제외)
+        "scenario_search": lambda: search_scenarios(weeks0, plan0, cov0, goals0, registry0, n=100, workers=0),
+        "_build_virtual_plan": lambda: [
+            _build_virtual_plan(p, c["suggestions"], c["swaps"], g, r) for _, p, g, r, c in per_month
+        ],
+        "schedule_month": lambda: [schedule_month(p, w.values()) for w, p, *_ in per_month],
+        # 달마다 주 × 요일 긴 표: 새 캐시(모든 주 계산) / 채운 캐시(표 조립만)
+        "day_plans_table": lambda: [DayPlanCache().table(w, p) for w, p, *_ in per_month],
+        "day_plans_table_warm": lambda: [c.table(w, p) for c, (w, p, *_) in zip(day_plan_caches, per_month)],
+        "_serialize_state": lambda: json.dumps(_serialize_state(state), ensure_ascii=False),
+        "_serialize_state_legacy": lambda: json.dumps(_serialize_state(legacy), ensure_ascii=False),
+        "_deserialize_state": lambda: _deserialize_state(serialized),
+        "json_loads_state": lambda: json.loads(state_json),
+        "dump_snapshot": lambda: dump_snapshot(serialized),
+        "snapshot_month": snapshot_month,
+        "event_log_read": lambda: CheckEventLog(event_log.path).read(),
+        "completion_rates": lambda: [completion_rates(events, by) for by in ("day", "week", "month", "kind", "goal")],
+        "load_week_like": lambda: load_week_like(week_csv),
+        "build_task_table": lambda: build_task_table(week_df, "bench"),
+    }
+
+
+def run(scales, only=None, log=print) -> dict:
+    results = {}
+    for scale in scales:
+        cfg = SCALES[scale]
+        log(f"== {scale}: 프로젝트 {cfg['projects']} × 12개월 × 항목 {cfg['items']}, "
+            f"요일당 태스크 {cfg['tasks']}, 상태 {cfg['weeks']}주, 월 {len(cfg['months'])}개")
+        cases = build_cases(cfg)
+        results[scale] = {}
+        for name, fn in cases.items():
+            if only and name not in only:
+                continue
+            r = measure(fn)
+            results[scale][name] = r
+            log(f"  {name:<26} {r['median'] * 1e3:10.3f} ms  (min {r['min'] * 1e3:.3f}, {r['runs']}회)")
+    return results
+
+
+def _meta() -> dict:
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(terse=True),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def check(results: dict, baseline: dict, threshold: float, floor: float = 0.001, log=print) -> list:
+    """
+    기준 대비 중앙값이 threshold배를 넘고 차이가 floor초 이상이면 회귀
+    반환: [(규모, 이름, 기준, 현재)]
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+    for scale, cases in results.items():
+        for name, r in cases.items():
+            base = base_results.get(scale, {}).get(name)
+            if base is None:
+                log(f"  (기준 없음) {scale}/{name}")
+                continue
+            ratio = r["median"] / base["median"] if base["median"] else float("inf")
+            flag = ratio > threshold and r["median"] - base["median"] > floor
+            if flag:
+                regressions.append((scale, name, base["median"], r["median"]))
+            log(f"  {'✗' if flag else '✓'} {scale}/{name:<26} {ratio:6.2f}x  "
+                f"({base['median'] * 1e3:.3f} → {r['median'] * 1e3:.3f} ms)")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="플래너/주간 CSV 처리 성능 벤치마크")
+    ap.add_argument("--scales", nargs="*", default=list(SCALES), choices=list(SCALES))
+    ap.add_argument("--only", nargs="*", default=None, help="측정할 항목 이름만")
+    ap.add_argument("--baseline", default=str(BASELINE), help=f"기준값 파일 (기본: {BASELINE.name})")
+    ap.add_argument("--save", action="store_true", help="결과를 기준값 파일로 저장")
+    ap.add_argument("--check", action="store_true", help="기준값과 비교해 회귀가 있으면 종료 코드 1")
+    ap.add_argument("--threshold", type=float, default=1.3, help="회귀 판정 배수 (기본 1.3)")
+    ap.add_argument("--out", default=None, help="이번 결과를 JSON으로 저장할 경로")
+    args = ap.parse_args(argv)
+
+    results = run(args.scales, args.only)
+    payload = {"meta": _meta(), "results": results}
+    if args.out:
+        Path(args.out).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    code = 0
+    if args.check:
+        path = Path(args.baseline)
+        if not path.exists():
+            print(f"기준값 파일이 없습니다: {path} (--save로 먼저 만드세요)")
+            return 2
+        print(f"---- 기준 비교 ({path.name}, 임계 {args.threshold}x) ----")
+        regressions = check(results, json.loads(path.read_text(encoding="utf-8")), args.threshold)
+        if regressions:
+            print(f"회귀 {len(regressions)}건")
+            code = 1
+        else:
+            print("회귀 없음")
+    if args.save:
+        path = Path(args.baseline)
+        if path.exists():
+            # 일부 규모/항목만 측정했으면 나머지 기준값은 유지
+            old = json.loads(path.read_text(encoding="utf-8")).get("results", {})
+            for scale, cases in old.items():
+                for name, r in cases.items():
+                    results.setdefault(scale, {}).setdefault(name, r)
+        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"기준값 저장: {path}")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+여러 달/해에 걸친 주(월~일) 달력 인덱스
+
+- 주 키는 ISO 주차("2025-W40") → 달이 바뀌어도 키가 겹치지 않음
+- 주 시작일(서수)을 정렬된 리스트로 한 번만 만들어 두고
+  날짜 → 주: 산술 계산 O(1), 주 → 날짜: dict 조회 O(1), 기간 → 주 목록: bisect O(log n)
+- 라벨("1주차 (9/29~10/5)")은 화면 표시용으로만 만들고 다시 파싱하지 않음
+"""
+import bisect
+import calendar
+import datetime
+import threading
+
+_ONE_DAY = datetime.timedelta(days=1)
+
+
+def iso_week_key(d: datetime.date) -> str:
+    y, w, _ = d.isocalendar()
+    return f"{y}-W{w:02d}"
+
+
+def _monday(d: datetime.date) -> datetime.date:
+    return d - datetime.timedelta(days=d.weekday())
+
+
+class CalendarIndex:
+    def __init__(self, start: datetime.date, end: datetime.date):
+        first = _monday(start)
+        last = _monday(end)
+        self._base = first.toordinal()
+        n = (last.toordinal() - self._base) // 7 + 1
+        self.starts = [self._base + 7 * i for i in range(n)]  # 주 시작일 서수(정렬됨)
+        self.keys = [iso_week_key(datetime.date.fromordinal(o)) for o in self.starts]
+        self._pos = {k: i for i, k in enumerate(self.keys)}
+
+    @classmethod
+    def for_years(cls, first_year: int, last_year: int):
+        return cls(datetime.date(first_year, 1, 1), datetime.date(last_year, 12, 31))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self._pos
+
+    @property
+    def first_day(self) -> datetime.date:
+        return datetime.date.fromordinal(self.starts[0])
+
+    @property
+    def last_day(self) -> datetime.date:
+        return datetime.date.fromordinal(self.starts[-1] + 6)
+
+    def covers(self, d: datetime.date) -> bool:
+        return self.starts[0] <= d.toordinal() <= self.starts[-1] + 6
+
+    # ---- 날짜 → 주 ----
+    def week_index(self, d: datetime.date):
+        i = (d.toordinal() - self._base) // 7
+        return i if 0 <= i < len(self.starts) else None
+
+    def week_of(self, d: datetime.date):
+        i = self.week_index(d)
+        return self.keys[i] if i is not None else None
+
+    # ---- 주 → 날짜 ----
+    def week_start(self, key: str) -> datetime.date:
+        return datetime.date.fromordinal(self.starts[self._pos[key]])
+
+    def week_range(self, key: str):
+        start = self.week_start(key)
+        return start, start + datetime.timedelta(days=6)
+
+    def dates_of(self, key: str) -> list:
+        start = self.week_start(key)
+        return [start + datetime.timedelta(days=i) for i in range(7)]
+
+    # ---- 기간 → 주 ----
+    def weeks_between(self, start: datetime.date, end: datetime.date) -> list:
+        """start~end와 하루라도 겹치는 주 키 목록"""
+        lo = bisect.bisect_right(self.starts, start.toordinal() - 7)
+        hi = bisect.bisect_right(self.starts, end.toordinal())
+        return self.keys[lo:hi]
+
+    def month_weeks(self, year: int, month: int) -> dict:
+        """
+        실제 달력 기준(월~일) 해당 월의 주차 {라벨: 주 키}
+        월 경계 포함, 예: "1주차 (9/29~10/5)": "2025-W40"
+        """
+        first_day = datetime.date(year, month, 1)
+        last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
+        weeks = {}
+        for n, key in enumerate(self.weeks_between(first_day, last_day), start=1):
+            weeks[self.week_label(key, n)] = key
+        return weeks
+
+    def week_label(self, key: str, n: int) -> str:
+        s, e = self.week_range(key)
+        return f"{n}주차 ({s.month}/{s.day}~{e.month}/{e.day})"
+
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_calendar_index(*dates: datetime.date) -> CalendarIndex:
+    """
+    프로세스 공용 인덱스. 기본은 올해 ±1년, 주어진 날짜가 범위를 벗어나면 넓혀서 다시 만듦
+    """
+    global _INDEX
+    with _INDEX_LOCK:
+        idx = _INDEX
+        if idx is None or not all(idx.covers(d) for d in dates):
+            today = datetime.date.today()
+            years = [today.year - 1, today.year + 1] + [d.year for d in dates]
+            if idx is not None:
+                years += [idx.first_day.year, idx.last_day.year]
+            idx = _INDEX = CalendarIndex.for_years(min(years), max(years))
+        return idx
@@ -0,0 +1,150 @@
+"""
+체크 이벤트 로그 → 기간별 달성률 (NumPy)
+
+태스크 한 건 = (주, 날짜, 태스크, position)
+  - 분모: 기간 안에 한 번이라도 이벤트(표시/체크/해제)가 있는 태스크
+  - 분자: 그중 마지막 체크/해제 이벤트가 '체크'인 태스크 (as_of를 주면 그 시각까지의 이벤트만)
+날짜: 기록된 날짜가 ISO 날짜면 그것, 주 키가 ISO 주차("2026-W41")고 날짜가 요일이면 계산,
+      둘 다 아니면 그 (주, 날짜)의 첫 이벤트 시각의 날짜
+묶음(by): day / week / month / kind / goal
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from check_log import EVENT_SEEN, KIND_NAMES, CheckEventLog
+from week_csv import DAYS_KR
+
+GROUP_COLUMNS = {"day": "날짜", "week": "주", "month": "월", "kind": "유형", "goal": "목표"}
+RATE_COLUMNS = ["전체", "완료", "달성률(%)"]
+
+
+def _resolve_date(week: str, date: str, first_ts_ms: int) -> int:
+    """(주, 날짜) → 날짜 서수"""
+    try:
+        return datetime.date.fromisoformat(date).toordinal()
+    except ValueError:
+        pass
+    if date in DAYS_KR:
+        try:
+            year, w = week.split("-W")
+            return datetime.date.fromisocalendar(int(year), int(w), DAYS_KR.index(date) + 1).toordinal()
+        except ValueError:
+            pass
+    return datetime.date.fromtimestamp(first_ts_ms / 1000).toordinal()
+
+
+def _default_goal(label: str) -> str:
+    # "[메인] 소주제 - 항목" → "소주제" (목표 라벨 형식이 아니면 텍스트 그대로)
+    text = label.split("] ", 1)[1] if label.startswith("[") and "] " in label else label
+    return text.split(" - ", 1)[0]
+
+
+def _goal_fn(goal_of):
+    if goal_of is None:
+        return _default_goal
+    if hasattr(goal_of, "id_of"):  # GoalRegistry
+        def by_registry(label):
+            text = label.split("] ", 1)[1] if label.startswith("[") and "] " in label else label
+            gid = goal_of.id_of(text)
+            return goal_of.label(gid) if gid is not None else "(목표 아님)"
+        return by_registry
+    return goal_of
+
+
+def task_instances(events: np.ndarray, strings: list, start=None, end=None, as_of=None) -> pd.DataFrame:
+    """
+    이벤트 → 태스크 한 건당 한 행 (date_ord, week, task, pos, kind, done)
+    start/end: datetime.date (양 끝 포함), as_of: datetime 또는 ms
+    """
+    if as_of is not None:
+        as_of_ms = int(as_of.timestamp() * 1000) if isinstance(as_of, datetime.datetime) else int(as_of)
+        events = events[events["ts"] <= as_of_ms]
+    cols = ["date_ord", "week", "task", "pos", "kind", "done"]
+    if not len(events):
+        return pd.DataFrame({c: np.zeros(0, dtype=np.int64) for c in cols}).astype({"done": bool})
+
+    # (주, 날짜) 쌍마다 한 번만 날짜 계산
+    pair = (events["week"].astype(np.uint64) << np.uint64(32)) | events["date"].astype(np.uint64)
+    uniq, first, inv = np.unique(pair, return_index=True, return_inverse=True)
+    pair_ord = np.array([
+        _resolve_date(strings[int(u >> np.uint64(32))], strings[int(u & np.uint64(0xFFFFFFFF))], int(events["ts"][i]))
+        for u, i in zip(uniq, first)
+    ], dtype=np.int64)
+    date_ord = pair_ord[inv]
+
+    keep = np.ones(len(events), dtype=bool)
+    if start is not None:
+        keep &= date_ord >= start.toordinal()
+    if end is not None:
+        keep &= date_ord <= end.toordinal()
+    events, inv, date_ord = events[keep], inv[keep], date_ord[keep]
+    if not len(events):
+        return task_instances(events, strings)
+
+    # (쌍, 태스크, position)으로 묶고 묶음 안은 시각 순
+    order = np.lexsort((events["ts"], events["pos"], events["task"], inv))
+    ev = events[order]
+    inv, date_ord = inv[order], date_ord[order]
+    new_group = np.ones(len(ev), dtype=bool)
+    new_group[1:] = (inv[1:] != inv[:-1]) | (ev["task"][1:] != ev["task"][:-1]) | (ev["pos"][1:] != ev["pos"][:-1])
+    starts = np.flatnonzero(new_group)
+    ends = np.append(starts[1:], len(ev)) - 1
+
+    # 묶음마다 마지막 체크/해제 이벤트
+    idx = np.where(ev["event"] != EVENT_SEEN, np.arange(len(ev)), -1)
+    last_toggle = np.maximum.accumulate(idx)[ends]
+    has_toggle = last_toggle >= starts
+    done = has_toggle & (ev["event"][np.where(has_toggle, last_toggle, 0)] == 1)
+
+    return pd.DataFrame({
+        "date_ord": date_ord[starts],
+        "week": ev["week"][starts].astype(np.int64),
+        "task": ev["task"][starts].astype(np.int64),
+        "pos": ev["pos"][starts].astype(np.int64),
+        "kind": ev["kind"][starts].astype(np.int64),
+        "done": done,
+    })
+
+
+def completion_rates(source, by: str = "day", start=None, end=None, as_of=None, goal_of=None) -> pd.DataFrame:
+    """
+    기간별 달성률 표 [묶음, 전체, 완료, 달성률(%)]
+    source: CheckEventLog 또는 (이벤트 배열, 문자열 목록)
+    goal_of: by="goal"일 때 태스크 라벨 → 목표 (GoalRegistry / 함수, 없으면 "소주제 - 항목"의 소주제)
+    """
+    if by not in GROUP_COLUMNS:
+        raise ValueError(f"알 수 없는 묶음: {by} (가능: {', '.join(GROUP_COLUMNS)})")
+    events, strings = source.read() if isinstance(source, CheckEventLog) else source
+    inst = task_instances(events, strings, start, end, as_of)
+    name = GROUP_COLUMNS[by]
+    if inst.empty:
+        return pd.DataFrame(columns=[name] + RATE_COLUMNS)
+
+    if by in ("day", "month"):
+        days, codes = np.unique(inst["date_ord"].to_numpy(), return_inverse=True)
+        dates = [datetime.date.fromordinal(int(o)) for o in days]
+        labels = [d.isoformat() if by == "day" else f"{d.year:04d}-{d.month:02d}" for d in dates]
+    elif by == "week":
+        ids, codes = np.unique(inst["week"].to_numpy(), return_inverse=True)
+        labels = [strings[i] for i in ids]
+    elif by == "kind":
+        ids, codes = np.unique(inst["kind"].to_numpy(), return_inverse=True)
+        labels = [KIND_NAMES.get(int(i), str(i)) for i in ids]
+    else:
+        fn = _goal_fn(goal_of)
+        ids, codes = np.unique(inst["task"].to_numpy(), return_inverse=True)
+        labels = [fn(strings[i]) for i in ids]
+
+    # 라벨이 같은 묶음(같은 달, 같은 목표 등)은 합침
+    names, label_group = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+    group = label_group[codes]
+    total = np.bincount(group, minlength=len(names))
+    done = np.bincount(group, weights=inst["done"].to_numpy(), minlength=len(names)).astype(np.int64)
+    return pd.DataFrame({
+        name: names,
+        "전체": total,
+        "완료": done,
+        "달성률(%)": (done * 100 // np.maximum(total, 1)).astype(int),
+    })
@@ -0,0 +1,172 @@
+"""
+체크 이벤트 로그 (추가 전용, 고정 폭)
+
+레코드 24바이트 (리틀엔디언)
+  ts(ms) i64 | 주 u32 | 날짜 u32 | 태스크 u32 | position u16 | kind u8 | event u8
+- 주/날짜/태스크는 문자열 id (check_events.strings에 한 줄씩 JSON 문자열로 추가)
+  날짜는 ISO 날짜를 알면 그것, 모르면 요일 이름 그대로
+- event: 0 해제 / 1 체크 / 2 표시(체크리스트에 처음 나타남 → 달성률의 분모)
+- 쓰다 만 꼬리(24바이트 미만 / 줄바꿈 없는 마지막 문자열)는 읽을 때 무시하고 다음 추가 전에 잘라냄
+- read()는 지난번 이후 늘어난 부분만 읽어 NumPy 구조체 배열에 이어 붙임
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from completion import has_bit
+from week_tasks import KIND_MAIN, KIND_ROUTINE
+
+EVENT_OFF, EVENT_ON, EVENT_SEEN = 0, 1, 2
+KIND_CODES = {KIND_MAIN: 0, KIND_ROUTINE: 1}
+KIND_NAMES = {v: k for k, v in KIND_CODES.items()}
+
+EVENT_DTYPE = np.dtype([
+    ("ts", "<i8"), ("week", "<u4"), ("date", "<u4"), ("task", "<u4"),
+    ("pos", "<u2"), ("kind", "u1"), ("event", "u1"),
+])
+RECORD_SIZE = EVENT_DTYPE.itemsize  # 24
+
+EVENT_LOG_FILE = Path(os.environ.get("TIME_APP_EVENT_LOG", "check_events.log"))
+
+
+class CheckEventLog:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.strings_path = self.path.with_suffix(".strings")
+        self._lock = threading.RLock()
+        self._strings = None     # id → 문자열
+        self._ids = None         # 문자열 → id
+        self._strings_len = 0    # 읽은 문자열 파일 길이(바이트)
+        self._events = np.zeros(0, dtype=EVENT_DTYPE)
+        self.bytes_written = 0
+
+    # ---- 문자열 표 ----
+    def _sync_strings(self):
+        """문자열 파일에서 새로 추가된 줄만 읽음"""
+        if self._strings is None:
+            self._strings, self._ids, self._strings_len = [], {}, 0
+        if not self.strings_path.exists():
+            return
+        with open(self.strings_path, "rb") as f:
+            f.seek(self._strings_len)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # 쓰다 만 마지막 줄
+                s = json.loads(raw)
+                self._ids.setdefault(s, len(self._strings))
+                self._strings.append(s)
+                self._strings_len += len(raw)
+
+    def _sid(self, s: str, new_lines: list) -> int:
+        i = self._ids.get(s)
+        if i is None:
+            i = self._ids[s] = len(self._strings)
+            self._strings.append(s)
+            new_lines.append(json.dumps(s, ensure_ascii=False) + "\n")
+        return i
+
+    # ---- 쓰기 ----
+    def append(self, events) -> int:
+        """events: (주, 날짜, 태스크 라벨, position, kind, event) 또는 ts를 앞에 붙인 7-튜플. 반환: 기록 수"""
+        events = list(events)
+        if not events:
+            return 0
+        now = int(time.time() * 1000)
+        with self._lock:
+            self._sync_strings()
+            new_lines = []
+            rows = np.zeros(len(events), dtype=EVENT_DTYPE)
+            for i, ev in enumerate(events):
+                ts, (week, date, task, pos, kind, event) = (ev[0], ev[1:]) if len(ev) == 7 else (now, ev)
+                rows[i] = (ts, self._sid(str(week), new_lines), self._sid(str(date), new_lines),
+                           self._sid(str(task), new_lines), pos, KIND_CODES.get(kind, kind), event)
+            if new_lines:
+                # 레코드가 가리키는 문자열을 먼저 기록
+                data = "".join(new_lines).encode("utf-8")
+                self._truncate_tail(self.strings_path, self._strings_len)
+                with open(self.strings_path, "ab") as f:
+                    f.write(data)
+                self._strings_len += len(data)
+                self.bytes_written += len(data)
+            if self.path.exists():
+                size = self.path.stat().st_size
+                self._truncate_tail(self.path, size - size % RECORD_SIZE)
+            data = rows.tobytes()
+            with open(self.path, "ab") as f:
+                f.write(data)
+            self.bytes_written += len(data)
+            return len(rows)
+
+    @staticmethod
+    def _truncate_tail(path: Path, good_len: int):
+        if path.exists() and path.stat().st_size > good_len:
+            with open(path, "r+b") as f:
+                f.truncate(good_len)
+
+    # ---- 읽기 ----
+    def read(self):
+        """(이벤트 구조체 배열, 문자열 목록). 지난번 이후 추가된 레코드만 새로 읽음"""
+        with self._lock:
+            self._sync_strings()
+            if self.path.exists():
+                have = len(self._events)
+                n = self.path.stat().st_size // RECORD_SIZE
+                if n < have:  # 초기화 등으로 줄어듦
+                    have, self._events = 0, self._events[:0]
+                if n > have:
+                    with open(self.path, "rb") as f:
+                        f.seek(have * RECORD_SIZE)
+                        new = np.fromfile(f, dtype=EVENT_DTYPE, count=n - have)
+                    self._events = np.concatenate([self._events, new])
+            else:
+                self._events = self._events[:0]
+            events = self._events
+            n_str = len(self._strings)
+            # 문자열 기록 전에 끊긴 레코드는 버림
+            ok = (events["week"] < n_str) & (events["date"] < n_str) & (events["task"] < n_str)
+            return (events if ok.all() else events[ok]), list(self._strings)
+
+    def reset(self):
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+            self.strings_path.unlink(missing_ok=True)
+            self._strings = None
+            self._events = self._events[:0]
+
+
+def mask_events(week, date, day_tasks, old_mask: int, new_mask: int) -> list:
+    """체크 마스크 변화 → 이벤트 (day_tasks: position/kind/label 컬럼이 있는 그 날의 태스크 테이블)"""
+    changed = old_mask ^ new_mask
+    if not changed:
+        return []
+    return [
+        (week, date, label, int(pos), kind, EVENT_ON if has_bit(new_mask, pos) else EVENT_OFF)
+        for pos, kind, label in zip(day_tasks["position"], day_tasks["kind"], day_tasks["label"])
+        if has_bit(changed, pos)
+    ]
+
+
+def seen_events(week, date, day_tasks) -> list:
+    return [
+        (week, date, label, int(pos), kind, EVENT_SEEN)
+        for pos, kind, label in zip(day_tasks["position"], day_tasks["kind"], day_tasks["label"])
+    ]
+
+
+_LOGS = {}
+_LOGS_LOCK = threading.Lock()
+
+
+def get_event_log(path=None) -> CheckEventLog:
+    """경로별 로그 1개 (스크립트 재실행 사이에도 유지 → 증분 읽기가 이어짐)"""
+    path = Path(path or EVENT_LOG_FILE)
+    key = str(path.resolve())
+    with _LOGS_LOCK:
+        log = _LOGS.get(key)
+        if log is None:
+            log = _LOGS[key] = CheckEventLog(path)
+        return log
@@ -0,0 +1,87 @@
+"""
+완료 체크 비트마스크
+
+(주, 요일/날짜)마다 정수 하나: i번째 비트 = 태스크 테이블에서 그 날 position i 태스크 완료 여부
+  - 진행률: popcount (태스크 수를 넘는 비트는 세지 않음 → 계획이 줄어도 과대 집계 없음)
+  - 저장: 16진 문자열(JSON) / 리틀엔디언 바이트(SQLite) → 하루 몇 바이트
+  - 텍스트 라벨은 태스크 테이블에만 둠
+과거 형식(라벨 문자열 집합/리스트)은 labels_to_mask로 옮깁니다.
+"""
+import numpy as np
+
+
+def full_mask(n: int) -> int:
+    return (1 << n) - 1 if n > 0 else 0
+
+
+def set_bit(mask: int, pos: int, on: bool) -> int:
+    bit = 1 << int(pos)  # numpy 정수면 64비트에서 넘치므로 파이썬 int로
+    return mask | bit if on else mask & ~bit
+
+
+def has_bit(mask: int, pos: int) -> bool:
+    return bool((mask >> int(pos)) & 1)
+
+
+def popcount(mask: int, n: int = None) -> int:
+    """완료 수. n을 주면 앞 n개 태스크만 셈"""
+    if n is not None:
+        mask &= full_mask(n)
+    return mask.bit_count()
+
+
+def mask_bits(mask: int, n: int) -> np.ndarray:
+    """마스크 → 길이 n bool 배열 (position 순)"""
+    if n <= 0:
+        return np.zeros(0, dtype=bool)
+    raw = np.frombuffer((mask & full_mask(n)).to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:n].astype(bool)
+
+
+def done_counts(masks, sizes) -> np.ndarray:
+    """여러 날의 완료 수를 한 번에 (masks[i]의 앞 sizes[i]비트만)"""
+    sizes = np.asarray(sizes, dtype=np.int64)
+    if not len(sizes):
+        return np.zeros(0, dtype=np.int64)
+    width = max(1, (int(sizes.max()) + 7) // 8)
+    buf = b"".join((int(m) & full_mask(int(n))).to_bytes(width, "little") for m, n in zip(masks, sizes))
+    bits = np.unpackbits(np.frombuffer(buf, dtype=np.uint8).reshape(len(sizes), width), axis=1)
+    return bits.sum(axis=1, dtype=np.int64)
+
+
+def labels_to_mask(labels, task_labels) -> int:
+    """과거 형식(완료 라벨 집합) → 마스크. 지금 계획에 없는 라벨은 버림"""
+    labels = set(labels)
+    mask = 0
+    for pos, label in enumerate(task_labels):
+        if label in labels:
+            mask |= 1 << pos
+    return mask
+
+
+def as_mask(value, task_labels=()) -> int:
+    """세션/저장소 값(마스크, 16진 문자열, 라벨 집합) → 마스크"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return mask_from_hex(value)
+    if value is None:
+        return 0
+    return labels_to_mask(value, task_labels)
+
+
+# ---- 직렬화 ----
+def mask_to_hex(mask: int) -> str:
+    return format(mask, "x")
+
+
+def mask_from_hex(s: str) -> int:
+    return int(s, 16) if s else 0
+
+
+def mask_to_bytes(mask: int) -> bytes:
+    return mask.to_bytes(max(1, (mask.bit_length() + 7) // 8), "little")
+
+
+def mask_from_bytes(b: bytes) -> int:
+    return int.from_bytes(b, "little")
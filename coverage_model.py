@@ -0,0 +1,175 @@
+"""
+증분 커버리지 모델 (주 하나의 선택이 바뀌면 바뀐 목표만 갱신)
+
+- 목표별 focus/routine 횟수, 목표별 들어 있는 주(비트셋: 비트 i = i번째 주)
+- 주별 focus 항목 수 → 빈 슬롯이 있는 주 집합(free_weeks)
+- 누락 최대선(focus 0회) 집합을 횟수가 0 ↔ 1 이상으로 바뀔 때만 갱신
+- set_week: 이전/새 선택의 ID 차이(추가/제거분)만 반영 → 한 번 수정에 O(선택 항목 수)
+- sync(weekly_plan): 선택이 달라진 주만 set_week (Streamlit 재실행마다 호출해도 됨)
+- result(): compute_coverage와 같은 모양. 바뀐 게 없으면 지난 결과를 그대로 돌려줌
+  coverage()는 바뀐 목표의 행만 새 사전으로 바꿔 끼움 → result에는 얕은 사본을 넣어
+  예전 결과를 들고 있어도 다음 sync에 따라 바뀌지 않음
+"""
+from collections import Counter
+
+from focus_solver import FOCUS_CAPACITY, solve_focus_placement
+
+
+def _delta(old, new) -> dict:
+    """ID 튜플 두 개 → {ID: 횟수 변화} (변화 없는 ID는 빠짐)"""
+    d = Counter(new)
+    d.subtract(old)
+    return {gid: n for gid, n in d.items() if n}
+
+
+class CoverageModel:
+    def __init__(self, weeks: dict, registry, capacity: int = FOCUS_CAPACITY):
+        self.weeks = dict(weeks)
+        self.week_keys = list(self.weeks.values())
+        self._wi = {wk: i for i, wk in enumerate(self.week_keys)}
+        self.registry = registry
+        self.capacity = capacity
+        n, w = len(registry), len(self.week_keys)
+
+        self.focus_cnt = [0] * n
+        self.routine_cnt = [0] * n
+        self.focus_bits = [0] * n    # 목표 → focus로 들어 있는 주 비트셋
+        self.routine_bits = [0] * n  # 목표 → routine으로 들어 있는 주 비트셋
+        self.week_focus = [0] * w    # 주 → focus 항목 수(목표가 아닌 라벨 포함, 솔버와 같은 기준)
+
+        self._sel = [None] * w                  # 주 → (focus 라벨, routine 라벨)
+        self._ids = [((), ())] * w              # 주 → (focus ID, routine ID)
+        self.plan_ids = {wk: ((), ()) for wk in self.week_keys}  # 솔버 입력
+
+        self.max_goals = [g.id for g in registry if g.kind == "max"]
+        self._is_max = [False] * n
+        for gid in self.max_goals:
+            self._is_max[gid] = True
+        self.missing = set(self.max_goals)      # focus 0회인 최대선
+        self.free_weeks = set(range(w)) if capacity > 0 else set()
+
+        self.version = 0
+        self.deltas = 0  # 반영한 (목표, 주) 변화 수
+        self._coverage = {g.key: {"focus": 0, "routine": 0, "weeks": []} for g in registry}
+        self._dirty = set()
+        self._result = None
+        self._result_key = None
+
+    def matches(self, weeks: dict, registry) -> bool:
+        return self.registry is registry and self.weeks == weeks
+
+    # ---- 갱신 ----
+    def set_week(self, wk, focus, routine) -> bool:
+        """주 하나의 선택을 바꿈 (달라진 게 없거나 이번 달 주가 아니면 False)"""
+        wi = self._wi.get(wk)
+        if wi is None:
+            return False
+        sel = (tuple(focus), tuple(routine))
+        if self._sel[wi] == sel:
+            return False
+        self._sel[wi] = sel
+        reg = self.registry
+        new_f, new_r = tuple(reg.ids(sel[0])), tuple(reg.ids(sel[1]))
+        old_f, old_r = self._ids[wi]
+        self._ids[wi] = (new_f, new_r)
+        self.plan_ids[wk] = (sel[0], new_r)
+
+        bit = 1 << wi
+        for counts, bits, old, new in ((self.focus_cnt, self.focus_bits, old_f, new_f),
+                                       (self.routine_cnt, self.routine_bits, old_r, new_r)):
+            for gid, d in _delta(old, new).items():
+                counts[gid] += d
+                if gid in new:
+                    bits[gid] |= bit
+                else:
+                    bits[gid] &= ~bit
+                self._dirty.add(gid)
+                self.deltas += 1
+                if counts is self.focus_cnt and self._is_max[gid]:
+                    if counts[gid] == 0:
+                        self.missing.add(gid)
+                    else:
+                        self.missing.discard(gid)
+
+        self.week_focus[wi] = len(sel[0])
+        if self.week_focus[wi] < self.capacity:
+            self.free_weeks.add(wi)
+        else:
+            self.free_weeks.discard(wi)
+        self.version += 1
+        return True
+
+    def sync(self, weekly_plan: dict) -> int:
+        """{주: {"focus": [...], "routine": [...]}}와 맞춤. 반환: 바뀐 주 수"""
+        changed = 0
+        for wk in self.week_keys:
+            sel = weekly_plan.get(wk) or {}
+            changed += self.set_week(wk, sel.get("focus", ()), sel.get("routine", ()))
+        return changed
+
+    # ---- 조회 ----
+    def goal_weeks(self, gid) -> list:
+        bits = self.focus_bits[gid] | self.routine_bits[gid]
+        out = []
+        while bits:
+            low = bits & -bits
+            out.append(self.week_keys[low.bit_length() - 1])
+            bits ^= low
+        return out
+
+    def missing_focus(self) -> list:
+        return sorted(self.missing)  # ID 순 = 레지스트리(최대선) 순
+
+    def protected_focus(self) -> dict:
+        """주 → 그 주에만 포커스로 있는 최대선 수 (밀어내면 새 누락이 생기는 포커스)"""
+        out = {}
+        for wi, wk in enumerate(self.week_keys):
+            n = sum(1 for gid in set(self._ids[wi][0]) if self._is_max[gid] and self.focus_cnt[gid] == 1)
+            if n:
+                out[wk] = n
+        return out
+
+    def free_week_keys(self) -> list:
+        return [self.week_keys[wi] for wi in sorted(self.free_weeks)]
+
+    def coverage(self) -> dict:
+        """정규화 키 → {"focus", "routine", "weeks"} (바뀐 목표만 다시 만듦)"""
+        for gid in self._dirty:
+            self._coverage[self.registry.key(gid)] = {
+                "focus": self.focus_cnt[gid], "routine": self.routine_cnt[gid], "weeks": self.goal_weeks(gid),
+            }
+        self._dirty.clear()
+        return self._coverage
+
+    def result(self, week_prefs=None, conflicts=None) -> dict:
+        """compute_coverage와 같은 결과. 선택/조건이 그대로면 지난 결과 재사용"""
+        key = (self.version, week_prefs, conflicts)
+        if self._result is not None and self._result_key == key:
+            return self._result
+        reg = self.registry
+        prefs = {reg.id_of_key(k): v for k, v in (week_prefs or {}).items() if reg.id_of_key(k) is not None}
+        banned = {reg.id_of_key(k): set(v) for k, v in (conflicts or {}).items() if reg.id_of_key(k) is not None}
+
+        missing = self.missing_focus()
+        # 누락된 최대선을 주별 포커스 슬롯에 최소 비용으로 배치 (routine에 이미 있는 목표는 승격 우선)
+        placement = solve_focus_placement(
+            self.week_keys, self.plan_ids, missing, capacity=self.capacity, week_prefs=prefs, conflicts=banned,
+            protected=self.protected_focus(),
+        )
+        total_focus_slots = len(self.week_keys) * self.capacity
+        k = reg.key
+        self._result = {
+            "capacity_ok": total_focus_slots >= len(self.max_goals),
+            "total_focus_slots": total_focus_slots,
+            "num_max_goals": len(self.max_goals),
+            "coverage": dict(self.coverage()),  # 모델의 사전은 다음 sync에서 바뀌므로 결과에는 사본
+            "missing_focus": [k(gid) for gid in missing],
+            "covered_focus": [k(gid) for gid in self.max_goals if gid not in self.missing],
+            "free_weeks": self.free_week_keys(),
+            "suggestions": [(wk, k(gid)) for wk, gid in placement["suggestions"]],
+            "swaps": [(wk, k(gid)) for wk, gid in placement["swaps"]],
+            "placement_cost": placement["cost"],
+            "unplaced": [k(gid) for gid in placement["unplaced"]],
+        }
+        self._result_key = key
+        return self._result
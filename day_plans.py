@@ -0,0 +1,114 @@
+"""
+월/분기 전체 요일 플랜 (자동 제안 + 상세 플랜) 한 장짜리 표
+
+- 주마다 (포커스/배경, 상세 플랜) 내용으로 만든 버전 키를 두고, 키가 같은 주는 지난 열을 그대로 씀
+- 다시 만들 주만 모아 day_scheduler.schedule_month 한 번으로 배치 → 주당 7행의 열(튜플)로 캐시
+- 긴 표: 캐시된 열을 이어 붙이고, 주/요일/날짜 열은 numpy repeat/tile로 한 번에 만듦
+- 표를 요청할 때만 계산 (화면에서는 '전체 표 만들기'를 켰을 때, 일괄 처리에서는 월마다 한 번)
+"""
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from calendar_index import get_calendar_index
+from day_scheduler import schedule_month
+from planner import DAYS_KR, generate_calendar_weeks, week_plan_rows
+
+COLUMNS = ["주차", "주", "요일", "날짜", "자동 제안(메인)", "자동 제안(배경)", "상세 플랜(메인)", "상세 플랜(배경)"]
+_CACHED = COLUMNS[4:]  # 주마다 캐시하는 열
+
+
+def quarter_weeks(year: int, month: int) -> dict:
+    """month가 속한 분기의 주차 {"10월 1주차 (...)": 주 키} (달 경계의 주는 먼저 나온 달에만)"""
+    first = (month - 1) // 3 * 3 + 1
+    out, seen = {}, set()
+    for m in range(first, first + 3):
+        for label, wk in generate_calendar_weeks(year, m).items():
+            if wk not in seen:
+                seen.add(wk)
+                out[f"{m}월 {label}"] = wk
+    return out
+
+
+def _week_detail(week_detail) -> dict:
+    """{요일: {"main", "routine"}}로 맞춤 (화면은 고르는 주만 변환하므로 다른 주는 과거 구조일 수 있음)"""
+    out = {}
+    for d in DAYS_KR:
+        v = (week_detail or {}).get(d) or {}
+        if isinstance(v, list):  # 과거 구조
+            v = {"main": v}
+        out[d] = {"main": list(v.get("main", ())), "routine": list(v.get("routine", ()))}
+    return out
+
+
+def _detail_key(week_detail) -> tuple:
+    return tuple((tuple(v["main"]), tuple(v["routine"])) for v in _week_detail(week_detail).values())
+
+
+def week_version(sel, week_detail) -> tuple:
+    """주 하나의 계획 버전 (내용이 같으면 같은 키)"""
+    sel = sel or {}
+    return tuple(sel.get("focus", ())), tuple(sel.get("routine", ())), _detail_key(week_detail)
+
+
+class DayPlanCache:
+    """주 키 → (버전, 열). 세션마다 하나 (session_state['_day_plans'])"""
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity
+        self._weeks = {}
+        self.hits = 0
+        self.misses = 0
+        self.last_built = 0  # 직전 table()에서 다시 만든 주 수
+        self._table = None    # (주차 목록, 표): 바뀐 주가 없으면 지난 표를 그대로 (읽기 전용으로 사용)
+
+    def _refresh(self, week_keys, weekly_plan, day_detail):
+        stale = {}
+        for wk in week_keys:
+            version = week_version(weekly_plan.get(wk), day_detail.get(wk))
+            cached = self._weeks.get(wk)
+            if cached is not None and cached[0] == version:
+                self.hits += 1
+            else:
+                stale[wk] = version
+        self.misses += len(stale)
+        self.last_built = len(stale)
+        if not stale:
+            return
+        blocks = schedule_month(weekly_plan, stale, day_detail, self.capacity)
+        for wk, version in stale.items():
+            rows = week_plan_rows(blocks.get(wk, {}), _week_detail(day_detail.get(wk)), None)
+            self._weeks[wk] = (version, tuple(tuple(r[c] for r in rows) for c in _CACHED))
+
+    def table(self, weeks: dict, weekly_plan: dict, day_detail=None) -> pd.DataFrame:
+        """{라벨: 주 키} 전체 → 주 × 요일 긴 표 (바뀐 주만 다시 계산)"""
+        day_detail = day_detail or {}
+        week_keys = list(weeks.values())
+        self._refresh(week_keys, weekly_plan, day_detail)
+        span = tuple(weeks.items())
+        if not self.last_built and self._table is not None and self._table[0] == span:
+            return self._table[1]
+        n = len(week_keys)
+        cal = get_calendar_index()
+        starts = np.array([cal.week_start(wk) for wk in week_keys], dtype="datetime64[D]")
+        dates = np.repeat(starts, 7) + np.tile(np.arange(7), n)
+        frame = {
+            "주차": np.repeat(np.array(list(weeks), dtype=object), 7),
+            "주": np.repeat(np.array(week_keys, dtype=object), 7),
+            "요일": np.tile(np.array(DAYS_KR, dtype=object), n),
+            "날짜": np.datetime_as_string(dates, unit="D").astype(object),
+        }
+        for i, c in enumerate(_CACHED):
+            frame[c] = list(chain.from_iterable(self._weeks[wk][1][i] for wk in week_keys))
+        table = pd.DataFrame(frame, columns=COLUMNS)
+        self._table = (span, table)
+        return table
+
+    def stats(self) -> dict:
+        return {"weeks": len(self._weeks), "hits": self.hits, "misses": self.misses}
+
+
+def to_csv_bytes(table: pd.DataFrame) -> bytes:
+    """한 파일로 내보내기 (엑셀에서 바로 열리게 utf-8-sig)"""
+    return table.to_csv(index=False).encode("utf-8-sig")
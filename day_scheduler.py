@@ -0,0 +1,143 @@
+"""
+요일 자동 배치: 부하 균형 스케줄러 (우선순위 큐 그리디)
+
+- 항목: {"tag", "title", "effort", "count", "pin"}
+    tag    : "메인" / "메인-마무리/체크업" / "배경" / 주말 안내 등 (출력은 "태그: 제목")
+    effort : 한 번 배치할 때의 부하 (기본 메인 2, 배경 1)
+    count  : 한 주에 몇 번 (pin이 있으면 pin 요일 수만큼)
+    pin    : 고정 요일 (있으면 그 요일마다 한 번)
+    allow  : 놓을 수 있는 요일 (없으면 전부, 모두 찼으면 그중 가장 한가한 요일)
+- 요일 용량(capacity)과 이미 적어 둔 상세 플랜(day_detail, 한 줄 = DETAIL_EFFORT)을 부하로 봄
+- 고정 항목을 먼저 놓고, 나머지는 부하가 큰 것부터(같으면 항목끼리 번갈아) '부하/용량'이 가장 낮은 요일에
+  (같은 항목은 하루 한 번)
+  요일 d개를 힙으로 관리 → 항목 n개에 O(n log d)
+- 기본 규칙(week_items): 메인마다 금요일 마무리 1회 + 평일 슬롯 MAIN_SLOTS개를 메인끼리 나눔,
+  배경은 ROUTINE_SLOTS개를 배경끼리 나눔, 토/일은 보완·회고 안내 고정
+- schedule_month: 한 달(여러 주)의 주간 계획을 한 번에 배치
+"""
+import heapq
+
+from week_csv import DAYS_KR
+
+WEEKDAYS = DAYS_KR[:5]
+DEFAULT_CAPACITY = {"월": 4, "화": 4, "수": 4, "목": 4, "금": 4, "토": 2, "일": 2}
+MAIN_EFFORT = 2
+ROUTINE_EFFORT = 1
+NOTE_EFFORT = 1
+DETAIL_EFFORT = 1   # 상세 플랜 한 줄
+MAIN_SLOTS = 4      # 메인들이 나눠 갖는 평일 횟수 (금요일 마무리는 별도)
+ROUTINE_SLOTS = 7   # 배경들이 나눠 갖는 횟수
+
+WEEKEND_NOTES = (("토", "보완/보충", "이번 주 미완료 항목 처리"), ("일", "회고/정리", "다음 주 준비"))
+# 한 요일 안에서의 표시 순서
+_TAG_ORDER = {"메인": 0, "메인-마무리/체크업": 1, "배경": 3}
+
+
+def _split(total: int, n: int) -> list:
+    """total을 n개에 고르게 (앞쪽부터 1씩 더)"""
+    return [total // n + (i < total % n) for i in range(n)] if n else []
+
+
+def week_items(mains, routines, main_effort=MAIN_EFFORT, routine_effort=ROUTINE_EFFORT) -> list:
+    """주간 포커스/배경 → 배치할 항목 목록 (기본 규칙)"""
+    mains = [m for m in mains if m]
+    routines = [r for r in routines if r]
+    items = []
+    for title, n in zip(mains, _split(MAIN_SLOTS, len(mains))):
+        items.append({"tag": "메인-마무리/체크업", "title": title, "effort": main_effort, "pin": ("금",)})
+        if n:
+            items.append({"tag": "메인", "title": title, "effort": main_effort, "count": n, "allow": WEEKDAYS[:4]})
+    for day, tag, text in WEEKEND_NOTES:
+        items.append({"tag": tag, "title": text, "effort": NOTE_EFFORT, "pin": (day,)})
+    for title, n in zip(routines, _split(ROUTINE_SLOTS, len(routines))):
+        if n:
+            items.append({"tag": "배경", "title": title, "effort": routine_effort, "count": n})
+    return items
+
+
+def detail_load(week_detail) -> dict:
+    """{요일: {"main": [...], "routine": [...]}} → {요일: 부하}"""
+    load = {}
+    for d, v in (week_detail or {}).items():
+        if isinstance(v, list):  # 과거 구조
+            n = len(v)
+        else:
+            n = len(v.get("main", [])) + len(v.get("routine", []))
+        load[d] = n * DETAIL_EFFORT
+    return load
+
+
+def balance_days(items, capacity=None, existing=None):
+    """
+    항목 → ({요일: [(tag, title)]}, {요일: 부하})
+    capacity: {요일: 용량} (없으면 DEFAULT_CAPACITY), existing: {요일: 이미 있는 부하}
+    """
+    capacity = {**DEFAULT_CAPACITY, **(capacity or {})}
+    load = [float((existing or {}).get(d, 0)) for d in DAYS_KR]
+    cap = [float(capacity[d]) for d in DAYS_KR]
+    placed = [[] for _ in DAYS_KR]
+    titles = [set() for _ in DAYS_KR]
+    index = {d: i for i, d in enumerate(DAYS_KR)}
+
+    def ratio(i):
+        return load[i] / cap[i] if cap[i] > 0 else float("inf")
+
+    free = []
+    for order, it in enumerate(items):
+        effort = it.get("effort", 1)
+        if it.get("pin"):
+            for d in it["pin"]:
+                i = index[d]
+                placed[i].append((it["tag"], it["title"]))
+                titles[i].add(it["title"])
+                load[i] += effort
+        else:
+            free += [(-effort, k, order, it) for k in range(it.get("count", 1))]
+    free.sort(key=lambda x: x[:3])  # 부하 큰 것부터, 같으면 항목끼리 번갈아 (A, B, A, B ...)
+
+    heap = [(ratio(i), i) for i in range(len(DAYS_KR))]
+    heapq.heapify(heap)
+    for neg_effort, _, _, it in free:
+        skipped = []
+        allow = it.get("allow")
+        while heap:
+            r, i = heapq.heappop(heap)
+            if it["title"] in titles[i] or (allow and DAYS_KR[i] not in allow):
+                skipped.append((r, i))
+                continue
+            break
+        else:  # 놓을 요일이 없음 → 허용 요일 중 가장 한가한 곳(없으면 전체에서)에 한 번 더
+            pick = next((k for k, (_, j) in enumerate(skipped) if not allow or DAYS_KR[j] in allow), 0)
+            r, i = skipped.pop(pick)
+        placed[i].append((it["tag"], it["title"]))
+        titles[i].add(it["title"])
+        load[i] -= neg_effort
+        heapq.heappush(heap, (ratio(i), i))
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+
+    blocks = {d: sorted(placed[i], key=lambda x: _TAG_ORDER.get(x[0], 2)) for i, d in enumerate(DAYS_KR)}
+    return blocks, dict(zip(DAYS_KR, load))
+
+
+def schedule_week(items, capacity=None, existing=None) -> dict:
+    """항목 → {요일: ["태그: 제목", ...]} (split_auto_items/week_plan_rows가 읽는 형식)"""
+    blocks, _ = balance_days(items, capacity, existing)
+    return {d: [f"{tag}: {title}" for tag, title in v] for d, v in blocks.items()}
+
+
+def schedule_month(weekly_plan: dict, week_keys, day_detail=None, capacity=None, max_mains: int = None) -> dict:
+    """
+    여러 주를 한 번에: {주: {요일: [...]}} (포커스가 없는 주는 빠짐)
+    day_detail: {주: {요일: {"main", "routine"}}} — 이미 적어 둔 상세 플랜을 부하로 반영
+    """
+    day_detail = day_detail or {}
+    out = {}
+    for wk in week_keys:
+        plan = weekly_plan.get(wk) or {}
+        mains = list(plan.get("focus", []))[:max_mains] if max_mains else list(plan.get("focus", []))
+        if not mains:
+            continue
+        items = week_items(mains, plan.get("routine", []))
+        out[wk] = schedule_week(items, capacity, detail_load(day_detail.get(wk)))
+    return out
@@ -0,0 +1,282 @@
+"""
+변환된 목표 워크북의 디스크 캐시 (서버 재시작/새 세션/배치 워커 사이에서 공유)
+
+- 파일 하나 = 워크북 하나: <디렉터리>/<내용 sha256>.wbc
+- 내용: 시트 목록 + 표 여러 개(목표 df, 목표 테이블), 열 단위 이진
+    숫자/불리언/날짜 열: numpy 원시 배열
+    문자열 열: 결측 표시 + 바이트 위치(int64) + UTF-8 한 덩어리
+      (pandas 문자열 dtype이 pyarrow 기반이면 복사 없이 Arrow 배열로 바로 감쌈)
+    그 밖의 object 열: 값마다 태그를 붙인 JSON (지원하지 않는 값이 있으면 저장하지 않음)
+  파일 구조: magic | version u16 | meta 길이 u32 | sha256(meta+본문) 32바이트 | meta(JSON) | 본문
+- 무결성: magic/버전/해시/워크북 digest가 하나라도 어긋나면 지우고 없는 것으로 취급
+- 크기 상한을 넘으면 오래 안 쓴 파일(mtime)부터 삭제. 읽을 때 mtime을 갱신(LRU)
+- 쓰기는 임시 파일 → os.replace (여러 프로세스가 같은 디렉터리를 써도 안전)
+설정: TIME_APP_DISK_CACHE(경로, 기본 .workbook_cache, 빈 값이면 끔), TIME_APP_DISK_CACHE_MB(기본 512)
+"""
+import datetime
+import hashlib
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:  # pandas 문자열 dtype이 pyarrow 기반일 때만 사용
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+MAGIC = b"TFWBC"
+VERSION = 1  # 파일 형식이나 load_goal_workbook/parse_goal_table 결과 모양이 바뀌면 올림
+SUFFIX = ".wbc"
+
+_HEAD = struct.Struct("<5sHI32s")
+
+DISK_CACHE_DIR = os.environ.get("TIME_APP_DISK_CACHE", ".workbook_cache")
+DISK_CACHE_MAX_BYTES = int(float(os.environ.get("TIME_APP_DISK_CACHE_MB", "512")) * 1024 * 1024)
+
+
+class _Unsupported(Exception):
+    pass
+
+
+# ---- 열 인코딩 ----
+def _arrow_buffers(values: pd.Series):
+    """pyarrow 기반 문자열 열 → (결측 표시, 바이트 위치, UTF-8 덩어리). 값마다 파이썬 객체를 만들지 않음"""
+    arr = pa.array(values).cast(pa.large_string())
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    n = len(arr)
+    _, off_buf, data_buf = arr.buffers()
+    offsets = np.frombuffer(off_buf, dtype=np.int64)[arr.offset:arr.offset + n + 1] if n else np.zeros(1, np.int64)
+    blob = data_buf.to_pybytes()[offsets[0]:offsets[-1]] if data_buf is not None else b""
+    na = arr.is_null().to_numpy(zero_copy_only=False)
+    return na, offsets - offsets[0], blob
+
+
+def _encode_column(values, dtype, body: bytearray) -> dict:
+    def part(raw: bytes):
+        body.extend(raw)
+        return [len(body) - len(raw), len(raw)]
+
+    arr = np.asarray(values) if dtype.kind in "iufbM" else None
+    if arr is not None and arr.dtype.kind in "iufbM":
+        arr = np.ascontiguousarray(arr)
+        return {"codec": "raw", "dtype": str(dtype), "np": arr.dtype.str, "n": len(arr), "parts": [part(arr.tobytes())]}
+
+    if pa is not None and getattr(dtype, "storage", None) == "pyarrow" and isinstance(values, pd.Series):
+        na, offsets, blob = _arrow_buffers(values)
+        return {"codec": "str", "dtype": str(dtype), "n": len(na),
+                "parts": [part(na.astype(np.uint8).tobytes()), part(offsets.tobytes()), part(blob)]}
+
+    values = list(values)
+    na = pd.isna(pd.Series(values, dtype=object)).to_numpy()
+    if all(isinstance(v, str) for v, m in zip(values, na) if not m):
+        raws = [b"" if m else v.encode("utf-8") for v, m in zip(values, na)]
+        offsets = np.zeros(len(raws) + 1, dtype=np.int64)
+        np.cumsum([len(r) for r in raws], out=offsets[1:])
+        blob = b"".join(raws)
+        return {"codec": "str", "dtype": str(dtype), "n": len(raws),
+                "parts": [part(na.astype(np.uint8).tobytes()), part(offsets.tobytes()), part(blob)]}
+
+    tagged = []
+    for v, m in zip(values, na):
+        if m:
+            tagged.append(None)
+        elif isinstance(v, (bool, np.bool_)):
+            tagged.append(["b", bool(v)])
+        elif isinstance(v, (int, np.integer)):
+            tagged.append(["i", int(v)])
+        elif isinstance(v, (float, np.floating)):
+            tagged.append(["f", float(v)])
+        elif isinstance(v, str):
+            tagged.append(["s", v])
+        elif isinstance(v, datetime.datetime):
+            tagged.append(["t", v.isoformat()])
+        else:
+            raise _Unsupported(type(v).__name__)
+    return {"codec": "json", "dtype": str(dtype), "n": len(tagged),
+            "parts": [part(json.dumps(tagged, ensure_ascii=False).encode("utf-8"))]}
+
+
+_FROM_TAG = {"b": bool, "i": int, "f": float, "s": str, "t": datetime.datetime.fromisoformat}
+
+
+def _arrow_strings(n: int, na: np.ndarray, offsets: bytes, blob: bytes):
+    valid = np.packbits(~na, bitorder="little")
+    return pa.LargeStringArray.from_buffers(
+        n, pa.py_buffer(offsets), pa.py_buffer(blob), pa.py_buffer(valid), null_count=int(na.sum())
+    )
+
+
+def _decode_column(spec: dict, body: bytes):
+    chunks = [body[a:a + n] for a, n in spec["parts"]]
+    dtype = spec["dtype"]
+    if spec["codec"] == "raw":
+        arr = np.frombuffer(chunks[0], dtype=np.dtype(spec["np"])).copy()
+        return pd.array(arr, dtype=dtype) if dtype != arr.dtype.name else arr
+    if spec["codec"] == "str":
+        na = np.frombuffer(chunks[0], dtype=np.uint8).astype(bool)
+        if dtype != "object" and pa is not None and getattr(pd.api.types.pandas_dtype(dtype), "storage", None) == "pyarrow":
+            return pd.array(_arrow_strings(spec["n"], na, chunks[1], chunks[2]), dtype=dtype)
+        offsets = np.frombuffer(chunks[1], dtype=np.int64).tolist()
+        blob = chunks[2]
+        values = [np.nan if m else blob[a:b].decode("utf-8") for m, a, b in zip(na, offsets[:-1], offsets[1:])]
+    else:
+        values = [np.nan if t is None else _FROM_TAG[t[0]](t[1]) for t in json.loads(chunks[0])]
+    if dtype == "object":
+        arr = np.empty(len(values), dtype=object)
+        arr[:] = values
+        return arr
+    return pd.array(values, dtype=dtype)
+
+
+def _encode_frame(df: pd.DataFrame, body: bytearray) -> dict:
+    if not all(isinstance(c, str) for c in df.columns):
+        raise _Unsupported("열 이름이 문자열이 아님")
+    if isinstance(df.index, pd.RangeIndex):
+        index = {"range": [df.index.start, df.index.stop, df.index.step]}
+    else:
+        index = _encode_column(df.index, df.index.dtype, body)
+    return {
+        "index": index,
+        "columns": [dict(_encode_column(df[c], df[c].dtype, body), name=c) for c in df.columns],
+    }
+
+
+def _decode_frame(spec: dict, body: bytes) -> pd.DataFrame:
+    idx = spec["index"]
+    # object 열/인덱스는 dtype을 고정해야 pandas가 문자열/날짜 dtype으로 다시 추론하지 않음
+    if "range" in idx:
+        index = pd.RangeIndex(*idx["range"])
+    else:
+        index = pd.Index(_decode_column(idx, body), dtype=object if idx["dtype"] == "object" else None)
+    return pd.DataFrame({
+        c["name"]: pd.Series(_decode_column(c, body), index=index, dtype=object if c["dtype"] == "object" else None)
+        for c in spec["columns"]
+    }, index=index)
+
+
+def dump_workbook(digest: str, sheet_names, tables: dict) -> bytes:
+    body = bytearray()
+    meta = {
+        "digest": digest,
+        "sheet_names": list(sheet_names),
+        "tables": {name: _encode_frame(df, body) for name, df in tables.items()},
+    }
+    meta_raw = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    check = hashlib.sha256(meta_raw + body).digest()
+    return _HEAD.pack(MAGIC, VERSION, len(meta_raw), check) + meta_raw + bytes(body)
+
+
+def load_workbook_blob(raw: bytes, digest: str = None) -> dict:
+    """파일 내용 → {"sheet_names", "tables"}. 검사에 실패하면 ValueError"""
+    if len(raw) < _HEAD.size:
+        raise ValueError("파일이 너무 짧음")
+    magic, version, meta_len, check = _HEAD.unpack_from(raw, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"형식/버전 불일치 ({magic!r}, v{version})")
+    payload = memoryview(raw)[_HEAD.size:]
+    if hashlib.sha256(payload).digest() != check:
+        raise ValueError("해시 불일치")
+    meta = json.loads(bytes(payload[:meta_len]))
+    if digest is not None and meta["digest"] != digest:
+        raise ValueError("워크북 digest 불일치")
+    body = bytes(payload[meta_len:])
+    return {
+        "sheet_names": meta["sheet_names"],
+        "tables": {name: _decode_frame(spec, body) for name, spec in meta["tables"].items()},
+    }
+
+
+class DiskCache:
+    def __init__(self, directory, max_bytes: int = DISK_CACHE_MAX_BYTES):
+        self.dir = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.corrupt = 0
+        self.skipped = 0
+
+    def path(self, digest: str) -> Path:
+        return self.dir / f"{digest}{SUFFIX}"
+
+    def get(self, digest: str):
+        path = self.path(digest)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            stored = load_workbook_blob(raw, digest)
+        except (ValueError, KeyError, UnicodeDecodeError, struct.error):
+            self.corrupt += 1
+            self.misses += 1
+            path.unlink(missing_ok=True)
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)  # 최근 사용 표시
+        except OSError:
+            pass
+        return stored
+
+    def put(self, digest: str, sheet_names, tables: dict) -> bool:
+        """저장 (지원하지 않는 값이 있으면 저장하지 않고 False)"""
+        try:
+            raw = dump_workbook(digest, sheet_names, tables)
+        except _Unsupported:
+            self.skipped += 1
+            return False
+        with self._lock:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            path = self.path(digest)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(raw)
+            os.replace(tmp, path)
+            self.writes += 1
+            self._evict(keep=path)
+        return True
+
+    def _evict(self, keep=None):
+        files = []
+        for p in self.dir.glob(f"*{SUFFIX}"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:  # 다른 프로세스가 방금 지움
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if p == keep:
+                continue
+            p.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            for p in self.dir.glob(f"*{SUFFIX}"):
+                p.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        return {
+            "disk_hits": self.hits, "disk_misses": self.misses, "disk_writes": self.writes,
+            "disk_evictions": self.evictions, "disk_corrupt": self.corrupt, "disk_skipped": self.skipped,
+        }
+
+
+def default_disk_cache():
+    """환경 설정의 디스크 캐시 (TIME_APP_DISK_CACHE가 빈 값이면 None)"""
+    if not DISK_CACHE_DIR:
+        return None
+    return DiskCache(DISK_CACHE_DIR)
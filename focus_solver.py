@@ -0,0 +1,185 @@
+"""
+누락된 최대선을 주별 포커스 슬롯에 배치하는 최소 비용 유량(min-cost flow) 솔버
+
+그래프
+  S → 목표(용량 1)
+  목표 → HUB → 주(빈 슬롯)            : 새로 추가 (ADD_COST)
+  목표 → 주(빈 슬롯)                   : 그 주 routine에 이미 있으면 승격 (PROMOTE_COST)
+  목표 → 주(꽉 찬 슬롯)                : routine 승격 + 기존 포커스 밀어내기 (DISPLACE_COST)
+  주 → T (용량: 빈 슬롯 수 / 밀어낼 수 있는 기존 포커스 수)
+그 주에만 포커스로 있는 최대선(protected)은 밀어내지 않음 → 누락 하나를 메우려고 다른 누락을 만들지 않음
+선호(week_prefs)나 충돌(conflicts)이 있는 목표만 주별 간선을 직접 갖고,
+나머지는 HUB 하나를 공유해 간선 수를 목표 수 + 주 수 수준으로 유지합니다.
+최단 경로 증가(다익스트라 + 포텐셜)로 배치 수 최대 → 비용 최소 해를 구합니다.
+"""
+import heapq
+
+ADD_COST = 10
+PROMOTE_COST = 4
+DISPLACE_COST = 12
+FOCUS_CAPACITY = 2
+
+
+class _FlowGraph:
+    __slots__ = ("n", "adj", "to", "cap", "cost")
+
+    def __init__(self, n):
+        self.n = n
+        self.adj = [[] for _ in range(n)]
+        self.to = []
+        self.cap = []
+        self.cost = []
+
+    def add_edge(self, u, v, cap, cost):
+        e = len(self.to)
+        self.to += [v, u]
+        self.cap += [cap, 0]
+        self.cost += [cost, -cost]
+        self.adj[u].append(e)
+        self.adj[v].append(e + 1)
+        return e
+
+    def min_cost_flow(self, s, t):
+        """최대 유량 중 최소 비용. 반환: (유량, 비용)"""
+        n, adj, to, cap, cost = self.n, self.adj, self.to, self.cap, self.cost
+        potential = [0] * n
+        flow = total = 0
+        inf = float("inf")
+        while True:
+            dist = [inf] * n
+            prev_edge = [-1] * n
+            dist[s] = 0
+            heap = [(0, s)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                pu = potential[u]
+                for e in adj[u]:
+                    if cap[e] <= 0:
+                        continue
+                    v = to[e]
+                    nd = d + cost[e] + pu - potential[v]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        prev_edge[v] = e
+                        heapq.heappush(heap, (nd, v))
+            if dist[t] == inf:
+                break
+            for v in range(n):
+                if dist[v] < inf:
+                    potential[v] += dist[v]
+            # 경로의 병목만큼 보냄
+            push = inf
+            v = t
+            while v != s:
+                e = prev_edge[v]
+                push = min(push, cap[e])
+                v = to[e ^ 1]
+            v = t
+            while v != s:
+                e = prev_edge[v]
+                cap[e] -= push
+                cap[e ^ 1] += push
+                total += push * cost[e]
+                v = to[e ^ 1]
+            flow += push
+        return flow, total
+
+
+def solve_focus_placement(week_keys, plan_ids, missing, capacity=FOCUS_CAPACITY,
+                          week_prefs=None, conflicts=None, protected=None):
+    """
+    week_keys : 주 키 목록(순서 = 달력 순서)
+    plan_ids  : {주: (현재 focus 항목들(개수만 사용), routine ID 튜플)}
+    missing   : 배치할 목표 ID 목록(우선순위 순)
+    week_prefs: {목표 ID: {주: 추가 비용}} (음수면 그 주를 선호)
+    conflicts : {목표 ID: {배치 불가 주...}}
+    protected : {주: 밀어내면 안 되는 기존 포커스 수} (그 주가 유일한 포커스 주인 최대선)
+    반환: {"suggestions": [(주, ID)], "swaps": [(주, ID)], "cost": int, "unplaced": [ID]}
+      - suggestions: 빈 슬롯에 새로 추가
+      - swaps: 그 주 routine을 focus로 승격 (꽉 찬 주면 기존 포커스 하나가 밀려남)
+    """
+    week_prefs = week_prefs or {}
+    conflicts = conflicts or {}
+    protected = protected or {}
+    week_keys = list(week_keys)
+    missing = list(missing)
+    G, W = len(missing), len(week_keys)
+    if not G or not W:
+        return {"suggestions": [], "swaps": [], "cost": 0, "unplaced": missing}
+
+    S, HUB = 0, G + 1
+    free_node = lambda wi: G + 2 + wi          # noqa: E731
+    disp_node = lambda wi: G + 2 + W + wi      # noqa: E731
+    T = G + 2 + 2 * W
+    graph = _FlowGraph(T + 1)
+
+    routine_weeks = {}  # 목표 ID → routine으로 들어 있는 주 인덱스들
+    n_focus, n_disp = [0] * W, [0] * W
+    for wi, wk in enumerate(week_keys):
+        focus, routine = plan_ids.get(wk, ((), ()))
+        n_focus[wi] = min(len(focus), capacity)
+        n_disp[wi] = max(0, n_focus[wi] - protected.get(wk, 0))
+        free = capacity - n_focus[wi]
+        if free > 0:
+            graph.add_edge(HUB, free_node(wi), free, ADD_COST)
+            graph.add_edge(free_node(wi), T, free, 0)
+        if n_disp[wi] > 0:
+            graph.add_edge(disp_node(wi), T, n_disp[wi], 0)
+        for gid in routine:
+            routine_weeks.setdefault(gid, set()).add(wi)
+
+    # (간선 번호, 주 인덱스, 종류)
+    placement_edges = []
+    for gi, gid in enumerate(missing):
+        node = gi + 1
+        graph.add_edge(S, node, 1, 0)
+        prefs = week_prefs.get(gid, {})
+        banned = conflicts.get(gid, ())
+        r_weeks = routine_weeks.get(gid, ())
+        if not prefs and not banned:
+            e = graph.add_edge(node, HUB, 1, 0)
+            placement_edges.append((e, gi, None, "add"))
+        for wi, wk in enumerate(week_keys):
+            if wk in banned:
+                continue
+            pref = prefs.get(wk, 0)
+            if wi in r_weeks:
+                if n_focus[wi] < capacity:
+                    e = graph.add_edge(node, free_node(wi), 1, max(0, PROMOTE_COST + pref))
+                    placement_edges.append((e, gi, wi, "promote"))
+                if n_disp[wi] > 0:
+                    e = graph.add_edge(node, disp_node(wi), 1, max(0, DISPLACE_COST + pref))
+                    placement_edges.append((e, gi, wi, "promote"))
+            elif (prefs or banned) and n_focus[wi] < capacity:
+                e = graph.add_edge(node, free_node(wi), 1, max(0, ADD_COST + pref))
+                placement_edges.append((e, gi, wi, "add"))
+
+    _, cost = graph.min_cost_flow(S, T)
+
+    # HUB로 들어간 유량은 HUB → 주 간선에서 주를 찾아 목표에 배분
+    hub_weeks = []
+    for e in graph.adj[HUB]:
+        if e % 2 == 0:  # 정방향 간선만
+            v = graph.to[e]
+            used = graph.cap[e ^ 1]
+            hub_weeks.extend([v - (G + 2)] * used)
+    hub_weeks.sort()
+
+    placed = {}  # gi → (wi, kind)
+    hub_goals = []
+    for e, gi, wi, kind in placement_edges:
+        if graph.cap[e] == 0:  # 유량 1이 흘렀음
+            if wi is None:
+                hub_goals.append(gi)
+            else:
+                placed[gi] = (wi, kind)
+    for gi, wi in zip(sorted(hub_goals), hub_weeks):
+        placed[gi] = (wi, "add")
+
+    suggestions, swaps = [], []
+    for gi, (wi, kind) in sorted(placed.items(), key=lambda x: (x[1][0], x[0])):
+        (suggestions if kind == "add" else swaps).append((week_keys[wi], missing[gi]))
+    unplaced = [gid for gi, gid in enumerate(missing) if gi not in placed]
+    return {"suggestions": suggestions, "swaps": swaps, "cost": cost, "unplaced": unplaced}
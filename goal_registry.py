@@ -0,0 +1,97 @@
+"""
+월 목표 레지스트리: 목표마다 작은 정수 ID를 붙여 커버리지/가상 계획 계산을 정수로 처리
+
+- 정규화 키(_normalize_text)는 서로 다른 라벨마다 한 번만 계산
+- 라벨 → ID, ID → 라벨/키 조회는 dict/list 인덱싱(O(1))
+"""
+import re
+import unicodedata
+
+
+def _normalize_text(s: str) -> str:
+    # 공백/기호/대소문자 차이로 매칭 실패하지 않게 정규화
+    s = unicodedata.normalize("NFKC", str(s)).strip()
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+
+class Goal:
+    __slots__ = ("id", "key", "label", "kind", "section", "item")
+
+    def __init__(self, gid, key, label, kind, section, item):
+        self.id = gid
+        self.key = key
+        self.label = label
+        self.kind = kind
+        self.section = section
+        self.item = item
+
+    def __repr__(self):
+        return f"Goal({self.id}, {self.label!r}, {self.kind})"
+
+
+class GoalRegistry:
+    def __init__(self):
+        self.goals = []       # ID → Goal
+        self._by_key = {}     # 정규화 키 → ID
+        self._by_label = {}   # 원본 라벨 → ID (목표가 아니면 -1)
+
+    def __len__(self):
+        return len(self.goals)
+
+    def __iter__(self):
+        return iter(self.goals)
+
+    @classmethod
+    def from_month_goals(cls, month_goals: dict):
+        """build_month_goals/goals_for_month 결과(정규화 키 → 사전)로 생성"""
+        reg = cls()
+        for key, g in month_goals.items():
+            reg.add(key, g["label"], g["kind"], g.get("section"), g.get("item"))
+        return reg
+
+    def add(self, key, label, kind, section=None, item=None) -> int:
+        gid = self._by_key.get(key)
+        if gid is not None:
+            return gid
+        gid = len(self.goals)
+        self.goals.append(Goal(gid, key, label, kind, section, item))
+        self._by_key[key] = gid
+        self._by_label[label] = gid
+        return gid
+
+    def id_of(self, label):
+        """라벨 → ID (목표가 아니면 None). 처음 보는 라벨만 정규화"""
+        gid = self._by_label.get(label)
+        if gid is None:
+            gid = self._by_key.get(_normalize_text(label), -1)
+            self._by_label[label] = gid
+        return gid if gid >= 0 else None
+
+    def id_of_key(self, key):
+        return self._by_key.get(key)
+
+    def ids(self, labels) -> list:
+        """라벨 목록 → ID 목록 (목표가 아닌 라벨은 건너뜀)"""
+        out = []
+        for label in labels:
+            gid = self.id_of(label)
+            if gid is not None:
+                out.append(gid)
+        return out
+
+    def label(self, gid: int) -> str:
+        return self.goals[gid].label
+
+    def key(self, gid: int) -> str:
+        return self.goals[gid].key
+
+    def kind(self, gid: int) -> str:
+        return self.goals[gid].kind
+
+    def encode_plan(self, weekly_plan: dict) -> dict:
+        """{주: {"focus": [라벨], "routine": [라벨]}} → {주: (focus ID 튜플, routine ID 튜플)}"""
+        return {
+            wk: (tuple(self.ids(v.get("focus", []))), tuple(self.ids(v.get("routine", []))))
+            for wk, v in weekly_plan.items()
+        }
@@ -0,0 +1,109 @@
+"""
+'최대선_최소선' 시트 전체를 한 번에 파싱하는 벡터화 파서
+
+parse_goals()를 셀마다 줄 단위로 돌리는 대신, 모든 셀을 줄로 쪼개(explode)
+pandas 문자열 연산으로 [소주제]/• 항목을 한꺼번에 해석합니다.
+결과는 (월, 프로젝트, 종류, 소주제, 항목, 정규화 키) 긴 형식 테이블 하나이며,
+월을 바꿀 때는 이 테이블을 필터링만 합니다.
+
+셀 단위 결과는 parse_goals(str(셀))과 동일합니다.
+소주제는 셀 안에서만 이어집니다. 예전 화면처럼 셀을 이어 붙여 파싱하면 소주제 없는 항목이
+앞 셀의 소주제를 물려받아 월 목표 라벨과 달라지므로, 선택지도 셀 단위로 만듭니다.
+"""
+import re
+
+import pandas as pd
+
+# str.splitlines()와 같은 줄 구분자
+_LINE_SPLIT = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+# parse_goals의 re.match(r"\[(.*?)\]", line) + 나머지
+_HEADER = re.compile(r"^\[(.*?)\](.*)$", re.S)
+_SPACES = re.compile(r"\s+")
+
+GOAL_TABLE_COLUMNS = ["month", "project", "kind", "section", "item", "label", "key", "cell", "line"]
+
+# build_month_goals와 같은 순서: 최대선 셀 전체 → 최소선 셀 전체
+_KIND_COLUMNS = (("max", "최대선"), ("min", "최소선"))
+
+
+def normalize_labels(labels: pd.Series) -> pd.Series:
+    """_normalize_text의 벡터 버전 (NFKC + 앞뒤 공백 제거 + 연속 공백 축약)"""
+    return labels.str.normalize("NFKC").str.strip().str.replace(_SPACES, " ", regex=True)
+
+
+def parse_goal_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    목표 df(프로젝트/월/최소선/최대선...) → 긴 형식 목표 테이블
+      month, project, kind('max'|'min'), section, item, label, key, cell, line
+    행 순서는 최대선 셀 → 최소선 셀, 셀 안에서는 줄 순서.
+    """
+    parts = []
+    for kind, col in _KIND_COLUMNS:
+        if col not in df.columns:
+            continue
+        cells = df[col].dropna()
+        parts.append(pd.DataFrame({
+            "month": df.loc[cells.index, "월"].to_numpy() if "월" in df.columns else None,
+            "project": df.loc[cells.index, "프로젝트"].to_numpy() if "프로젝트" in df.columns else None,
+            "kind": kind,
+            "text": cells.astype(str).to_numpy(),
+        }))
+    if not parts:
+        return pd.DataFrame(columns=GOAL_TABLE_COLUMNS)
+    cells = pd.concat(parts, ignore_index=True)
+    cells["cell"] = range(len(cells))
+
+    # 줄 단위로 펼치기
+    lines = cells.assign(line=cells["text"].str.split(_LINE_SPLIT, regex=True)).explode("line", ignore_index=True)
+    lines = lines.drop(columns="text")
+    lines["line"] = lines["line"].fillna("").astype(str).str.strip()
+    lines = lines[lines["line"] != ""]
+    if lines.empty:
+        return pd.DataFrame(columns=GOAL_TABLE_COLUMNS)
+
+    text = lines["line"]
+    header = text.str.extract(_HEADER)
+    is_header = header[0].notna()
+    header_section = header[0].str.strip()
+    after = header[1].fillna("").str.strip()
+
+    # 현재 [소주제]를 셀 안에서 아래로 채움
+    section_ff = header_section.where(is_header).groupby(lines["cell"]).ffill()
+
+    inline = is_header & after.str.startswith("•")
+    bullet = ~is_header & text.str.startswith("•")
+
+    item = pd.Series(pd.NA, index=lines.index, dtype=object)
+    item[inline] = after[inline].str.lstrip("•").str.strip()
+    item[bullet] = text[bullet].str.lstrip("•").str.strip()
+    section = pd.Series(pd.NA, index=lines.index, dtype=object)
+    section[inline] = header_section[inline]
+    # 빈 소주제("[]")도 parse_goals처럼 '기타'로
+    section[bullet] = section_ff[bullet].mask(section_ff[bullet] == "").fillna("기타")
+
+    keep = inline | bullet
+    out = lines.loc[keep, ["month", "project", "kind", "cell"]].copy()
+    out["section"] = section[keep].astype(str)
+    out["item"] = item[keep].astype(str)
+    out["label"] = out["section"] + " - " + out["item"]
+    out["key"] = normalize_labels(out["label"])
+    out["line"] = out.groupby("cell").cumcount()
+    return out.reset_index(drop=True)[GOAL_TABLE_COLUMNS]
+
+
+def goals_for_month(table: pd.DataFrame, month):
+    """
+    테이블에서 한 달치 (선택지 라벨 목록, 월 목표 사전) 추출
+      - 선택지: 최소선 → 최대선 순 (중복 포함, 소주제는 셀 단위라 모든 선택지가 월 목표 라벨과 일치)
+      - 월 목표: build_month_goals와 같은 형태 (정규화 키 → label/kind/section/item)
+    """
+    sub = table[table["month"] == month]
+    options = pd.concat([sub[sub["kind"] == "min"], sub[sub["kind"] == "max"]])["label"].tolist()
+    uniq = sub.drop_duplicates("key")
+    goals = {
+        key: {"label": label, "kind": kind, "section": section, "item": item}
+        for key, label, kind, section, item in zip(
+            uniq["key"], uniq["label"], uniq["kind"], uniq["section"], uniq["item"]
+        )
+    }
+    return options, goals
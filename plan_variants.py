@@ -0,0 +1,168 @@
+"""
+주간 계획 변형(가상 계획)의 구조 공유 표현 (copy-on-write)
+
+- PlanVariant: 부모 위에 '덮어쓴 주'만 가지는 읽기 전용 {주: {"focus": (...), "routine": (...)}}
+  덮어쓰지 않은 주는 부모의 값을 그대로 가리킴 → 변형 하나의 비용 = 바꾼 주 수
+- 주 값은 튜플 + 읽기 전용 사전이라 변형을 만든 뒤에는 원본/부모를 바꿀 방법이 없음 (원본 유지가 구조로 보장)
+- changed_weeks(a, b): 공통 조상까지 올라가며 덮어쓴 주만 모음 → diff는 그 주들만 비교
+- PlanVariants: 세션당 이름 붙은 변형 여러 개. 기준 계획은 직전 기준과 달라진 주만 새로 얼려 공유
+"""
+from collections.abc import Mapping
+from types import MappingProxyType
+
+_REMOVED = None  # 부모에는 있지만 이 변형에서 빠진 주
+MAX_DEPTH = 32   # 기준 계획 사슬이 이보다 길어지면 새 뿌리로 다시 얼림 (조회 비용 상한)
+
+
+def freeze_week(sel) -> Mapping:
+    """{"focus": [...], "routine": [...]} → 읽기 전용 사전(값은 튜플)"""
+    sel = sel or {}
+    return MappingProxyType({"focus": tuple(sel.get("focus", ())), "routine": tuple(sel.get("routine", ()))})
+
+
+def _same_week(frozen, sel) -> bool:
+    return (frozen is not None and tuple(sel.get("focus", ())) == frozen["focus"]
+            and tuple(sel.get("routine", ())) == frozen["routine"])
+
+
+class PlanVariant(Mapping):
+    __slots__ = ("parent", "own", "name", "log", "depth")
+
+    def __init__(self, parent=None, overrides=None, name: str = "", log=()):
+        self.parent = parent
+        # 주 → 얼린 값(또는 _REMOVED). 만든 뒤에는 바꾸지 않음
+        self.own = {wk: (v if v is _REMOVED or isinstance(v, MappingProxyType) else freeze_week(v))
+                    for wk, v in (overrides or {}).items()}
+        self.name = name
+        self.log = tuple(log)
+        self.depth = parent.depth + 1 if parent is not None else 0
+
+    @classmethod
+    def freeze(cls, weekly_plan: dict, parent=None, name: str = ""):
+        """가변 계획 → 변형. parent를 주면 parent와 다른 주만 덮어씀 (같으면 parent를 그대로 반환)"""
+        if isinstance(weekly_plan, PlanVariant) and parent is None:
+            return weekly_plan
+        if parent is None or parent.depth >= MAX_DEPTH:
+            return cls(None, weekly_plan, name)
+        overrides = {wk: sel for wk, sel in weekly_plan.items() if not _same_week(parent.get(wk), sel)}
+        overrides.update({wk: _REMOVED for wk in parent if wk not in weekly_plan})
+        return cls(parent, overrides, name) if overrides else parent
+
+    def derive(self, overrides: dict, name: str = "", log=()):
+        return PlanVariant(self, overrides, name, log)
+
+    def renamed(self, name: str):
+        """이름만 다른 같은 변형 (부모/덮어쓴 주는 바꾸지 않으므로 그대로 공유)"""
+        node = PlanVariant.__new__(PlanVariant)
+        node.parent, node.own, node.log, node.depth = self.parent, self.own, self.log, self.depth
+        node.name = name
+        return node
+
+    # ---- Mapping ----
+    def _lookup(self, wk):
+        node = self
+        while node is not None:
+            if wk in node.own:
+                return node.own[wk]
+            node = node.parent
+        return _REMOVED
+
+    def __getitem__(self, wk):
+        v = self._lookup(wk)
+        if v is _REMOVED:
+            raise KeyError(wk)
+        return v
+
+    def __contains__(self, wk):
+        return self._lookup(wk) is not _REMOVED
+
+    def __iter__(self):
+        # 뿌리부터 처음 생긴 순서로, 빠진 주는 건너뜀
+        seen = set()
+        for node in reversed(list(self.ancestors())):
+            for wk in node.own:
+                if wk not in seen:
+                    seen.add(wk)
+                    if self._lookup(wk) is not _REMOVED:
+                        yield wk
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    # ---- 구조 ----
+    def ancestors(self):
+        node = self
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def to_dict(self) -> dict:
+        """가변 사본 (세션 계획에 반영할 때만)"""
+        return {wk: {"focus": list(v["focus"]), "routine": list(v["routine"])} for wk, v in self.items()}
+
+    def __repr__(self):
+        return f"PlanVariant({self.name!r}, 덮어쓴 주 {len(self.own)}, 깊이 {self.depth})"
+
+
+def changed_weeks(a: PlanVariant, b: PlanVariant) -> list:
+    """a와 b가 다를 수 있는 주 (공통 조상 아래에서 덮어쓴 주만, 실제 값이 같은 주는 제외)"""
+    a_chain = list(a.ancestors())
+    b_ids = {id(n) for n in b.ancestors()}
+    common = next((n for n in a_chain if id(n) in b_ids), None)
+    keys = {}
+    for side in (a, b):
+        for node in side.ancestors():
+            if node is common:
+                break
+            keys.update(dict.fromkeys(node.own))
+    return [wk for wk in keys if a._lookup(wk) != b._lookup(wk)]
+
+
+class PlanVariants:
+    """세션당 이름 붙은 가상 계획 목록 (기준 계획들도 서로 구조를 공유)"""
+
+    def __init__(self):
+        self.variants = {}  # 이름 → PlanVariant (추가 순서 유지)
+        self._base = None   # 마지막으로 얼린 기준 계획
+
+    def base(self, weekly_plan: dict, name: str = "원본") -> PlanVariant:
+        """현재 계획을 얼림. 직전 기준과 달라진 주만 새로 저장"""
+        self._base = PlanVariant.freeze(weekly_plan, parent=self._base, name=name)
+        return self._base
+
+    def unique_name(self, name: str) -> str:
+        """이미 있는 이름이면 뒤에 (2), (3) ... 을 붙임"""
+        out, i = name, 2
+        while out in self.variants:
+            out, i = f"{name} ({i})", i + 1
+        return out
+
+    def add(self, name: str, variant: PlanVariant) -> PlanVariant:
+        """이름을 붙여 보관. 넘겨받은 변형은 다른 곳(탐색 결과 캐시 등)과 공유될 수 있어 사본에 이름을 붙임"""
+        if variant.name != name:
+            variant = variant.renamed(name)
+        self.variants[name] = variant
+        return variant
+
+    def remove(self, name: str):
+        self.variants.pop(name, None)
+
+    def get(self, name: str):
+        return self.variants.get(name)
+
+    def names(self) -> list:
+        return list(self.variants)
+
+    def __len__(self):
+        return len(self.variants)
+
+    def stored_weeks(self) -> int:
+        """실제로 들고 있는 주 값 수 (공유된 조상은 한 번만)"""
+        seen, total = set(), 0
+        for v in self.variants.values():
+            for node in v.ancestors():
+                if id(node) in seen:
+                    break
+                seen.add(id(node))
+                total += len(node.own)
+        return total
@@ -0,0 +1,388 @@
+"""
+플래너 계산 로직 (Streamlit 없이 import 가능)
+
+time_app.py(화면)와 batch_plan.py(일괄 생성)가 같은 파이프라인을 사용합니다.
+  목표 엑셀 → 월 목표 → 커버리지/배치 제안 → 가상 계획 → 주간 요일 블록/표
+"""
+import datetime
+import io
+import re
+
+import pandas as pd
+
+from calendar_index import get_calendar_index
+from coverage_model import CoverageModel
+from day_scheduler import schedule_week, week_items
+from goal_registry import GoalRegistry, _normalize_text
+from plan_variants import PlanVariant, changed_weeks
+
+DAYS_KR = ["월", "화", "수", "목", "금", "토", "일"]
+
+MONTH_MAP = {"1월": 1, "2월": 2, "3월": 3, "4월": 4, "5월": 5, "6월": 6,
+             "7월": 7, "8월": 8, "9월": 9, "10월": 10, "11월": 11, "12월": 12}
+
+GOAL_SHEET = "최대선_최소선"
+GOAL_COLUMNS = ["프로젝트", "월", "최소선", "최대선", "측정지표"]
+
+# pd.read_excel 기본 결측 문자열 + 엑셀 오류 값 (read_excel과 같은 결과를 내기 위해)
+_NA_STRINGS = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    "#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!",
+])
+HEADER_SCAN_ROWS = 50  # 헤더 행을 찾을 최대 행 수
+
+
+def _goal_cell(v):
+    if isinstance(v, str):
+        return None if v in _NA_STRINGS else v
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+
+def load_goal_workbook(data: bytes):
+    """
+    xlsx 바이트 → (시트 목록, 목표 df)
+    openpyxl 읽기 전용(스트리밍)으로 목표 시트만 열어, 헤더 행을 찾고 GOAL_COLUMNS 다섯 칸만 읽음
+    (다른 시트/서식/그림은 읽지 않음). '월'이 빈 행은 읽으면서 버림.
+    결과는 pd.read_excel(...)[GOAL_COLUMNS].dropna(subset=["월"])과 같음 (인덱스 = 헤더 아래 행 번호)
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        sheet_names = wb.sheetnames
+        if GOAL_SHEET not in sheet_names:
+            raise ValueError(f"Worksheet named '{GOAL_SHEET}' not found")
+        ws = wb[GOAL_SHEET]
+        ws.reset_dimensions()  # 저장된 범위 정보가 틀린 파일도 끝까지 읽도록
+        rows = ws.iter_rows(values_only=True)
+        header_row = 0
+
+        # 헤더 행: 필요한 이름이 모두 있는 첫 행 (같은 이름이 여러 칸이면 첫 칸)
+        cols = None
+        for header_row, row in zip(range(1, HEADER_SCAN_ROWS + 1), rows):
+            pos = {}
+            for i, v in enumerate(row):
+                if isinstance(v, str):
+                    pos.setdefault(v, i)
+            if "월" in pos:
+                missing = [c for c in GOAL_COLUMNS if c not in pos]
+                if missing:
+                    raise KeyError(f"{missing} not in '{GOAL_SHEET}' header")
+                cols = [pos[c] for c in GOAL_COLUMNS]
+                break
+        if cols is None:
+            raise KeyError(f"'{GOAL_SHEET}' 시트 앞 {HEADER_SCAN_ROWS}행에서 헤더('월')를 찾지 못했습니다")
+
+        # 헤더 아래부터는 필요한 칸까지만 꺼냄
+        rows = ws.iter_rows(min_row=header_row + 1, max_col=max(cols) + 1, values_only=True)
+        index = []
+        values = [[] for _ in cols]
+        # 버린 행의 값 종류(칸마다 종류별 하나) — read_excel은 dropna 전에 열 dtype을 정하므로 맞춰 줌
+        dropped = [{} for _ in cols]
+        for n, row in enumerate(rows):
+            cells = [_goal_cell(row[c]) if c < len(row) else None for c in cols]
+            if cells[1] is None:
+                for seen, v in zip(dropped, cells):
+                    seen.setdefault(type(v), v)
+                continue
+            index.append(n)
+            for col, v in zip(values, cells):
+                col.append(v)
+    finally:
+        wb.close()
+    nan = float("nan")
+    df = pd.DataFrame(index=pd.Index(index, dtype="int64"))
+    for name, col, seen in zip(GOAL_COLUMNS, values, dropped):
+        full = pd.Series([nan if v is None else v for v in col + list(seen.values())])
+        df[name] = full.iloc[:len(col)].set_axis(df.index)
+    return sheet_names, df
+
+
+def build_month_goals(df):
+    """
+    df의 '최대선','최소선'에서 [소주제] • 항목을 파싱해
+    goal_id -> {label, kind('max'|'min'), section, item} 사전 생성
+    """
+    goals = {}
+    seen = set()
+
+    blocks = []
+    if "최대선" in df.columns:
+        blocks += [("max", x) for x in df["최대선"].dropna().tolist()]
+    if "최소선" in df.columns:
+        blocks += [("min", x) for x in df["최소선"].dropna().tolist()]
+
+    for kind, text in blocks:
+        parsed = parse_goals(str(text))
+        for section, item in parsed:
+            label = f"{section} - {item}"
+            key = _normalize_text(label)
+            if key in seen:  # 중복 제거
+                continue
+            seen.add(key)
+            goals[key] = {
+                "label": label,
+                "kind": kind,          # 'max' or 'min'
+                "section": section,
+                "item": item,
+            }
+    return goals  # key는 정규화 label
+
+def compute_coverage(weeks, weekly_plan, month_goals, registry=None, week_prefs=None, conflicts=None):
+    """
+    주차별 선택(weekly_plan) 대비 월 목표 커버리지/누락/과밀을 계산
+    - focus는 가중치 2, routine은 가중치 1(필요시 조정)
+    - 내부 계산은 GoalRegistry의 정수 ID로, 결과는 정규화 키(month_goals 키)로 반환
+    - week_prefs {키: {주: 비용}} / conflicts {키: {주...}} 로 배치 선호/금지 지정
+    - 매번 새로 계산. 화면처럼 한 주씩 바뀌는 경우는 CoverageModel을 유지하며 sync/result
+    """
+    if registry is None:
+        registry = GoalRegistry.from_month_goals(month_goals)
+    model = CoverageModel(weeks, registry)
+    model.sync(weekly_plan)
+    return model.result(week_prefs, conflicts)
+
+
+# 오늘이 포함된 주차 자동 탐색 (라벨 문자열 파싱 없이 달력 인덱스 조회)
+def find_current_week_label(weeks_dict, today=None):
+    today = today or datetime.date.today()
+    current_key = get_calendar_index(today).week_of(today)
+    for label, key in weeks_dict.items():
+        if key == current_key:
+            return label
+    return None
+
+
+def parse_goals(text: str):
+    """
+    문자열에서 [소주제]와 • 항목들을 매핑하여 리스트로 반환
+    """
+    results = []
+    current_section = None
+
+    # 줄 단위로 분리
+    lines = text.strip().splitlines()
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # [소주제] 탐지
+        header_match = re.match(r"\[(.*?)\]", line)
+        if header_match:
+            current_section = header_match.group(1).strip()
+            # 헤더에 바로 붙은 bullet이 있는 경우 ([박사] • ~)
+            after = line[header_match.end():].strip()
+            if after.startswith("•"):
+                item = after.lstrip("•").strip()
+                results.append((current_section, item))
+            continue
+
+        # 일반 bullet 항목
+        if line.startswith("•"):
+            item = line.lstrip("•").strip()
+            section = current_section if current_section else "기타"
+            results.append((section, item))
+
+    return results
+
+# --- [2] 주차 계산 함수 ---
+def generate_calendar_weeks(year: int, month: int):
+    """
+    실제 달력 기준 (월요일~일요일)으로 주차 계산
+    월 경계 포함, 예: "1주차 (9/29~10/5)" → "2025-W40" (ISO 주 키라 달이 달라도 겹치지 않음)
+    """
+    return get_calendar_index(datetime.date(year, month, 1)).month_weeks(year, month)
+
+
+# ---------- 가상 계획 (원본 유지) ----------
+# 승격으로 포커스가 2개를 넘을 때 기존 포커스 중 무엇을 남길지
+#   last: 가장 최근 것(기본) / first: 가장 먼저 있던 것 / redundant: 계획 전체에서 포커스 횟수가 적은 것
+DROP_POLICIES = ("last", "first", "redundant")
+
+
+def _keep_focus(old, policy, focus_counts, registry) -> int:
+    """기존 포커스 목록에서 남길 항목의 위치"""
+    # 계획 전체에서 이 주에만 포커스인 최대선이 하나면 그것을 남김 (밀어내면 새 누락. 솔버도 이런 포커스는 밀지 않음)
+    sole = [i for i, label in enumerate(old)
+            if (gid := registry.id_of(label)) is not None and registry.goals[gid].kind == "max"
+            and focus_counts.get(gid, 0) == 1]
+    if len(sole) == 1:
+        return sole[0]
+    if policy == "first":
+        return 0
+    if policy == "redundant":
+        # 다른 주에서도 포커스인 목표부터 밀어냄 (횟수가 같으면 최근 것을 남김)
+        return min(range(len(old)), key=lambda i: (focus_counts.get(registry.id_of(old[i]), 0), -i))
+    return len(old) - 1
+
+
+def _build_virtual_plan(base_plan, suggestions, swaps, month_goals, registry=None, drop="last"):
+    """
+    원본은 그대로 두고, 제안을 적용한 가상 계획과 로그를 반환
+    가상 계획은 원본(PlanVariant로 얼린 것) 위에 바뀐 주만 덮어쓴 PlanVariant
+    drop: 포커스가 넘칠 때의 정책 (DROP_POLICIES)
+    """
+    if drop not in DROP_POLICIES:
+        raise ValueError(f"알 수 없는 drop 정책: {drop} (가능: {', '.join(DROP_POLICIES)})")
+    if registry is None:
+        registry = GoalRegistry.from_month_goals(month_goals)
+    base = PlanVariant.freeze(base_plan)
+    touched = {}  # 바꾸는 주만 가변 사본
+    applied = []
+    focus_counts = {}  # 목표 ID → 가상 계획 전체의 포커스 횟수 (남길 포커스 고르기에 사용)
+    for v in base.values():
+        for gid in registry.ids(v.get("focus", ())):
+            focus_counts[gid] = focus_counts.get(gid, 0) + 1
+
+    def week(wk):
+        if wk not in touched:
+            cur = base.get(wk) or {}
+            touched[wk] = {"focus": list(cur.get("focus", ())), "routine": list(cur.get("routine", ()))}
+        return touched[wk]
+
+    # 1) 빈 슬롯 add
+    for wk, gid in suggestions:
+        label = month_goals[gid]["label"]
+        plan = week(wk)
+        if label not in plan["focus"] and len(plan["focus"]) < 2:
+            plan["focus"].append(label)
+            applied.append(("add", wk, label, "빈 슬롯에 최대선 배치"))
+            focus_counts[registry.id_of(label)] = focus_counts.get(registry.id_of(label), 0) + 1
+
+    # 2) routine→focus 승격 (2개 제한 유지, 넘치면 앞쪽 것을 잘라 2개만)
+    for wk, gid in swaps:
+        label = month_goals[gid]["label"]
+        plan = week(wk)
+        target = registry.id_of_key(gid)
+        plan["routine"] = [x for x in plan.get("routine", []) if registry.id_of(x) != target]
+        if label not in plan["focus"]:
+            if len(plan["focus"]) >= 2:
+                # 기존 포커스 중 하나만 남기고 승격한 목표를 더해 2개 유지
+                old = plan["focus"]
+                keep = _keep_focus(old, drop, focus_counts, registry)
+                for i, dlab in enumerate(old):
+                    if i != keep:
+                        applied.append(("drop", wk, dlab, "과밀 조정(2개 제한)"))
+                        focus_counts[registry.id_of(dlab)] = focus_counts.get(registry.id_of(dlab), 0) - 1
+                plan["focus"] = [old[keep]]
+            plan["focus"].append(label)
+            focus_counts[registry.id_of(label)] = focus_counts.get(registry.id_of(label), 0) + 1
+            applied.append(("promote", wk, label, "routine→focus 승격"))
+
+    return base.derive(touched, log=applied), applied
+
+
+# ---------- 요일 자동 배치 ----------
+def auto_place_blocks(main_a: str, main_b: str | None, routines: list[str], existing=None, capacity=None):
+    """
+    메인 1~2개 + 배경 → 요일별 자동 제안 (배치는 day_scheduler의 부하 균형)
+    메인은 금요일 마무리/체크업 + 월~목에 나눠, 토/일은 보완·회고 안내, 배경은 덜 찬 요일부터.
+    existing: {요일: 이미 있는 부하} (상세 플랜 등), capacity: {요일: 용량}
+    """
+    return schedule_week(week_items([main_a, main_b], routines), capacity, existing)
+
+
+# ---------- 표(행 목록) 만들기: 화면 표시와 CSV 내보내기 공용 ----------
+def coverage_rows(month_goals, cov_res):
+    rows = []
+    for gid, g in month_goals.items():
+        cv = cov_res["coverage"][gid]
+        rows.append({
+            "구분": "최대선" if g["kind"]=="max" else "최소선",
+            "목표": g["label"],
+            "포커스 횟수": cv["focus"],
+            "배경 횟수": cv["routine"],
+            "배치 주": ", ".join(cv["weeks"]) if cv["weeks"] else "-",
+            "상태": ("누락(포커스 미배정)" if (g["kind"]=="max" and cv["focus"]==0) else "OK")
+        })
+    return rows
+
+
+def suggestion_rows(cov_res, month_goals):
+    rows = []
+    for wk, gid in cov_res["suggestions"]:
+        rows.append({"주차": wk, "조치": "add", "대상": month_goals[gid]["label"], "설명": "빈 슬롯에 최대선 배치"})
+    for wk, gid in cov_res["swaps"]:
+        rows.append({"주차": wk, "조치": "promote", "대상": month_goals[gid]["label"], "설명": "routine→focus 승격"})
+    return rows
+
+
+def virtual_diff_rows(weeks, original, virtual_plan):
+    """주차별 diff (원본 vs. 가상). 둘 다 PlanVariant면 덮어쓴 주만 비교"""
+    if isinstance(original, PlanVariant) and isinstance(virtual_plan, PlanVariant):
+        changed = set(changed_weeks(original, virtual_plan))
+    else:
+        changed = None
+    rows = []
+    for wk in weeks.values():
+        v = virtual_plan.get(wk)
+        if changed is None or wk in changed:
+            b_focus = set(original.get(wk, {}).get("focus", []))
+            a_focus = set(v.get("focus", [])) if v else set()
+            added = sorted(a_focus - b_focus)
+            removed = sorted(b_focus - a_focus)
+        else:
+            added = removed = ()
+        rows.append({
+            "주차": wk,
+            "추가된 포커스": " | ".join(added) if added else "-",
+            "제거된 포커스(가상)": " | ".join(removed) if removed else "-",
+            "가상 계획 포커스": " | ".join(v.get("focus", [])) if v else "-",
+            "가상 계획 배경":  " | ".join(v.get("routine", [])) if v else "-",
+        })
+    return rows
+
+
+def virtual_plan_rows(weeks, virtual_plan):
+    """가상 계획 전체 표(주차별 포커스/배경)"""
+    rows = []
+    for label, wk in weeks.items():
+        v = virtual_plan.get(wk, {"focus": [], "routine": []})
+        rows.append({
+            "주차": label,
+            "포커스(가상)": " | ".join(v.get("focus", [])) or "-",
+            "배경(가상)":  " | ".join(v.get("routine", [])) or "-",
+        })
+    return rows
+
+
+def split_auto_items(default_blocks, d):
+    """자동 제안 → (메인, 배경) 분리"""
+    auto_items = default_blocks.get(d, []) if isinstance(default_blocks, dict) else []
+    auto_main = [x for x in auto_items if not x.startswith("배경:")]
+    auto_routine = [x for x in auto_items if x.startswith("배경:")]
+    return auto_main, auto_routine
+
+
+def week_plan_rows(default_blocks, week_detail, week_dates):
+    """
+    한 주 요약표 (요일별 자동 제안 + 상세 플랜)
+    week_detail: {요일: {"main": [...], "routine": [...]}} (없으면 빈 값)
+    """
+    week_detail = week_detail or {}
+    rows = []
+    for i, d in enumerate(DAYS_KR):
+        date_str = f"{week_dates[i].month}/{week_dates[i].day}" if week_dates else "-"
+
+        # 자동 제안(메인/배경 분리)
+        auto_main, auto_routine = split_auto_items(default_blocks, d)
+
+        # 상세 플랜(메인/배경)
+        detail = week_detail.get(d, {})
+        detail_main = detail.get("main", [])
+        detail_routine = detail.get("routine", [])
+
+        rows.append({
+            "요일": d,
+            "날짜": date_str,
+            "자동 제안(메인)": " | ".join(auto_main) if auto_main else "-",
+            "자동 제안(배경)": " | ".join(auto_routine) if auto_routine else "-",
+            "상세 플랜(메인)": " | ".join(detail_main) if detail_main else "-",
+            "상세 플랜(배경)": " | ".join(detail_routine) if detail_routine else "-",
+        })
+    return rows
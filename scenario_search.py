@@ -0,0 +1,223 @@
+"""
+가상 계획 시나리오 탐색 (여러 후보를 프로세스 풀에서 병렬 평가 → 상위 k개)
+
+후보 하나 = 제안 적용 방식 한 가지
+  - order  : 빈 슬롯 추가(suggestions)와 승격(swaps)을 적용하는 순서
+  - drop   : 포커스가 넘칠 때 남길 기존 포커스 (planner.DROP_POLICIES)
+  - promote: 승격(swaps) 중 실제로 적용할 것
+  0번 후보는 항상 현재 동작(원래 순서, last, 전부 승격)
+점수 (0~100)
+  - 커버리지: 포커스로 한 번 이상 들어간 최대선 비율
+  - 균형    : 주별 포커스 수가 고른 정도 (1 - 표준편차 / 주당 슬롯)
+  - 변경량  : 원본 대비 바뀐 (주, 항목) 수 / 원본 항목 수 (덮어쓴 주만 비교)
+  점수 = 100 × (W_COVERAGE × 커버리지 + W_BALANCE × 균형 − W_CHURN × 변경량)
+워커에는 계획/목표를 덩어리(chunk)마다 한 번만 보내고 점수만 돌려받음.
+같은 계획이 나온 후보는 점수가 가장 높은 것만 남기고, 상위 k개만 부모에서 다시 만들어 diff 표를 붙임.
+설정: TIME_APP_SCENARIO_WORKERS(기본 CPU 수, 1 이하이면 현재 프로세스에서 순서대로)
+후보 하나는 1ms 안팎이라 풀은 후보가 많고 CPU가 여럿일 때만 이득 (첫 호출은 워커 시작 비용이 듦)
+"""
+import atexit
+import multiprocessing
+import os
+import random
+import statistics
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from focus_solver import FOCUS_CAPACITY
+from goal_registry import GoalRegistry
+from plan_variants import PlanVariant, changed_weeks
+from planner import DROP_POLICIES, _build_virtual_plan, virtual_diff_rows
+
+W_COVERAGE = 1.0
+W_BALANCE = 0.3
+W_CHURN = 0.2
+
+SCENARIO_WORKERS = int(os.environ.get("TIME_APP_SCENARIO_WORKERS", str(os.cpu_count() or 1)))
+SERIAL_BELOW = 32  # 후보가 이보다 적으면 풀을 쓰지 않음
+
+
+def generate_scenarios(n_suggestions: int, n_swaps: int, n: int, seed: int = 0) -> list:
+    """후보 n개 (0번은 현재 동작). 같은 seed면 같은 후보"""
+    rng = random.Random(seed)
+    specs = [{"id": 0, "order": None, "swap_order": None, "drop": "last", "promote": None}]
+    for i in range(1, n):
+        order = list(range(n_suggestions))
+        swap_order = list(range(n_swaps))
+        rng.shuffle(order)
+        rng.shuffle(swap_order)
+        keep_rate = rng.choice((1.0, 0.9, 0.75, 0.5))
+        specs.append({
+            "id": i,
+            "order": tuple(order),
+            "swap_order": tuple(swap_order),
+            "drop": rng.choice(DROP_POLICIES),
+            "promote": tuple(rng.random() < keep_rate for _ in range(n_swaps)),
+        })
+    return specs
+
+
+def describe(spec: dict) -> str:
+    if spec["id"] == 0:
+        return "현재 방식"
+    promoted = sum(spec["promote"]) if spec["promote"] is not None else "전부"
+    return f"#{spec['id']} 순서 섞기 · drop={spec['drop']} · 승격 {promoted}개"
+
+
+def apply_scenario(base, suggestions, swaps, month_goals, registry, spec):
+    """후보 하나 적용 → (가상 계획, 적용 로그)"""
+    if spec["order"] is not None:
+        suggestions = [suggestions[i] for i in spec["order"]]
+    if spec["swap_order"] is not None:
+        swaps = [swaps[i] for i in spec["swap_order"]]
+    if spec["promote"] is not None:
+        promote = spec["promote"] if spec["swap_order"] is None else [spec["promote"][i] for i in spec["swap_order"]]
+        swaps = [s for s, keep in zip(swaps, promote) if keep]
+    return _build_virtual_plan(base, suggestions, swaps, month_goals, registry, drop=spec["drop"])
+
+
+def score_plan(week_keys, base: PlanVariant, variant: PlanVariant, registry, n_max: int = None,
+               capacity: int = FOCUS_CAPACITY) -> dict:
+    """n_max: 최대선 전체 수 (registry가 일부 목표만 담은 경우에 넘김)"""
+    max_ids = {g.id for g in registry if g.kind == "max"}
+    n_max = len(max_ids) if n_max is None else n_max
+    covered = set()
+    loads = []
+    for wk in week_keys:
+        focus = (variant.get(wk) or {}).get("focus", ())
+        loads.append(len(focus))
+        covered.update(gid for gid in registry.ids(focus) if gid in max_ids)
+    coverage = len(covered) / n_max if n_max else 1.0
+    balance = max(0.0, 1 - statistics.pstdev(loads) / capacity) if loads else 1.0
+
+    week_set = set(week_keys)
+    changes = 0
+    for wk in changed_weeks(base, variant):
+        if wk not in week_set:
+            continue
+        a, b = base.get(wk) or {}, variant.get(wk) or {}
+        for name in ("focus", "routine"):
+            changes += len(set(a.get(name, ())) ^ set(b.get(name, ())))
+    original_items = sum(len(v.get("focus", ())) + len(v.get("routine", ()))
+                         for wk in week_keys for v in [base.get(wk) or {}])
+    churn = changes / max(original_items, 1)
+
+    score = 100 * (W_COVERAGE * coverage + W_BALANCE * balance - W_CHURN * churn)
+    return {"score": round(score, 2), "coverage": round(coverage, 4), "balance": round(balance, 4),
+            "churn": round(churn, 4), "changes": changes}
+
+
+def _signature(base: PlanVariant, variant: PlanVariant) -> tuple:
+    """원본과 실제로 다른 주의 내용 (같은 계획이면 같은 서명)"""
+    out = []
+    for wk in sorted(changed_weeks(base, variant)):
+        v = variant.get(wk)
+        out.append((wk, None) if v is None else (wk, v["focus"], v["routine"]))
+    return tuple(out)
+
+
+def _evaluate(ctx: dict, specs: list) -> list:
+    """워커에서 실행: 후보들 → [(점수, spec, 계획 서명)]"""
+    base = ctx["base"]
+    if not isinstance(base, PlanVariant):
+        base = PlanVariant.freeze(base)
+    out = []
+    for spec in specs:
+        variant, _ = apply_scenario(base, ctx["suggestions"], ctx["swaps"], ctx["month_goals"], ctx["registry"], spec)
+        metrics = score_plan(ctx["week_keys"], base, variant, ctx["registry"], ctx.get("n_max"))
+        out.append((metrics, spec, _signature(base, variant)))
+    return out
+
+
+def _slim_registry(registry, base: PlanVariant, keys) -> GoalRegistry:
+    """계획에 들어 있는 라벨과 제안 목표만 담은 레지스트리 (워커로 보낼 크기를 줄임)"""
+    ids = set(registry.id_of_key(k) for k in keys)
+    for v in base.values():
+        ids.update(registry.ids(v.get("focus", ())))
+        ids.update(registry.ids(v.get("routine", ())))
+    slim = GoalRegistry()
+    for gid in sorted(i for i in ids if i is not None):
+        g = registry.goals[gid]
+        slim.add(g.key, g.label, g.kind, g.section, g.item)
+    return slim
+
+
+_POOL = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def get_scenario_pool(workers: int = None):
+    """공유 프로세스 풀 (재실행 사이에 유지, 종료 시 정리). spawn이라 Streamlit 스레드와 무관"""
+    global _POOL, _POOL_WORKERS
+    workers = workers or SCENARIO_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def _shutdown_pool():
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(_shutdown_pool)
+
+
+def search_scenarios(weeks: dict, base_plan, cov_res: dict, month_goals: dict, registry,
+                     n: int = 200, top_k: int = 5, seed: int = 0, workers: int = None) -> dict:
+    """
+    후보 n개를 평가해 상위 top_k개 반환
+    반환: {"results": [{"rank", "name", "spec", 점수들, "variant", "applied", "diff_rows"}],
+           "evaluated": 평가한 후보 수, "unique": 서로 다른 계획 수}
+    """
+    week_keys = list(weeks.values())
+    base = PlanVariant.freeze(base_plan)
+    suggestions = [(wk, key) for wk, key in cov_res["suggestions"]]
+    swaps = [(wk, key) for wk, key in cov_res["swaps"]]
+    specs = generate_scenarios(len(suggestions), len(swaps), n, seed)
+
+    workers = SCENARIO_WORKERS if workers is None else workers
+    if workers <= 1 or len(specs) < SERIAL_BELOW:
+        scored = _evaluate({"base": base, "week_keys": week_keys, "suggestions": suggestions, "swaps": swaps,
+                            "month_goals": month_goals, "registry": registry}, specs)
+    else:
+        # 워커로 보내는 건 가변 사전 + 계획/제안에 나오는 목표만 (가상 계획에는 그 밖의 목표가 생기지 않음)
+        used = {key for _, key in suggestions + swaps}
+        ctx = {"base": base.to_dict(), "week_keys": week_keys, "suggestions": suggestions, "swaps": swaps,
+               "month_goals": {k: month_goals[k] for k in used}, "registry": _slim_registry(registry, base, used),
+               "n_max": sum(1 for g in registry if g.kind == "max")}
+        pool = get_scenario_pool(workers)
+        n_chunks = min(len(specs), workers * 2)
+        chunks = [specs[i::n_chunks] for i in range(n_chunks)]
+        scored = [r for fut in [pool.submit(_evaluate, ctx, c) for c in chunks] for r in fut.result()]
+
+    # 같은 계획은 한 번만 (점수 동률이면 번호가 작은 후보)
+    best = {}
+    for metrics, spec, sig in scored:
+        cur = best.get(sig)
+        if cur is None or (metrics["score"], -spec["id"]) > (cur[0]["score"], -cur[1]["id"]):
+            best[sig] = (metrics, spec)
+    ranked = sorted(best.values(), key=lambda r: (-r[0]["score"], r[1]["id"]))[:top_k]
+
+    results = []
+    for rank, (metrics, spec) in enumerate(ranked, 1):
+        variant, applied = apply_scenario(base, suggestions, swaps, month_goals, registry, spec)
+        results.append({
+            "rank": rank, "name": describe(spec), "spec": spec, **metrics,
+            "variant": variant, "applied": applied, "diff_rows": virtual_diff_rows(weeks, base, variant),
+        })
+    return {"results": results, "evaluated": len(scored), "unique": len(best)}
+
+
+def result_rows(search: dict) -> list:
+    """상위 후보 요약표"""
+    return [{
+        "순위": r["rank"], "후보": r["name"], "점수": r["score"],
+        "커버리지(%)": round(r["coverage"] * 100, 1), "균형": r["balance"],
+        "변경량": r["churn"], "바뀐 항목": r["changes"],
+    } for r in search["results"]]
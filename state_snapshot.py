@@ -0,0 +1,399 @@
+"""
+플래너 상태 이진 스냅샷 (표준 라이브러리만 사용)
+
+파일 구조 (리틀엔디언)
+  헤더      magic "TFSNAP" | version u16 | flags u16 | seq u64 | 구역 수 u32 | 문자열 표 위치 u64
+  구역 목록  구역마다 이름(문자열 id) u32 | 항목 수 u32 | 색인 위치 u64 | 데이터 위치 u64
+  색인      항목마다 키1 u32 | 키2 u32 | 데이터 내 위치 u32 | 길이 u32
+  문자열 표  개수 u32 | 시작 위치 (개수+1)×u32 | UTF-8 바이트
+- STATE_KEY마다 구역 하나, 주 키마다 항목 하나 → mmap으로 열고 필요한 주만 풀어 씀
+- completed_by_day는 (주, 날짜)를 키1/키2로 따로 저장 (직렬화 형태의 "주|날짜"는 마지막 "|"로 나눔)
+- 라벨/주 키 등 모든 문자열은 문자열 표에 한 번만, 값에서는 id(varint)로 참조
+- 값: 태그 1바이트 + 내용 (None/bool/int(zigzag varint)/float/문자열 id/list/dict/완료 마스크)
+  완료 마스크(16진 문자열)는 원래 문자열로 되돌릴 수 있을 때만 바이트로 저장
+
+JSON 스냅샷 ↔ 이진 스냅샷 변환:
+  python state_snapshot.py to-bin state_storage.json state_storage.snap
+  python state_snapshot.py to-json state_storage.snap state_storage.json
+"""
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+from collections.abc import MutableMapping
+from pathlib import Path
+
+MAGIC = b"TFSNAP"
+VERSION = 1
+
+_HEADER = struct.Struct("<6sHHQIQ")
+_SECTION = struct.Struct("<IIQQ")
+_ENTRY = struct.Struct("<IIII")
+_U32 = struct.Struct("<I")
+_F64 = struct.Struct("<d")
+_NONE_ID = 0xFFFFFFFF
+
+# 키2(날짜)를 따로 두는 구역
+SPLIT_SECTIONS = {"completed_by_day"}
+
+_T_NONE, _T_FALSE, _T_TRUE, _T_INT, _T_FLOAT, _T_STR, _T_LIST, _T_DICT, _T_MASK = range(9)
+_WHOLE = object()  # 값이 dict가 아닌 구역: 항목 하나에 통째로
+
+_CANON_HEX = re.compile(r"0|[1-9a-f][0-9a-f]*")
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def split_entry_key(section: str, key: str):
+    """직렬화 형태 키 → (키1, 키2). completed_by_day는 마지막 "|" 기준 (주 키에 "|"가 있어도 안전)"""
+    if section in SPLIT_SECTIONS and "|" in key:
+        week, _, date = key.rpartition("|")
+        return week, date
+    return key, None
+
+
+def join_entry_key(k1: str, k2) -> str:
+    return k1 if k2 is None else f"{k1}|{k2}"
+
+
+# ---- 쓰기 ----
+def _varint(out: bytearray, n: int):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _json_key(k) -> str:
+    # json.dumps와 같은 규칙으로 키를 문자열로
+    return k if isinstance(k, str) else json.dumps(k)
+
+
+class _Encoder:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def sid(self, s: str) -> int:
+        i = self.ids.get(s)
+        if i is None:
+            i = self.ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def value(self, v, out: bytearray):
+        if v is None:
+            out.append(_T_NONE)
+        elif v is True:
+            out.append(_T_TRUE)
+        elif v is False:
+            out.append(_T_FALSE)
+        elif isinstance(v, int):
+            out.append(_T_INT)
+            _varint(out, (v << 1) if v >= 0 else ((-v << 1) - 1))
+        elif isinstance(v, float):
+            out.append(_T_FLOAT)
+            out += _F64.pack(v)
+        elif isinstance(v, str):
+            if _CANON_HEX.fullmatch(v):
+                raw = int(v, 16).to_bytes(max(1, (len(v) + 1) // 2), "little")
+                out.append(_T_MASK)
+                _varint(out, len(raw))
+                out += raw
+            else:
+                out.append(_T_STR)
+                _varint(out, self.sid(v))
+        elif isinstance(v, (list, tuple)):
+            out.append(_T_LIST)
+            _varint(out, len(v))
+            for x in v:
+                self.value(x, out)
+        elif isinstance(v, dict):
+            out.append(_T_DICT)
+            _varint(out, len(v))
+            for k, x in v.items():
+                _varint(out, self.sid(_json_key(k)))
+                self.value(x, out)
+        else:
+            raise TypeError(f"스냅샷에 저장할 수 없는 값: {type(v).__name__}")
+
+    def string_table(self) -> bytes:
+        blobs = [s.encode("utf-8") for s in self.strings]
+        offsets = [0]
+        for b in blobs:
+            offsets.append(offsets[-1] + len(b))
+        return _U32.pack(len(blobs)) + struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(blobs)
+
+
+def dump_snapshot(state: dict, seq: int = 0) -> bytes:
+    """직렬화 형태 상태 → 스냅샷 바이트"""
+    enc = _Encoder()
+    sections = []
+    for name, value in state.items():
+        index = bytearray()
+        data = bytearray()
+        if isinstance(value, dict):
+            items = value.items()
+        else:
+            items = [(_WHOLE, value)]
+        for key, v in items:
+            if key is _WHOLE:
+                k1, k2 = _NONE_ID, _NONE_ID
+            else:
+                a, b = split_entry_key(name, _json_key(key))
+                k1, k2 = enc.sid(a), (_NONE_ID if b is None else enc.sid(b))
+            start = len(data)
+            enc.value(v, data)
+            index += _ENTRY.pack(k1, k2, start, len(data) - start)
+        sections.append((enc.sid(name), len(items), bytes(index), bytes(data)))
+
+    pos = _HEADER.size + _SECTION.size * len(sections)
+    directory = bytearray()
+    body = bytearray()
+    for name_id, n, index, data in sections:
+        directory += _SECTION.pack(name_id, n, pos, pos + len(index))
+        body += index
+        body += data
+        pos += len(index) + len(data)
+    header = _HEADER.pack(MAGIC, VERSION, 0, seq, len(sections), pos)
+    return header + bytes(directory) + bytes(body) + enc.string_table()
+
+
+def write_snapshot(path, state: dict, seq: int = 0, fsync: bool = True) -> int:
+    """임시 파일에 쓰고 os.replace로 교체. 반환: 기록한 바이트 수"""
+    path = Path(path)
+    data = dump_snapshot(state, seq)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return len(data)
+
+
+# ---- 읽기 ----
+class SnapshotReader:
+    """
+    mmap으로 연 스냅샷. 열 때는 헤더/구역 목록만 읽고, 색인·문자열·값은 요청된 것만 풂
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mm = self._mm
+        if len(mm) < _HEADER.size:
+            raise SnapshotError(f"스냅샷이 너무 짧습니다: {self.path}")
+        magic, version, _flags, self.seq, n_sections, self._strtab = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"스냅샷 파일이 아닙니다: {self.path}")
+        if version > VERSION:
+            raise SnapshotError(f"지원하지 않는 스냅샷 버전 {version}: {self.path}")
+        self.version = version
+        (self._n_strings,) = _U32.unpack_from(mm, self._strtab)
+        self._strings = [None] * self._n_strings
+        self._str_base = self._strtab + 4 + 4 * (self._n_strings + 1)
+        self.sections = {}  # 이름 → (항목 수, 색인 위치, 데이터 위치)
+        for i in range(n_sections):
+            name_id, n, index_at, data_at = _SECTION.unpack_from(mm, _HEADER.size + i * _SECTION.size)
+            self.sections[self.string(name_id)] = (n, index_at, data_at)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def string(self, sid: int) -> str:
+        s = self._strings[sid]
+        if s is None:
+            start, end = struct.unpack_from("<II", self._mm, self._strtab + 4 + 4 * sid)
+            s = self._strings[sid] = self._mm[self._str_base + start:self._str_base + end].decode("utf-8")
+        return s
+
+    def entries(self, section: str):
+        """구역의 항목 [(키1, 키2, 시작, 끝)] (키2 없으면 None, 통째 값이면 키1도 _WHOLE)"""
+        n, index_at, data_at = self.sections[section]
+        out = []
+        for k1, k2, off, length in _ENTRY.iter_unpack(self._mm[index_at:index_at + n * _ENTRY.size]):
+            a = _WHOLE if k1 == _NONE_ID else self.string(k1)
+            b = None if k2 == _NONE_ID else self.string(k2)
+            out.append((a, b, data_at + off, data_at + off + length))
+        return out
+
+    def decode(self, start: int, end: int):
+        value, _ = self._value(self._mm[start:end], 0)
+        return value
+
+    def _value(self, buf, pos):
+        tag = buf[pos]
+        pos += 1
+        if tag == _T_STR:
+            sid, pos = _read_varint(buf, pos)
+            return self.string(sid), pos
+        if tag == _T_LIST:
+            n, pos = _read_varint(buf, pos)
+            out = []
+            for _ in range(n):
+                v, pos = self._value(buf, pos)
+                out.append(v)
+            return out, pos
+        if tag == _T_DICT:
+            n, pos = _read_varint(buf, pos)
+            out = {}
+            for _ in range(n):
+                sid, pos = _read_varint(buf, pos)
+                out[self.string(sid)], pos = self._value(buf, pos)
+            return out, pos
+        if tag == _T_MASK:
+            n, pos = _read_varint(buf, pos)
+            return format(int.from_bytes(buf[pos:pos + n], "little"), "x"), pos + n
+        if tag == _T_INT:
+            z, pos = _read_varint(buf, pos)
+            return (z >> 1) if not z & 1 else -((z + 1) >> 1), pos
+        if tag == _T_NONE:
+            return None, pos
+        if tag == _T_TRUE:
+            return True, pos
+        if tag == _T_FALSE:
+            return False, pos
+        if tag == _T_FLOAT:
+            return _F64.unpack_from(buf, pos)[0], pos + 8
+        raise SnapshotError(f"알 수 없는 값 태그 {tag}")
+
+    def section(self, name: str, weeks=None):
+        """구역 하나를 풀어서 (weeks를 주면 그 주의 항목만)"""
+        entries = self.entries(name)
+        if len(entries) == 1 and entries[0][0] is _WHOLE:
+            return self.decode(entries[0][2], entries[0][3])
+        return {
+            join_entry_key(k1, k2): self.decode(start, end)
+            for k1, k2, start, end in entries
+            if weeks is None or k1 in weeks
+        }
+
+    def load(self, sections=None, weeks=None) -> dict:
+        """직렬화 형태 상태 (sections/weeks로 일부만)"""
+        names = self.sections if sections is None else [s for s in sections if s in self.sections]
+        return {name: self.section(name, weeks) for name in names}
+
+    def lazy_state(self) -> dict:
+        """구역마다 LazySection (값은 처음 접근할 때 풂)"""
+        out = {}
+        for name in self.sections:
+            entries = self.entries(name)
+            if len(entries) == 1 and entries[0][0] is _WHOLE:
+                out[name] = self.decode(entries[0][2], entries[0][3])
+            else:
+                out[name] = LazySection(self, entries)
+        return out
+
+
+def _read_varint(buf, pos):
+    shift = 0
+    n = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+class _Unloaded:
+    __slots__ = ("start", "end")
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+
+class LazySection(MutableMapping):
+    """
+    스냅샷 구역을 dict처럼 (키 순서 유지). 값은 처음 읽을 때 풀어서 보관하고, 바꾸면 메모리에만 반영
+    """
+
+    def __init__(self, reader: SnapshotReader, entries):
+        self._reader = reader
+        self._data = {join_entry_key(k1, k2): _Unloaded(start, end) for k1, k2, start, end in entries}
+
+    def __getitem__(self, key):
+        v = self._data[key]
+        if isinstance(v, _Unloaded):
+            v = self._data[key] = self._reader.decode(v.start, v.end)
+        return v
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def to_dict(self) -> dict:
+        return {k: self[k] for k in self._data}
+
+
+def materialize(state: dict) -> dict:
+    """LazySection을 모두 풀어 일반 dict로"""
+    return {k: v.to_dict() if isinstance(v, LazySection) else v for k, v in state.items()}
+
+
+# ---- JSON ↔ 이진 변환 ----
+def json_to_snapshot(src, dst) -> int:
+    """JSON 스냅샷(저널 seq 포함) → 이진 스냅샷. 반환: 바이트 수"""
+    from state_store import _SEQ_FIELD
+
+    state = json.loads(Path(src).read_text(encoding="utf-8"))
+    seq = int(state.pop(_SEQ_FIELD, 0))
+    return write_snapshot(dst, state, seq)
+
+
+def snapshot_to_json(src, dst) -> int:
+    """이진 스냅샷 → JSON 스냅샷 (저장소 compaction과 같은 형식)"""
+    from state_store import _SEQ_FIELD
+
+    with SnapshotReader(src) as reader:
+        state = reader.load()
+        state[_SEQ_FIELD] = reader.seq
+    data = json.dumps(state, ensure_ascii=False, indent=2).encode("utf-8")
+    Path(dst).write_bytes(data)
+    return len(data)
+
+
+def convert(direction: str, src, dst) -> int:
+    """direction: "to-bin" | "to-json". 반환: 기록한 바이트 수"""
+    if direction not in ("to-bin", "to-json"):
+        raise ValueError(f"알 수 없는 변환 방향: {direction}")
+    return (json_to_snapshot if direction == "to-bin" else snapshot_to_json)(src, dst)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="플래너 상태 스냅샷 JSON ↔ 이진 변환")
+    ap.add_argument("direction", choices=["to-bin", "to-json"])
+    ap.add_argument("src")
+    ap.add_argument("dst")
+    args = ap.parse_args()
+    n = convert(args.direction, args.src, args.dst)
+    print(f"{args.src} → {args.dst} ({n:,} bytes)")
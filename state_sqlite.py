@@ -0,0 +1,338 @@
+"""
+SQLite 기반 상태 저장소 (표준 라이브러리 sqlite3)
+
+- 사용자별 네임스페이스: 모든 테이블의 첫 번째 키가 user
+- weekly_plan(user, week) + month(마지막으로 고친 달, 인덱스) / day_detail(user, week, day)
+  / completion_mask(user, week, date) / weekly_review(user, week)
+  (completed_by_day(user, week, date, task)는 과거 라벨 형식용)
+- WAL 모드 + 커넥션 풀 → 여러 세션이 각자 자기 행만 읽고 씀
+- 저장은 JournalStateStore와 같은 변경분 비교(_diff_records) 결과만 SQL로 반영
+"""
+import copy
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from completion import mask_from_bytes, mask_from_hex, mask_to_bytes, mask_to_hex
+from state_store import StateStore, _apply_record, _diff_records
+
+_WEEKLY_PLAN = """
+CREATE TABLE IF NOT EXISTS weekly_plan (
+    user TEXT NOT NULL, week TEXT NOT NULL, month TEXT NOT NULL,
+    focus TEXT NOT NULL, routine TEXT NOT NULL,
+    PRIMARY KEY (user, week)
+) WITHOUT ROWID"""
+_SCHEMA = _WEEKLY_PLAN + """;
+CREATE INDEX IF NOT EXISTS idx_weekly_plan_month ON weekly_plan (user, month);
+CREATE TABLE IF NOT EXISTS day_detail (
+    user TEXT NOT NULL, week TEXT NOT NULL, day TEXT NOT NULL,
+    main TEXT NOT NULL, routine TEXT NOT NULL,
+    PRIMARY KEY (user, week, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS completed_by_day (
+    user TEXT NOT NULL, week TEXT NOT NULL, date TEXT NOT NULL, task TEXT NOT NULL,
+    PRIMARY KEY (user, week, date, task)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_completed_by_day_date ON completed_by_day (user, date);
+CREATE TABLE IF NOT EXISTS completion_mask (
+    user TEXT NOT NULL, week TEXT NOT NULL, date TEXT NOT NULL, bits BLOB NOT NULL,
+    PRIMARY KEY (user, week, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_completion_mask_date ON completion_mask (user, date);
+CREATE TABLE IF NOT EXISTS weekly_review (
+    user TEXT NOT NULL, week TEXT NOT NULL, text TEXT NOT NULL,
+    PRIMARY KEY (user, week)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS extra_state (
+    user TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,
+    PRIMARY KEY (user, key)
+) WITHOUT ROWID;
+"""
+
+
+class ConnectionPool:
+    """스레드(=Streamlit 세션) 간에 돌려 쓰는 sqlite3 커넥션 풀"""
+
+    def __init__(self, db_path, size: int = 4, timeout: float = 10.0):
+        self.db_path = str(db_path)
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(None)  # 필요할 때 생성
+        conn = self._connect()
+        _migrate_weekly_plan(conn)
+        conn.executescript(_SCHEMA)
+        self._pool.get()
+        self._pool.put(conn)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get(timeout=self.timeout)
+        if conn is None:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+
+def _migrate_weekly_plan(conn):
+    """
+    예전 스키마(PRIMARY KEY (user, month, week)) → (user, week)
+    주 키가 ISO 주차라 달과 무관하므로, 같은 주가 여러 달에 있으면 뒤 달(숫자 기준) 행을 남김
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cols = {row[1]: row[5] for row in conn.execute("PRAGMA table_info(weekly_plan)")}
+        if not cols.get("month"):  # 테이블이 없거나 이미 month가 키가 아님
+            conn.execute("COMMIT")
+            return
+        conn.execute("ALTER TABLE weekly_plan RENAME TO weekly_plan_old")
+        conn.execute(_WEEKLY_PLAN)
+        conn.execute(
+            "INSERT OR REPLACE INTO weekly_plan (user, week, month, focus, routine) "
+            "SELECT user, week, month, focus, routine FROM weekly_plan_old "
+            "ORDER BY CAST(REPLACE(month, '월', '') AS INTEGER)"
+        )
+        conn.execute("DROP TABLE weekly_plan_old")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _split_store_key(skey: str):
+    # "weekKey|date" → (weekKey, date). 날짜 없는 과거 키는 date=""
+    # 날짜에는 "|"가 없으므로 마지막 "|"로 나눔 (_deserialize_state, 스냅샷과 같은 기준)
+    skey = str(skey)
+    if "|" not in skey:
+        return skey, ""
+    week, _, date = skey.rpartition("|")
+    return week, date
+
+
+def _join_store_key(week: str, date: str) -> str:
+    return f"{week}|{date}" if date else week
+
+
+class SQLiteStateStore(StateStore):
+    """사용자 1명 분의 상태 (같은 DB 파일의 풀을 공유)"""
+
+    def __init__(self, pool: ConnectionPool, user: str):
+        self.pool = pool
+        self.user = user
+        self._lock = threading.RLock()
+        self._persisted = None
+
+    # ---- 읽기 ----
+    def load(self, month=None) -> dict:
+        """
+        사용자 행만 읽어 직렬화 형태(dict)로 반환.
+        month를 주면 그 달에 마지막으로 고친 weekly_plan만 (저장 비교 기준은 전체를 읽었을 때만 갱신)
+        """
+        u = self.user
+        out = {}
+        with self.pool.connection() as conn:
+            if month is None:
+                rows = conn.execute("SELECT week, focus, routine FROM weekly_plan WHERE user=?", (u,)).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT week, focus, routine FROM weekly_plan WHERE user=? AND month=?", (u, str(month))
+                ).fetchall()
+            if rows:
+                out["weekly_plan"] = {
+                    wk: {"focus": json.loads(f), "routine": json.loads(r)} for wk, f, r in rows
+                }
+            rows = conn.execute("SELECT week, day, main, routine FROM day_detail WHERE user=?", (u,)).fetchall()
+            if rows:
+                dd = {}
+                for wk, day, m, r in rows:
+                    dd.setdefault(wk, {})[day] = {"main": json.loads(m), "routine": json.loads(r)}
+                out["day_detail"] = dd
+            rows = conn.execute("SELECT week, date, task FROM completed_by_day WHERE user=?", (u,)).fetchall()
+            if rows:
+                cb = {}
+                for wk, date, task in rows:
+                    cb.setdefault(_join_store_key(wk, date), []).append(task)
+                out["completed_by_day"] = cb
+            rows = conn.execute("SELECT week, date, bits FROM completion_mask WHERE user=?", (u,)).fetchall()
+            if rows:
+                cb = out.setdefault("completed_by_day", {})
+                for wk, date, bits in rows:
+                    cb[_join_store_key(wk, date)] = mask_to_hex(mask_from_bytes(bits))
+            rows = conn.execute("SELECT week, text FROM weekly_review WHERE user=?", (u,)).fetchall()
+            if rows:
+                out["weekly_review"] = {wk: text for wk, text in rows}
+            for key, value in conn.execute("SELECT key, value FROM extra_state WHERE user=?", (u,)):
+                out[key] = json.loads(value)
+        if month is None:
+            with self._lock:
+                self._persisted = copy.deepcopy(out)
+        return out
+
+    def completions_between(self, start_date: str, end_date: str):
+        """[start_date, end_date) 구간의 완료 항목 (user, date) 인덱스 범위 스캔"""
+        with self.pool.connection() as conn:
+            return conn.execute(
+                "SELECT week, date, task FROM completed_by_day "
+                "WHERE user=? AND date>=? AND date<? ORDER BY date",
+                (self.user, start_date, end_date),
+            ).fetchall()
+
+    def masks_between(self, start_date: str, end_date: str):
+        """[start_date, end_date) 구간의 완료 마스크 [(week, date, 마스크)]"""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT week, date, bits FROM completion_mask "
+                "WHERE user=? AND date>=? AND date<? ORDER BY date",
+                (self.user, start_date, end_date),
+            ).fetchall()
+        return [(wk, date, mask_from_bytes(bits)) for wk, date, bits in rows]
+
+    def completions_in_month(self, year: int, month: int):
+        start = f"{year:04d}-{month:02d}-01"
+        end = f"{year + 1:04d}-01-01" if month == 12 else f"{year:04d}-{month + 1:02d}-01"
+        return self.completions_between(start, end)
+
+    # ---- 쓰기 ----
+    def save(self, payload: dict, month=None) -> int:
+        """변경분만 이 사용자의 행에 반영. month는 이번에 고친 weekly_plan 행에 남길 월 값"""
+        month = "" if month is None else str(month)
+        with self._lock:
+            if self._persisted is None:
+                self.load()  # 비교 기준은 이 사용자의 전체 행 (다른 달의 주를 이번 달로 다시 쓰지 않도록)
+            records = _diff_records(self._persisted, payload)
+            if not records:
+                return 0
+            with self.pool.transaction() as conn:
+                for rec in records:
+                    self._write_record(conn, rec, month)
+            for rec in records:
+                _apply_record(self._persisted, copy.deepcopy(rec))
+            # 행 크기 대신 레코드의 JSON 길이로 근사
+            self.bytes_written += sum(len(json.dumps(rec, ensure_ascii=False).encode("utf-8")) for rec in records)
+            return len(records)
+
+    def _write_record(self, conn, rec, month):
+        op, key, path, u = rec["op"], rec["k"], rec.get("p", []), self.user
+        if key == "weekly_plan":
+            if op != "set":
+                if path:
+                    conn.execute("DELETE FROM weekly_plan WHERE user=? AND week=?", (u, path[0]))
+                else:
+                    conn.execute("DELETE FROM weekly_plan WHERE user=?", (u,))
+                return
+            items = {path[0]: rec["v"]} if path else rec["v"]
+            if not path:  # 통째로 바뀜: 없어진 주만 지우고, 남은 주는 원래 월 값을 유지
+                keep = set(items)
+                gone = [(u, wk) for (wk,) in conn.execute("SELECT week FROM weekly_plan WHERE user=?", (u,))
+                        if wk not in keep]
+                conn.executemany("DELETE FROM weekly_plan WHERE user=? AND week=?", gone)
+            update_month = "month=excluded.month, " if path else ""
+            conn.executemany(
+                "INSERT INTO weekly_plan (user, week, month, focus, routine) VALUES (?,?,?,?,?) "
+                f"ON CONFLICT(user, week) DO UPDATE SET {update_month}"
+                "focus=excluded.focus, routine=excluded.routine",
+                [(u, wk, month, json.dumps(v.get("focus", []), ensure_ascii=False),
+                  json.dumps(v.get("routine", []), ensure_ascii=False)) for wk, v in items.items()],
+            )
+        elif key == "day_detail":
+            if len(path) >= 2:
+                conn.execute("DELETE FROM day_detail WHERE user=? AND week=? AND day=?", (u, path[0], path[1]))
+            elif path:
+                conn.execute("DELETE FROM day_detail WHERE user=? AND week=?", (u, path[0]))
+            else:
+                conn.execute("DELETE FROM day_detail WHERE user=?", (u,))
+            if op == "set":
+                if len(path) >= 2:
+                    items = {path[0]: {path[1]: rec["v"]}}
+                elif path:
+                    items = {path[0]: rec["v"]}
+                else:
+                    items = rec["v"]
+                rows = []
+                for wk, days in items.items():
+                    for day, v in days.items():
+                        if isinstance(v, list):  # 과거 구조(리스트)
+                            v = {"main": v, "routine": []}
+                        rows.append((u, wk, day, json.dumps(v.get("main", []), ensure_ascii=False),
+                                     json.dumps(v.get("routine", []), ensure_ascii=False)))
+                conn.executemany("INSERT INTO day_detail VALUES (?,?,?,?,?)", rows)
+        elif key == "completed_by_day":
+            if op in ("add", "discard"):
+                wk, date = _split_store_key(path[0])
+                if op == "add":
+                    conn.execute("INSERT OR IGNORE INTO completed_by_day VALUES (?,?,?,?)", (u, wk, date, rec["v"]))
+                else:
+                    conn.execute(
+                        "DELETE FROM completed_by_day WHERE user=? AND week=? AND date=? AND task=?",
+                        (u, wk, date, rec["v"]),
+                    )
+                return
+            for table in ("completed_by_day", "completion_mask"):
+                if path:
+                    wk, date = _split_store_key(path[0])
+                    conn.execute(f"DELETE FROM {table} WHERE user=? AND week=? AND date=?", (u, wk, date))
+                else:
+                    conn.execute(f"DELETE FROM {table} WHERE user=?", (u,))
+            if op == "set":
+                items = {path[0]: rec["v"]} if path else rec["v"]
+                rows, masks = [], []
+                for skey, tasks in items.items():
+                    wk, date = _split_store_key(skey)
+                    if isinstance(tasks, str):  # 마스크(16진)
+                        masks.append((u, wk, date, mask_to_bytes(mask_from_hex(tasks))))
+                    else:
+                        rows.extend((u, wk, date, t) for t in tasks)
+                conn.executemany("INSERT OR IGNORE INTO completed_by_day VALUES (?,?,?,?)", rows)
+                conn.executemany("INSERT INTO completion_mask VALUES (?,?,?,?)", masks)
+        elif key == "weekly_review":
+            if path:
+                conn.execute("DELETE FROM weekly_review WHERE user=? AND week=?", (u, path[0]))
+            else:
+                conn.execute("DELETE FROM weekly_review WHERE user=?", (u,))
+            if op == "set":
+                items = {path[0]: rec["v"]} if path else rec["v"]
+                conn.executemany(
+                    "INSERT INTO weekly_review VALUES (?,?,?)", [(u, wk, str(t)) for wk, t in items.items()]
+                )
+        else:
+            # 그 밖의 키는 통째로 JSON 한 행
+            if op == "del":
+                conn.execute("DELETE FROM extra_state WHERE user=? AND key=?", (u, key))
+            else:
+                value = copy.deepcopy(self._persisted.get(key, {})) if path else rec["v"]
+                if path:
+                    _apply_record({key: value}, rec)
+                conn.execute(
+                    "INSERT OR REPLACE INTO extra_state VALUES (?,?,?)",
+                    (u, key, json.dumps(value, ensure_ascii=False)),
+                )
+
+    def reset(self):
+        with self._lock:
+            with self.pool.transaction() as conn:
+                for table in ("weekly_plan", "day_detail", "completed_by_day", "completion_mask", "weekly_review",
+                              "extra_state"):
+                    conn.execute(f"DELETE FROM {table} WHERE user=?", (self.user,))
+            self._persisted = {}
@@ -0,0 +1,391 @@
+"""
+플래너 상태 저장소
+
+- 스냅샷(state_storage.json) + 추가 전용 저널(state_storage.journal)
+- 저장 시 마지막으로 기록된 상태와 비교해 바뀐 부분만 저널에 한 줄씩 추가
+  (weekly_plan 주 단위, day_detail 요일 단위, completed_by_day 날짜 단위 마스크 / 과거 형식은 체크 단위)
+- 저널이 커지면 스냅샷으로 합치고(compaction) 저널을 비움
+  스냅샷 형식은 TIME_APP_SNAPSHOT: binary(기본, state_storage.snap, state_snapshot 참고) | json
+- 불러올 때는 스냅샷 + 저널을 재생. 마지막 줄이 깨져 있으면(쓰기 중 종료) 그 앞까지만 적용
+  이진 스냅샷은 mmap으로 열어 두고 주 단위 항목을 처음 접근할 때 풂
+"""
+import abc
+import copy
+import datetime
+import json
+import os
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from urllib.parse import quote
+
+from calendar_index import get_calendar_index
+from completion import mask_from_hex, mask_to_hex
+from state_snapshot import LazySection, SnapshotReader, materialize, split_entry_key, write_snapshot
+
+STATE_KEYS = ["weekly_plan", "day_detail", "completed_by_day", "weekly_review"]
+
+# 키별 저널 기록 단위(경로 깊이)
+#   weekly_plan[week] / day_detail[week][day] / completed_by_day["week|date"] / weekly_review[week]
+_PATH_DEPTH = {"weekly_plan": 1, "day_detail": 2, "completed_by_day": 1, "weekly_review": 1}
+
+_SEQ_FIELD = "__journal_seq__"
+
+# journal 저장소의 스냅샷 형식: "binary"(기본) | "json"
+SNAPSHOT_FORMAT = os.environ.get("TIME_APP_SNAPSHOT", "binary")
+_MISSING = object()
+
+
+def _serialize_state(s):
+    """st.session_state → JSON 직렬화 가능한 dict로 변환"""
+    out = {}
+    for k in STATE_KEYS:
+        if k not in s:
+            continue
+        v = s[k]
+        # 특수 타입 처리
+        if k == "completed_by_day":
+            # {(week_key, date_str): 마스크 | set(...)} → {"weekKey|date": 16진 문자열 | list(...)}
+            conv = {}
+            for tkey, val in v.items():
+                if isinstance(tkey, tuple):
+                    saved_key = "|".join(list(tkey))
+                else:
+                    saved_key = str(tkey)
+                conv[saved_key] = mask_to_hex(val) if isinstance(val, int) else list(val)  # set → list
+            out[k] = conv
+        else:
+            out[k] = v
+    return out
+
+
+def _deserialize_state(d):
+    """JSON → 세션 상태 복원"""
+    result = {}
+    for k in STATE_KEYS:
+        if k not in d:
+            continue
+        v = d[k]
+        if k == "completed_by_day":
+            # {"weekKey|date": 16진 문자열 | list(...)} → {(weekKey, date): 마스크 | set(...)}
+            # 날짜에는 "|"가 없으므로 마지막 "|"로 나눔 (주 키에 "|"가 있어도 안전)
+            conv = {}
+            for skey, lst in v.items():
+                week, date = split_entry_key(k, skey)
+                tkey = (week,) if date is None else (week, date)
+                conv[tkey] = mask_from_hex(lst) if isinstance(lst, str) else set(lst)
+            result[k] = conv
+        else:
+            result[k] = v
+    return result
+
+
+def _diff_records(old: dict, new: dict):
+    """직렬화된 상태 두 개를 비교해 저널 레코드(op, key, path, value) 목록 생성"""
+    records = []
+    for k in list(dict.fromkeys(list(old.keys()) + list(new.keys()))):
+        if k == _SEQ_FIELD:
+            continue
+        _diff_level(records, k, [], old.get(k, _MISSING), new.get(k, _MISSING), _PATH_DEPTH.get(k, 0))
+    return records
+
+
+def _diff_level(records, key, path, a, b, depth):
+    if b is _MISSING:
+        if a is not _MISSING:
+            records.append({"op": "del", "k": key, "p": path})
+        return
+    if key == "completed_by_day" and path and isinstance(a, list) and isinstance(b, list):
+        # 체크 토글 단위로 기록 (순서는 의미 없음)
+        sa, sb = set(a), set(b)
+        for label in b:
+            if label not in sa:
+                records.append({"op": "add", "k": key, "p": path, "v": label})
+        for label in a:
+            if label not in sb:
+                records.append({"op": "discard", "k": key, "p": path, "v": label})
+        return
+    # 스냅샷에서 아직 풀지 않은 구역은 통째로 비교하지 않고 주 단위로 내려감
+    if a is not _MISSING and not isinstance(a, LazySection) and a == b:
+        return
+    if depth == 0 or not isinstance(a, Mapping) or not isinstance(b, dict):
+        records.append({"op": "set", "k": key, "p": path, "v": copy.deepcopy(b)})
+        return
+    for sub in a:
+        if sub not in b:
+            records.append({"op": "del", "k": key, "p": path + [sub]})
+    for sub, bv in b.items():
+        _diff_level(records, key, path + [sub], a.get(sub, _MISSING), bv, depth - 1)
+
+
+def _apply_record(state: dict, rec: dict):
+    op, key, path = rec["op"], rec["k"], rec.get("p", [])
+    if not path:
+        if op == "del":
+            state.pop(key, None)
+        elif op == "set":
+            state[key] = rec["v"]
+        return
+    node = state.setdefault(key, {})
+    for part in path[:-1]:
+        node = node.setdefault(part, {})
+    leaf = path[-1]
+    if op == "set":
+        node[leaf] = rec["v"]
+    elif op == "del":
+        node.pop(leaf, None)
+    elif op == "add":
+        lst = node.setdefault(leaf, [])
+        if rec["v"] not in lst:
+            lst.append(rec["v"])
+    elif op == "discard":
+        lst = node.get(leaf, [])
+        if rec["v"] in lst:
+            lst.remove(rec["v"])
+
+
+class StateStore(abc.ABC):
+    """
+    상태 저장소 공통 인터페이스 (직렬화 형태 dict를 주고받음)
+      - load(month=None) → dict
+      - save(payload, month=None) → 기록한 변경 수
+      - reset()
+    bytes_written: 지금까지 기록한 바이트 수 (계측용)
+    하나라도 구현하지 않은 백엔드는 만들 때 TypeError
+    """
+
+    bytes_written = 0
+
+    @abc.abstractmethod
+    def load(self, month=None) -> dict:
+        ...
+
+    @abc.abstractmethod
+    def save(self, payload: dict, month=None) -> int:
+        ...
+
+    @abc.abstractmethod
+    def reset(self):
+        ...
+
+
+def month_week_keys(month, year: int = None) -> list:
+    """"10월"/10 → 그 달과 겹치는 ISO 주 키 목록"""
+    year = year or datetime.date.today().year
+    cal = get_calendar_index(datetime.date(year, 1, 1), datetime.date(year + 1, 1, 7))
+    return list(cal.month_weeks(year, int(str(month).rstrip("월"))).values())
+
+
+class JournalStateStore(StateStore):
+    """스냅샷 + 추가 전용 저널 기반 상태 저장소 (프로세스 내 세션 공유)"""
+
+    def __init__(self, path, compact_records: int = 500, compact_bytes: int = 1 << 20, fsync: bool = True,
+                 snapshot_format: str = None):
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        self.snap_path = self.path.with_suffix(".snap")
+        self.snapshot_format = snapshot_format or SNAPSHOT_FORMAT
+        self.compact_records = compact_records
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._persisted = None   # 디스크에 반영된 마지막 상태(직렬화 형태, 구역은 LazySection일 수 있음)
+        self._reader = None      # 열어 둔 이진 스냅샷
+        self._seq = 0
+        self._journal_records = 0
+        self._journal_bytes = 0
+
+    # ---- 읽기 ----
+    def load(self, month=None, weeks=None, year: int = None) -> dict:
+        """
+        스냅샷 + 저널 재생 결과(직렬화 형태)를 반환
+        weeks를 주면 그 주의 항목만 (이진 스냅샷이면 나머지 주는 풀지 않음)
+        month("10월" 또는 10)만 주면 year(기본 올해)의 그 달 ISO 주차로 바꿔 weeks처럼 씀
+        """
+        if weeks is None and month is not None:
+            weeks = month_week_keys(month, year)
+        with self._lock:
+            self._replay()
+            if weeks is None:
+                return copy.deepcopy(materialize(self._persisted))
+            weeks = set(weeks)
+            out = {}
+            for k, section in self._persisted.items():
+                if isinstance(section, Mapping):
+                    section = {sub: section[sub] for sub in section if split_entry_key(k, sub)[0] in weeks}
+                out[k] = section
+            return copy.deepcopy(out)
+
+    def _read_snapshot(self):
+        """(상태, seq). 두 형식이 다 있으면(형식을 바꾼 뒤 합치던 중 종료) seq가 큰 쪽"""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        json_state, json_seq = None, -1
+        if self.path.exists():
+            json_state = json.loads(self.path.read_text(encoding="utf-8"))
+            json_seq = int(json_state.pop(_SEQ_FIELD, 0))
+        if self.snap_path.exists():
+            reader = SnapshotReader(self.snap_path)
+            if reader.seq >= json_seq:
+                self._reader = reader
+                return reader.lazy_state(), reader.seq
+            reader.close()
+        if json_state is not None:
+            return json_state, json_seq
+        return {}, 0
+
+    def _replay(self):
+        state, seq = self._read_snapshot()
+        records = 0
+        good_len = 0
+        if self.journal_path.exists():
+            with open(self.journal_path, "rb") as f:
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # 쓰다 만 마지막 줄
+                    try:
+                        rec = json.loads(raw)
+                    except ValueError:
+                        break
+                    good_len += len(raw)
+                    if rec.get("seq", 0) <= seq:
+                        continue  # 이미 스냅샷에 포함됨
+                    _apply_record(state, rec)
+                    seq = rec["seq"]
+                    records += 1
+            if good_len < self.journal_path.stat().st_size:
+                # 깨진 꼬리는 잘라내야 다음 추가가 올바른 줄에서 시작됨
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(good_len)
+        self._persisted = state
+        self._seq = seq
+        self._journal_records = records
+        self._journal_bytes = good_len
+
+    # ---- 쓰기 ----
+    def save(self, payload: dict, month=None) -> int:
+        """변경분만 저널에 추가. 반환값: 기록한 레코드 수 (0이면 디스크 I/O 없음)"""
+        with self._lock:
+            if self._persisted is None:
+                self._replay()
+            records = _diff_records(self._persisted, payload)
+            if not records:
+                return 0
+            seq = self._seq
+            lines = []
+            for rec in records:
+                seq += 1
+                rec["seq"] = seq
+                lines.append(json.dumps(rec, ensure_ascii=False))
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            with open(self.journal_path, "ab") as f:
+                start = f.tell()
+                try:
+                    f.write(data)
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                except OSError:
+                    f.truncate(start)  # 쓰다 만 줄을 남기지 않음
+                    raise
+            # 디스크에 쓴 뒤에만 반영 → 실패하면 다음 save()가 같은 변경을 다시 찾아 씀
+            for rec in records:
+                _apply_record(self._persisted, rec)
+            self._seq = seq
+            self._journal_records += len(records)
+            self._journal_bytes += len(data)
+            self.bytes_written += len(data)
+            if self._journal_records >= self.compact_records or self._journal_bytes >= self.compact_bytes:
+                self.compact()
+            return len(records)
+
+    def compact(self):
+        """현재 상태를 스냅샷으로 원자적 교체 후 저널 비우기"""
+        with self._lock:
+            if self._persisted is None:
+                self._replay()
+            self._persisted = materialize(self._persisted)
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+            if self.snapshot_format == "binary":
+                self.bytes_written += write_snapshot(self.snap_path, self._persisted, self._seq, self.fsync)
+                self.path.unlink(missing_ok=True)
+            else:
+                snap = dict(self._persisted)
+                snap[_SEQ_FIELD] = self._seq
+                tmp = self.path.with_name(self.path.name + ".tmp")
+                data = json.dumps(snap, ensure_ascii=False, indent=2).encode("utf-8")
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                self.bytes_written += len(data)
+                self.snap_path.unlink(missing_ok=True)
+            # 스냅샷 교체 후 종료되어도 seq 비교로 중복 적용되지 않음
+            if self.journal_path.exists():
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(0)
+            self._journal_records = 0
+            self._journal_bytes = 0
+
+    def reset(self):
+        with self._lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+            self.path.unlink(missing_ok=True)
+            self.snap_path.unlink(missing_ok=True)
+            self.journal_path.unlink(missing_ok=True)
+            self._persisted = {}
+            self._seq = 0
+            self._journal_records = 0
+            self._journal_bytes = 0
+
+
+# 저장소 종류: "journal"(기본, 파일) / "sqlite"(다중 사용자)
+STATE_BACKEND = os.environ.get("TIME_APP_STATE_BACKEND", "journal")
+
+_STORES = {}
+_POOLS = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _user_path(path: Path, user: str) -> Path:
+    # 기본 사용자는 기존 파일명을 그대로 사용
+    if user == "default":
+        return path
+    # 퍼센트 인코딩: 영숫자/-/_ 밖의 글자는 %XX로 (사용자마다 다른 파일, 영숫자 이름은 예전과 같은 파일)
+    safe = quote(user, safe="-_")
+    return path.with_name(f"{path.stem}.{safe}{path.suffix}")
+
+
+def get_state_store(path, user: str = "default", backend: str = None) -> StateStore:
+    """
+    (경로, 사용자)별 저장소 1개. 스크립트 재실행 사이에도 유지되어 변경분 추적이 이어짐.
+    sqlite 백엔드는 path와 같은 이름의 .sqlite3 파일 하나를 모든 사용자가 공유.
+    """
+    backend = backend or STATE_BACKEND
+    path = Path(path)
+    key = (backend, str(path.resolve()), user)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is not None:
+            return store
+        if backend == "sqlite":
+            from state_sqlite import ConnectionPool, SQLiteStateStore
+
+            db_path = path.with_suffix(".sqlite3")
+            pool = _POOLS.get(str(db_path))
+            if pool is None:
+                pool = _POOLS[str(db_path)] = ConnectionPool(db_path)
+            store = SQLiteStateStore(pool, user)
+        elif backend == "journal":
+            store = JournalStateStore(_user_path(path, user))
+        else:
+            raise ValueError(f"알 수 없는 상태 저장소: {backend}")
+        _STORES[key] = store
+        return store
@@ -0,0 +1,97 @@
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# 모듈이 저장소 최상위에 있으므로 어디서 실행해도 import 되게
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from goal_table import goals_for_month, parse_goal_table  # noqa: E402
+from planner import generate_calendar_weeks  # noqa: E402
+
+
+@pytest.fixture
+def goal_frame():
+    """작은 목표 시트: 헤더 옆 항목, 소주제 없는 항목, 중복/공백 차이, 빈 칸(병합 셀), 빈 줄"""
+    return pd.DataFrame({
+        "프로젝트": ["건강", "건강", "공부", "공부", None],
+        "월": ["10월", "11월", "10월", "10월", "10월"],
+        "최대선": [
+            "[운동] • 주 3회 달리기\n• 스트레칭\n\n[식단]\n•  물 2L ",
+            "[운동]\n• 수영",
+            "• 소주제 없는 항목\n[논문]\n• 초안 작성\n• 초안  작성",
+            None,
+            "",
+        ],
+        "최소선": [
+            "[운동]\n• 주 1회 걷기\n• 스트레칭",
+            None,
+            "[논문]\n• 자료 조사",
+            "[영어]\r\n• 단어 20개",
+            None,
+        ],
+    })
+
+
+@pytest.fixture
+def goal_xlsx(goal_frame):
+    """goal_frame을 '최대선_최소선' 시트로 담은 xlsx 바이트 (다른 시트 하나 포함)"""
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        pd.DataFrame({"메모": ["읽지 않는 시트"]}).to_excel(writer, sheet_name="메모", index=False)
+        goal_frame.assign(측정지표=["횟수", None, "쪽수", 20, None]).to_excel(
+            writer, sheet_name="최대선_최소선", index=False
+        )
+    return buf.getvalue()
+
+
+@pytest.fixture
+def month_goals(goal_frame):
+    return goals_for_month(parse_goal_table(goal_frame), "10월")[1]
+
+
+@pytest.fixture
+def october_weeks():
+    return generate_calendar_weeks(2025, 10)
+
+
+@pytest.fixture
+def serialized_state():
+    """저장소가 주고받는 직렬화 형태 상태 (마스크/과거 체크 목록, 여러 값 종류, dict가 아닌 구역)"""
+    w1, w2 = "2025-W40", "2025-W41|특별"  # 주 키에 "|"가 있어도 날짜 키와 섞이지 않아야 함
+    return {
+        "weekly_plan": {
+            w1: {"focus": ["운동 - 주 3회 달리기", "논문 - 초안 작성"], "routine": ["식단 - 물 2L"]},
+            w2: {"focus": [], "routine": []},
+        },
+        "day_detail": {w1: {"월": {"main": ["달리기 5km"], "routine": []}, "화": ["과거 구조"]}},
+        "completed_by_day": {
+            f"{w1}|2025-10-01": "1f",
+            f"{w1}|2025-10-02": "0",
+            f"{w2}|2025-10-08": "0f",  # 원래 문자열로 못 되돌리는 마스크는 문자열 그대로
+            f"{w2}|2025-10-09": ["메인: 달리기", "배경: 물 2L"],  # 과거 라벨 형식
+        },
+        "weekly_review": {w1: {"점수": -3, "비율": 0.75, "완료": True, "메모": None, "빈 값": False}},
+        "extra": ["구역 전체가 dict가 아닌 값", 1, 2.5],
+    }
+
+
+@pytest.fixture
+def week_csv_rows():
+    """B(week.csv) 행: 요일 순서가 섞여 있고, 빈 칸과 숫자처럼 보이는 값이 있음"""
+    return [
+        ("2025-10-03", "금", "메인: 논문", "1", "물 2L | 스트레칭"),
+        ("2025-09-29", " 월 ", "메인: 달리기", "달리기 5km\n스트레칭", ""),
+        ("2025-10-05", "일", "", "", "회고"),
+        ("2025-09-30", "화", "메인: 달리기", "1.0", None),
+        ("2025-10-01", "수", None, "초안, 자료 조사", "단어 20개"),
+    ]
+
+
+@pytest.fixture
+def week_csv(week_csv_rows):
+    """week_csv_rows를 별칭 헤더(포커스/배경)로 쓴 utf-8-sig CSV 바이트"""
+    df = pd.DataFrame(week_csv_rows, columns=["날짜", "요일", "자동 제안(메인)", "포커스", "배경"])
+    return df.to_csv(index=False).encode("utf-8-sig")
@@ -0,0 +1,95 @@
+import builtins
+import time
+
+from autosave import AutosaveWriter
+from state_store import JournalStateStore
+
+
+def _plan(focus):
+    return {"weekly_plan": {"2025-W40": {"focus": [focus], "routine": []}}}
+
+
+def test_failed_write_is_written_by_next_flush(tmp_path, monkeypatch):
+    store = JournalStateStore(tmp_path / "state.json", fsync=False)
+    writer = AutosaveWriter(store, debounce=0, max_delay=0, name="test")
+    try:
+        writer.submit(_plan("X"))
+        assert writer.flush()
+
+        # 저널 추가를 한 번만 실패시킴
+        real_open = builtins.open
+        calls = {"n": 0}
+
+        def failing_open(file, mode="r", *args, **kwargs):
+            if str(file).endswith(".journal") and "a" in mode and not calls["n"]:
+                calls["n"] += 1
+                raise OSError("disk full")
+            return real_open(file, mode, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "open", failing_open)
+        writer.submit(_plan("A"))
+        assert writer.flush()
+        assert writer.stats["failed"] == 1
+        assert JournalStateStore(tmp_path / "state.json").load()["weekly_plan"]["2025-W40"]["focus"] == ["X"]
+
+        # 같은 상태를 다시 맡기면 그 변경분이 기록됨
+        writer.submit(_plan("A"))
+        assert writer.flush()
+        assert writer.last_error is None
+        assert writer.stats["records"] == 2
+        assert JournalStateStore(tmp_path / "state.json").load()["weekly_plan"]["2025-W40"]["focus"] == ["A"]
+    finally:
+        writer.close()
+
+
+def test_requests_within_debounce_are_coalesced(tmp_path):
+    store = JournalStateStore(tmp_path / "state.json", fsync=False)
+    writer = AutosaveWriter(store, debounce=30, max_delay=60, name="test")
+    try:
+        for focus in ("A", "B", "C"):
+            writer.submit(_plan(focus))
+        assert writer.pending
+        assert writer.flush()
+        assert writer.stats["submitted"] == 3 and writer.stats["coalesced"] == 2
+        assert writer.stats["written"] == 1
+        assert JournalStateStore(tmp_path / "state.json").load()["weekly_plan"]["2025-W40"]["focus"] == ["C"]
+    finally:
+        writer.close()
+
+
+def test_submit_copies_the_payload(tmp_path):
+    store = JournalStateStore(tmp_path / "state.json", fsync=False)
+    writer = AutosaveWriter(store, debounce=30, max_delay=60, name="test")
+    try:
+        payload = _plan("A")
+        writer.submit(payload)
+        payload["weekly_plan"]["2025-W40"]["focus"].append("나중 변경")
+        assert writer.flush()
+        assert JournalStateStore(tmp_path / "state.json").load()["weekly_plan"]["2025-W40"]["focus"] == ["A"]
+    finally:
+        writer.close()
+
+
+def test_max_delay_writes_during_continuous_submits(tmp_path):
+    store = JournalStateStore(tmp_path / "state.json", fsync=False)
+    writer = AutosaveWriter(store, debounce=30, max_delay=0.05, name="test")
+    try:
+        writer.submit(_plan("A"))
+        deadline = time.monotonic() + 5
+        while not writer.stats["written"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert writer.stats["written"] == 1
+    finally:
+        writer.close()
+
+
+def test_discard_and_close_drop_pending(tmp_path):
+    store = JournalStateStore(tmp_path / "state.json", fsync=False)
+    writer = AutosaveWriter(store, debounce=30, max_delay=60, name="test")
+    writer.submit(_plan("A"))
+    writer.discard()
+    assert not writer.pending and writer.stats["dropped"] == 1
+    assert writer.close()
+    writer.submit(_plan("B"))  # 닫힌 뒤에는 받지 않음
+    assert writer.stats["dropped"] == 2 and writer.stats["written"] == 0
+    assert not (tmp_path / "state.json").exists() or JournalStateStore(tmp_path / "state.json").load() == {}
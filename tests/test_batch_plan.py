@@ -0,0 +1,51 @@
+import batch_plan
+from goal_registry import GoalRegistry
+from goal_table import parse_goal_table
+from planner import compute_coverage
+from workbook_cache import WorkbookCache
+
+
+def test_plan_month_covers_every_max_goal(goal_frame):
+    res = batch_plan.plan_month(parse_goal_table(goal_frame), "10월", 2025)
+    weeks, month_goals = res["weeks"], res["month_goals"]
+    assert res["coverage"]["missing_focus"] and not res["coverage"]["unplaced"]
+
+    # 빈 계획에서 시작했으므로 가상 계획 표의 포커스 = 적용한 제안. 그 계획에서는 빠진 최대선이 없어야 함
+    label_week = {label: wk for label, wk in weeks.items()}
+    plan = {
+        label_week[row["주차"]]: {"focus": row["포커스(가상)"].split(" | "), "routine": []}
+        for row in res["virtual_plan_rows"] if row["포커스(가상)"] != "-"
+    }
+    assert set(plan) == {wk for _, wk, _, _ in res["applied"]}
+    after = compute_coverage(weeks, plan, month_goals, GoalRegistry.from_month_goals(month_goals))
+    assert after["missing_focus"] == []
+
+    assert len(res["day_plans"]) == 7 * len(weeks)
+    assert set(res["week_tables"]) == set(plan)  # 포커스가 생긴 주만 요일 배치
+
+
+def test_plan_month_promotes_routine_goals(goal_frame):
+    table = parse_goal_table(goal_frame)
+    first = batch_plan.plan_month(table, "10월", 2025)
+    label = first["month_goals"][first["coverage"]["missing_focus"][0]]["label"]
+    wk = list(first["weeks"].values())[2]
+    res = batch_plan.plan_month(table, "10월", 2025, {wk: {"focus": [], "routine": [label]}})
+    assert ("promote", wk, label, "routine→focus 승격") in res["applied"]
+
+
+def test_process_workbook_writes_month_folders(tmp_path, goal_xlsx, monkeypatch):
+    monkeypatch.setattr(batch_plan, "get_workbook_cache", lambda: WorkbookCache(disk=None))
+    src = tmp_path / "in" / "목표.xlsx"
+    src.parent.mkdir()
+    src.write_bytes(goal_xlsx)
+    (tmp_path / "in" / "깨진.xlsx").write_bytes(b"not a workbook")
+
+    stats = batch_plan.process_workbook(str(src), str(tmp_path / "out"), 2025)
+    assert stats["error"] is None and stats["months"] == 2
+    for month in ("10월", "11월"):
+        names = {p.name for p in (tmp_path / "out" / "목표" / month).iterdir()}
+        assert {"coverage.csv", "suggestions.csv", "virtual_plan.csv", "virtual_diff.csv", "day_plans.csv"} <= names
+    assert stats["files"] == sum(1 for _ in (tmp_path / "out").rglob("*.csv"))
+
+    bad = batch_plan.process_workbook(str(tmp_path / "in" / "깨진.xlsx"), str(tmp_path / "out"), 2025)
+    assert bad["error"] and bad["months"] == 0
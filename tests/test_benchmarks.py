@@ -0,0 +1,29 @@
+import pandas as pd
+
+from benchmarks import generators as gen
+from benchmarks.run_bench import check
+from planner import GOAL_COLUMNS, load_goal_workbook
+from week_csv import load_week_like
+
+
+def test_generators_are_seeded():
+    pd.testing.assert_frame_equal(gen.goal_frame(3, 4, seed=1), gen.goal_frame(3, 4, seed=1))
+    assert not gen.goal_frame(3, 4, seed=1).equals(gen.goal_frame(3, 4, seed=2))
+    assert gen.week_csv_bytes(5, seed=1) == gen.week_csv_bytes(5, seed=1)
+    assert gen.check_events(10, 4, seed=1) == gen.check_events(10, 4, seed=1)
+
+
+def test_generated_files_load_through_the_app_loaders():
+    sheets, frame = load_goal_workbook(gen.goal_workbook_bytes(2, 3, seed=4))
+    assert list(frame.columns) == GOAL_COLUMNS and len(frame) == 2 * 12
+    week = load_week_like(gen.week_csv_bytes(6, seed=4))
+    assert list(week["요일"]) == ["월", "화", "수", "목", "금", "토", "일"]
+
+
+def test_check_flags_only_slow_and_large_changes():
+    baseline = {"results": {"small": {"a": {"median": 0.010}, "b": {"median": 0.0001}}}}
+    results = {"small": {"a": {"median": 0.030}, "b": {"median": 0.0005}, "new": {"median": 1.0}}}
+    logs = []
+    # b는 5배지만 차이가 floor(1ms)보다 작아 회귀가 아님, new는 기준이 없음
+    assert check(results, baseline, threshold=1.5, log=logs.append) == [("small", "a", 0.010, 0.030)]
+    assert any("기준 없음" in line for line in logs)
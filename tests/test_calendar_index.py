@@ -0,0 +1,66 @@
+import calendar
+import datetime
+
+from calendar_index import CalendarIndex, get_calendar_index, iso_week_key
+from planner import find_current_week_label, generate_calendar_weeks
+
+
+def _legacy_labels(year, month):
+    """예전 generate_calendar_weeks의 라벨 (월요일부터 7일씩 달 끝까지)"""
+    first = datetime.date(year, month, 1)
+    last = datetime.date(year, month, calendar.monthrange(year, month)[1])
+    start, n, out = first - datetime.timedelta(days=first.weekday()), 1, []
+    while start <= last:
+        end = start + datetime.timedelta(days=6)
+        out.append(f"{n}주차 ({start.month}/{start.day}~{end.month}/{end.day})")
+        start += datetime.timedelta(days=7)
+        n += 1
+    return out
+
+
+def test_every_day_maps_to_its_iso_week():
+    idx = CalendarIndex.for_years(2024, 2026)
+    d = idx.first_day
+    while d <= idx.last_day:
+        key = idx.week_of(d)
+        assert key == iso_week_key(d)
+        assert idx.week_start(key) == d - datetime.timedelta(days=d.weekday())
+        assert d in idx.dates_of(key)
+        d += datetime.timedelta(days=1)
+    assert idx.week_of(idx.first_day - datetime.timedelta(days=1)) is None
+    assert idx.week_of(idx.last_day + datetime.timedelta(days=1)) is None
+
+
+def test_month_weeks_keep_the_old_labels_with_unique_keys():
+    seen = {}
+    for year in (2025, 2026):
+        for month in range(1, 13):
+            weeks = generate_calendar_weeks(year, month)
+            assert list(weeks) == _legacy_labels(year, month)
+            for key in weeks.values():
+                seen.setdefault(key, set()).add((year, month))
+    # 달 경계의 주만 두 달에 걸침 (같은 키가 세 달 이상에 나오지 않음)
+    assert max(len(v) for v in seen.values()) == 2
+    assert generate_calendar_weeks(2025, 10)["1주차 (9/29~10/5)"] == "2025-W40"
+    # 연말 주는 ISO 기준으로 다음 해 주차
+    assert generate_calendar_weeks(2025, 12)["5주차 (12/29~1/4)"] == "2026-W01"
+
+
+def test_weeks_between_matches_a_scan():
+    idx = CalendarIndex.for_years(2025, 2025)
+    start, end = datetime.date(2025, 3, 5), datetime.date(2025, 4, 14)
+    scan = []
+    d = start
+    while d <= end:
+        if idx.week_of(d) not in scan:
+            scan.append(idx.week_of(d))
+        d += datetime.timedelta(days=1)
+    assert idx.weeks_between(start, end) == scan
+
+
+def test_shared_index_grows_for_far_dates():
+    far = datetime.date(2040, 6, 1)
+    idx = get_calendar_index(far)
+    assert idx.covers(far) and idx.covers(datetime.date.today())
+    weeks = generate_calendar_weeks(2040, 6)
+    assert find_current_week_label(weeks, today=far) == next(k for k, v in weeks.items() if v == "2040-W22")
@@ -0,0 +1,165 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from check_analytics import completion_rates, task_instances
+from check_log import (
+    EVENT_OFF, EVENT_ON, EVENT_SEEN, RECORD_SIZE, CheckEventLog, mask_events, seen_events,
+)
+from week_tasks import KIND_MAIN, KIND_ROUTINE
+
+W = "2025-W40"
+DAY = datetime.datetime(2025, 10, 1, 9).timestamp() * 1000
+
+
+def _ts(minutes):
+    return int(DAY + minutes * 60_000)
+
+
+def _day_tasks():
+    return pd.DataFrame({
+        "position": [0, 1, 2],
+        "kind": [KIND_MAIN, KIND_MAIN, KIND_ROUTINE],
+        "label": ["[메인] 운동 - 달리기", "[메인] 논문 - 초안 작성", "[배경] 식단 - 물 2L"],
+    })
+
+
+def test_append_and_read_round_trip(tmp_path):
+    log = CheckEventLog(tmp_path / "events.log")
+    assert log.append([(_ts(0), W, "2025-10-01", "[메인] 운동 - 달리기", 0, KIND_MAIN, EVENT_ON)]) == 1
+    events, strings = CheckEventLog(tmp_path / "events.log").read()
+    assert (tmp_path / "events.log").stat().st_size == RECORD_SIZE
+    assert len(events) == 1 and events["ts"][0] == _ts(0)
+    assert [strings[events[c][0]] for c in ("week", "date", "task")] == [W, "2025-10-01", "[메인] 운동 - 달리기"]
+    assert events["kind"][0] == 0 and events["event"][0] == EVENT_ON
+
+
+def test_read_picks_up_appends_from_another_writer(tmp_path):
+    reader = CheckEventLog(tmp_path / "events.log")
+    writer = CheckEventLog(tmp_path / "events.log")
+    writer.append([(_ts(0), W, "월", "a", 0, KIND_MAIN, EVENT_ON)])
+    assert len(reader.read()[0]) == 1
+    writer.append([(_ts(1), W, "화", "b", 1, KIND_ROUTINE, EVENT_OFF)])
+    events, strings = reader.read()
+    assert len(events) == 2 and strings == [W, "월", "a", "화", "b"]
+
+
+def test_torn_tails_are_ignored_and_truncated(tmp_path):
+    path = tmp_path / "events.log"
+    log = CheckEventLog(path)
+    log.append([(_ts(0), W, "월", "a", 0, KIND_MAIN, EVENT_ON)])
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 7)
+    with open(log.strings_path, "ab") as f:
+        f.write('"쓰다 만'.encode())
+    fresh = CheckEventLog(path)
+    events, strings = fresh.read()
+    assert len(events) == 1 and strings == [W, "월", "a"]
+    fresh.append([(_ts(1), W, "월", "b", 1, KIND_MAIN, EVENT_ON)])
+    assert path.stat().st_size == 2 * RECORD_SIZE
+    events, strings = CheckEventLog(path).read()
+    assert [strings[t] for t in events["task"]] == ["a", "b"]
+
+
+def test_records_without_their_strings_are_dropped(tmp_path):
+    path = tmp_path / "events.log"
+    CheckEventLog(path).append([(_ts(0), W, "월", "a", 0, KIND_MAIN, EVENT_ON)])
+    CheckEventLog(path).append([(_ts(1), W, "월", "b", 1, KIND_MAIN, EVENT_ON)])
+    # 문자열 "b"를 기록하기 전에 끊긴 것처럼 문자열 파일의 마지막 줄을 지움
+    strings_path = path.with_suffix(".strings")
+    lines = strings_path.read_bytes().splitlines(keepends=True)
+    strings_path.write_bytes(b"".join(lines[:-1]))
+    events, strings = CheckEventLog(path).read()
+    assert len(events) == 1 and strings[events["task"][0]] == "a"
+
+
+def test_reset_clears_the_log(tmp_path):
+    log = CheckEventLog(tmp_path / "events.log")
+    log.append([(_ts(0), W, "월", "a", 0, KIND_MAIN, EVENT_ON)])
+    log.reset()
+    events, strings = log.read()
+    assert len(events) == 0 and strings == []
+
+
+def test_mask_events_only_for_changed_bits():
+    tasks = _day_tasks()
+    assert mask_events(W, "월", tasks, 0b011, 0b011) == []
+    evs = mask_events(W, "월", tasks, 0b011, 0b110)
+    assert evs == [
+        (W, "월", "[메인] 운동 - 달리기", 0, KIND_MAIN, EVENT_OFF),
+        (W, "월", "[배경] 식단 - 물 2L", 2, KIND_ROUTINE, EVENT_ON),
+    ]
+    assert [e[-1] for e in seen_events(W, "월", tasks)] == [EVENT_SEEN] * 3
+
+
+@pytest.fixture
+def check_history(tmp_path):
+    """월(ISO 주차 + 요일)·화(ISO 날짜) 이틀치 이벤트: 표시, 체크, 해제, 다시 체크"""
+    log = CheckEventLog(tmp_path / "events.log")
+    tasks = _day_tasks()
+    evs = [(_ts(0),) + e for e in seen_events(W, "월", tasks)]
+    evs += [(_ts(1),) + e for e in mask_events(W, "월", tasks, 0, 0b011)]
+    evs += [(_ts(2),) + e for e in mask_events(W, "월", tasks, 0b011, 0b001)]
+    evs += [(_ts(3),) + e for e in seen_events(W, "2025-09-30", tasks)]
+    evs += [(_ts(4),) + e for e in mask_events(W, "2025-09-30", tasks, 0, 0b100)]
+    evs += [(_ts(60),) + e for e in mask_events(W, "2025-09-30", tasks, 0b100, 0b110)]
+    log.append(evs)
+    return log
+
+
+def _naive_rates(log, key, as_of_ms=None):
+    """이벤트를 하나씩 훑어 태스크별 마지막 상태를 세는 단순 구현"""
+    events, strings = log.read()
+    last = {}
+    for ev in sorted(events, key=lambda e: e["ts"]):
+        if as_of_ms is not None and ev["ts"] > as_of_ms:
+            continue
+        k = (ev["week"], ev["date"], ev["task"], ev["pos"])
+        if ev["event"] != EVENT_SEEN or k not in last:
+            last[k] = last.get(k, False) if ev["event"] == EVENT_SEEN else bool(ev["event"] == EVENT_ON)
+    out = {}
+    for (wk, date, task, _), done in last.items():
+        total, n = out.get(key(strings[wk], strings[date], strings[task]), (0, 0))
+        out[key(strings[wk], strings[date], strings[task])] = (total + 1, n + done)
+    return out
+
+
+def _as_dict(df):
+    return {row[0]: (row[1], row[2]) for row in df.itertuples(index=False)}
+
+
+def test_day_rates_resolve_weekday_names(check_history):
+    iso = {"월": "2025-09-29"}
+    df = completion_rates(check_history, by="day")
+    assert list(df.columns) == ["날짜", "전체", "완료", "달성률(%)"]
+    assert _as_dict(df) == _naive_rates(check_history, lambda wk, d, t: iso.get(d, d))
+    assert _as_dict(df) == {"2025-09-29": (3, 1), "2025-09-30": (3, 2)}
+    assert df["달성률(%)"].tolist() == [33, 66]
+
+
+def test_rates_by_kind_and_goal(check_history):
+    kinds = _as_dict(completion_rates(check_history, by="kind"))
+    assert kinds == _naive_rates(check_history, lambda wk, d, t: t.split(" ", 1)[0])
+    goals = _as_dict(completion_rates(check_history, by="goal"))
+    assert goals == {"운동": (2, 1), "논문": (2, 1), "식단": (2, 1)}
+    upper = _as_dict(completion_rates(check_history, by="goal", goal_of=str.upper))
+    assert sum(t for t, _ in upper.values()) == 6
+
+
+def test_as_of_and_date_range(check_history):
+    as_of = _ts(30)
+    df = completion_rates(check_history, by="week", as_of=as_of)
+    assert _as_dict(df) == _naive_rates(check_history, lambda wk, d, t: wk, as_of_ms=as_of)
+    assert _as_dict(df) == {W: (6, 2)}
+    one_day = completion_rates(check_history, by="month", start=datetime.date(2025, 9, 30),
+                               end=datetime.date(2025, 9, 30))
+    assert _as_dict(one_day) == {"2025-09": (3, 2)}
+
+
+def test_empty_and_unknown_grouping(tmp_path):
+    log = CheckEventLog(tmp_path / "events.log")
+    assert completion_rates(log, by="week").empty
+    assert task_instances(*log.read()).empty
+    with pytest.raises(ValueError):
+        completion_rates(log, by="year")
@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+
+from completion import (
+    as_mask, done_counts, full_mask, has_bit, labels_to_mask, mask_bits, mask_from_bytes, mask_from_hex,
+    mask_to_bytes, mask_to_hex, popcount, set_bit,
+)
+from state_store import _deserialize_state, _serialize_state
+
+
+def test_bit_operations_match_a_set_of_positions():
+    rng = random.Random(3)
+    mask, done = 0, set()
+    for _ in range(500):
+        pos = rng.randrange(130)  # 64비트를 넘는 위치 포함
+        on = rng.random() < 0.6
+        mask = set_bit(mask, np.int64(pos), on)
+        (done.add if on else done.discard)(pos)
+        assert has_bit(mask, pos) == (pos in done)
+    n = 100
+    assert popcount(mask) == len(done)
+    assert popcount(mask, n) == len({p for p in done if p < n})  # 줄어든 계획은 넘는 비트를 세지 않음
+    assert mask_bits(mask, n).tolist() == [p in done for p in range(n)]
+    assert mask_bits(mask, 0).size == 0 and full_mask(0) == 0
+
+
+def test_done_counts_matches_popcount():
+    rng = random.Random(5)
+    masks = [rng.getrandbits(rng.randrange(1, 90)) for _ in range(50)]
+    sizes = [rng.randrange(0, 90) for _ in masks]
+    assert done_counts(masks, sizes).tolist() == [popcount(m, n) for m, n in zip(masks, sizes)]
+    assert done_counts([], []).size == 0
+
+
+def test_legacy_labels_become_positions():
+    labels = ["[메인] 달리기", "[메인] 초안", "[배경] 물 2L"]
+    assert labels_to_mask({"[배경] 물 2L", "[메인] 달리기", "없어진 항목"}, labels) == 0b101
+    assert as_mask(["[메인] 초안"], labels) == 0b010
+    assert as_mask("5") == 5 and as_mask(None) == 0 and as_mask(7) == 7
+
+
+def test_masks_survive_serialization():
+    for mask in (0, 1, 0xFF, 1 << 70, (1 << 130) - 1):
+        assert mask_from_hex(mask_to_hex(mask)) == mask
+        assert mask_from_bytes(mask_to_bytes(mask)) == mask
+    assert mask_from_hex("") == 0 and len(mask_to_bytes(0)) == 1
+
+    state = {"completed_by_day": {("2025-W40", "2025-10-01"): 0b1011, ("2025-W40", "2025-10-02"): {"[메인] x"}}}
+    saved = _serialize_state(state)
+    assert saved["completed_by_day"] == {"2025-W40|2025-10-01": "b", "2025-W40|2025-10-02": ["[메인] x"]}
+    assert _deserialize_state(saved) == state
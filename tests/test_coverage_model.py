@@ -0,0 +1,63 @@
+import random
+
+from coverage_model import CoverageModel
+from goal_registry import GoalRegistry
+from planner import compute_coverage
+
+
+def _random_edits(weeks, month_goals, n, seed):
+    rng = random.Random(seed)
+    labels = [g["label"] for g in month_goals.values()] + ["목표 밖 라벨"]
+    week_keys = list(weeks.values())
+    plan = {}
+    for _ in range(n):
+        wk = rng.choice(week_keys)
+        plan[wk] = {"focus": rng.sample(labels, rng.randint(0, 2)), "routine": rng.sample(labels, rng.randint(0, 3))}
+        yield wk, {k: dict(v) for k, v in plan.items()}
+
+
+def _direct_counts(weeks, plan, month_goals):
+    """주마다 라벨을 세는 단순 계산 (모델과 독립)"""
+    label_key = {g["label"]: k for k, g in month_goals.items()}
+    out = {k: {"focus": 0, "routine": 0, "weeks": []} for k in month_goals}
+    for wk in weeks.values():
+        sel = plan.get(wk) or {}
+        for name in ("focus", "routine"):
+            for label in sel.get(name, []):
+                key = label_key.get(label)
+                if key is not None:
+                    out[key][name] += 1
+                    if wk not in out[key]["weeks"]:
+                        out[key]["weeks"].append(wk)
+    return out
+
+
+def test_incremental_sync_matches_compute_coverage(october_weeks, month_goals):
+    registry = GoalRegistry.from_month_goals(month_goals)
+    model = CoverageModel(october_weeks, registry)
+    for _, plan in _random_edits(october_weeks, month_goals, 200, seed=7):
+        model.sync(plan)
+        assert model.result() == compute_coverage(october_weeks, plan, month_goals, registry)
+        assert model.result()["coverage"] == _direct_counts(october_weeks, plan, month_goals)
+
+
+def test_set_week_outside_month_is_ignored(october_weeks, month_goals):
+    model = CoverageModel(october_weeks, GoalRegistry.from_month_goals(month_goals))
+    version = model.version
+    assert model.set_week("1999-W01", ["운동 - 스트레칭"], []) is False
+    assert model.version == version
+
+
+def test_old_result_is_not_changed_by_later_sync(october_weeks, month_goals):
+    registry = GoalRegistry.from_month_goals(month_goals)
+    model = CoverageModel(october_weeks, registry)
+    wk = next(iter(october_weeks.values()))
+    model.sync({wk: {"focus": ["운동 - 스트레칭"], "routine": []}})
+    before = model.result()
+    snapshot = {k: dict(v) for k, v in before["coverage"].items()}
+
+    model.sync({wk: {"focus": ["논문 - 초안 작성"], "routine": ["운동 - 스트레칭"]}})
+    after = model.result()
+    assert before["coverage"] == snapshot
+    assert after["coverage"]["운동 - 스트레칭"] == {"focus": 0, "routine": 1, "weeks": [wk]}
+    assert "운동 - 스트레칭" in before["covered_focus"] and "운동 - 스트레칭" in after["missing_focus"]
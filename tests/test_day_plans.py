@@ -0,0 +1,82 @@
+import datetime
+import io
+
+import pandas as pd
+
+from day_plans import COLUMNS, _week_detail, DayPlanCache, quarter_weeks, to_csv_bytes, week_version
+from day_scheduler import schedule_month
+from planner import generate_calendar_weeks, week_plan_rows
+
+
+def _plan(october_weeks, month_goals):
+    labels = [g["label"] for g in month_goals.values()]
+    w = list(october_weeks.values())
+    plan = {w[0]: {"focus": labels[:2], "routine": labels[2:4]}, w[2]: {"focus": [labels[4]], "routine": []}}
+    # 고르지 않은 주는 과거 구조(요일 → 리스트) 그대로일 수 있음
+    detail = {w[0]: {"화": {"main": ["달리기 5km"], "routine": []}}, w[3]: {"수": ["과거 구조"]}}
+    return plan, detail
+
+
+def _week_by_week(weeks, plan, detail):
+    """주마다 따로 배치해 한 주 표를 이어 붙이는 방식 (캐시 없는 기준)"""
+    rows = []
+    for label, wk in weeks.items():
+        blocks = schedule_month(plan, [wk], detail).get(wk, {})
+        start = datetime.date.fromisocalendar(*map(int, wk.split("-W")), 1)
+        for i, r in enumerate(week_plan_rows(blocks, _week_detail(detail.get(wk)), None)):
+            rows.append({"주차": label, "주": wk, "요일": r["요일"],
+                         "날짜": (start + datetime.timedelta(days=i)).isoformat(),
+                         **{c: r[c] for c in COLUMNS[4:]}})
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def test_table_matches_week_by_week(october_weeks, month_goals):
+    plan, detail = _plan(october_weeks, month_goals)
+    table = DayPlanCache().table(october_weeks, plan, detail)
+    assert len(table) == 7 * len(october_weeks)
+    pd.testing.assert_frame_equal(table, _week_by_week(october_weeks, plan, detail), check_dtype=False)
+    legacy = table[(table["주"] == list(october_weeks.values())[3]) & (table["요일"] == "수")]
+    assert legacy["상세 플랜(메인)"].tolist() == ["과거 구조"]
+
+
+def test_only_changed_weeks_are_rebuilt(october_weeks, month_goals):
+    plan, detail = _plan(october_weeks, month_goals)
+    cache = DayPlanCache()
+    first = cache.table(october_weeks, plan, detail)
+    assert cache.last_built == len(october_weeks)
+    assert cache.table(october_weeks, plan, detail) is first  # 바뀐 게 없으면 지난 표
+    assert cache.last_built == 0 and cache.stats()["hits"] == len(october_weeks)
+
+    w = list(october_weeks.values())
+    plan = dict(plan, **{w[1]: {"focus": [plan[w[0]]["focus"][0]], "routine": []}})
+    detail = dict(detail, **{w[4]: {"금": {"main": [], "routine": ["물 2L"]}}})
+    second = cache.table(october_weeks, plan, detail)
+    assert cache.last_built == 2 and second is not first
+    pd.testing.assert_frame_equal(second, _week_by_week(october_weeks, plan, detail), check_dtype=False)
+    assert cache.stats() == {"weeks": len(october_weeks), "hits": 2 * len(october_weeks) - 2,
+                             "misses": len(october_weeks) + 2}
+
+
+def test_week_version_ignores_detail_shape():
+    assert week_version(None, None) == week_version({}, {})
+    assert week_version({}, {"월": ["a"]}) == week_version({}, {"월": {"main": ["a"]}})
+    assert week_version({"focus": ["a"]}, None) != week_version({"routine": ["a"]}, None)
+
+
+def test_quarter_weeks_cover_each_week_once():
+    q = quarter_weeks(2025, 11)
+    keys = list(q.values())
+    assert len(keys) == len(set(keys))
+    expected = {wk for m in (10, 11, 12) for wk in generate_calendar_weeks(2025, m).values()}
+    assert set(keys) == expected
+    assert next(iter(q)).startswith("10월 ")
+    assert quarter_weeks(2025, 10) == q
+
+
+def test_csv_export_round_trip(october_weeks, month_goals):
+    plan, detail = _plan(october_weeks, month_goals)
+    table = DayPlanCache().table(october_weeks, plan, detail)
+    data = to_csv_bytes(table)
+    assert data.startswith(b"\xef\xbb\xbf")
+    back = pd.read_csv(io.BytesIO(data), encoding="utf-8-sig", dtype=str, keep_default_na=False)
+    assert back.values.tolist() == table.astype(str).values.tolist()
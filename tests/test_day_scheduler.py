@@ -0,0 +1,61 @@
+from day_scheduler import DAYS_KR, DEFAULT_CAPACITY, balance_days, detail_load, schedule_month, week_items
+
+
+def _days_of(blocks, title):
+    return [d for d, v in blocks.items() for _, t in v if t == title]
+
+
+def test_pinned_items_go_to_their_days():
+    items = [{"tag": "메인", "title": "A", "effort": 2, "pin": ("화", "목")}]
+    blocks, load = balance_days(items)
+    assert _days_of(blocks, "A") == ["화", "목"]
+    assert load["화"] == load["목"] == 2 and load["월"] == 0
+
+
+def test_allow_limits_days_and_each_day_gets_a_title_once():
+    items = [{"tag": "메인", "title": "A", "effort": 2, "count": 3, "allow": ("월", "화", "수", "목")}]
+    blocks, _ = balance_days(items)
+    days = _days_of(blocks, "A")
+    assert len(days) == len(set(days)) == 3
+    assert set(days) <= {"월", "화", "수", "목"}
+
+
+def test_free_items_spread_to_least_loaded_days():
+    items = [{"tag": "배경", "title": "R", "effort": 1, "count": 2}]
+    existing = {d: 3 for d in DAYS_KR}
+    existing.update({"수": 0, "일": 0})
+    blocks, load = balance_days(items, existing=existing)
+    assert sorted(_days_of(blocks, "R")) == sorted(["수", "일"])
+    assert sum(load.values()) == sum(existing.values()) + 2
+
+
+def test_overflow_reuses_the_least_loaded_allowed_day():
+    # 허용 요일(월, 화)보다 횟수가 많으면 하루 한 번 규칙을 넘어 허용 요일 중 한가한 곳에 한 번 더
+    items = [{"tag": "메인", "title": "A", "effort": 1, "count": 3, "allow": ("월", "화")}]
+    blocks, _ = balance_days(items, existing={"월": 2})
+    days = _days_of(blocks, "A")
+    assert sorted(days) == ["월", "화", "화"]
+    # 허용 요일이 없으면 전체 요일 중 부하/용량이 가장 낮은 곳
+    items = [{"tag": "배경", "title": "R", "effort": 1, "count": len(DAYS_KR) + 1}]
+    blocks, _ = balance_days(items, existing={d: 3 for d in DAYS_KR if d != "토"})
+    assert len(_days_of(blocks, "R")) == len(DAYS_KR) + 1
+    assert _days_of(blocks, "R").count("토") == 2
+
+
+def test_week_items_fill_slots_and_respect_capacity_ratio():
+    items = week_items(["메인A", "메인B"], ["배경1"])
+    blocks, load = balance_days(items)
+    assert _days_of(blocks, "메인A").count("금") == 1
+    assert all(d in ("월", "화", "수", "목", "금") for d in _days_of(blocks, "메인B"))
+    assert len(_days_of(blocks, "배경1")) == len(DAYS_KR)
+    assert set(load) == set(DEFAULT_CAPACITY)
+
+
+def test_schedule_month_counts_written_details_as_load():
+    plan = {"W1": {"focus": ["A", "B"], "routine": ["R"]}, "W2": {"focus": [], "routine": ["R"]}}
+    detail = {"W1": {"월": {"main": ["x", "y", "z"], "routine": ["w"]}}}
+    assert detail_load(detail["W1"]) == {"월": 4}
+    out = schedule_month(plan, ["W1", "W2"], detail)
+    assert list(out) == ["W1"]  # 포커스 없는 주는 빠짐
+    # 월요일은 상세 플랜으로 이미 꽉 차 메인이 다른 평일로 감
+    assert not any(x.startswith("메인:") for x in out["W1"]["월"])
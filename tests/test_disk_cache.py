@@ -0,0 +1,103 @@
+import datetime
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from disk_cache import _HEAD, DiskCache, dump_workbook, load_workbook_blob
+from goal_table import parse_goal_table
+
+
+def _codecs(raw: bytes, table: str) -> dict:
+    meta_len = _HEAD.unpack_from(raw, 0)[2]
+    meta = json.loads(raw[_HEAD.size:_HEAD.size + meta_len])
+    spec = meta["tables"][table]
+    return {c["name"]: c["codec"] for c in spec["columns"]}, spec["index"]
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "정수": np.array([3, -1, 7], dtype=np.int64),
+        "실수": [0.5, np.nan, 2.0],
+        "불리언": [True, False, True],
+        "날짜": pd.to_datetime(["2025-10-01", "2025-10-02", None]),
+        "문자열": pd.array(["달리기", None, ""], dtype="string[pyarrow]"),
+        "object 문자열": pd.Series(["가", np.nan, "나 다"], dtype=object),
+        "섞인 값": pd.Series([1, "둘", datetime.datetime(2025, 10, 3, 9, 30)], dtype=object),
+    })
+
+
+def test_round_trip_uses_each_codec(frame):
+    raw = dump_workbook("d1", ["최대선_최소선"], {"goals": frame})
+    out = load_workbook_blob(raw, "d1")
+    assert out["sheet_names"] == ["최대선_최소선"]
+    pd.testing.assert_frame_equal(out["tables"]["goals"], frame)
+    codecs, index = _codecs(raw, "goals")
+    assert codecs == {
+        "정수": "raw", "실수": "raw", "불리언": "raw", "날짜": "raw",
+        "문자열": "str", "object 문자열": "str", "섞인 값": "json",
+    }
+    assert index == {"range": [0, 3, 1]}
+
+
+def test_non_range_index_round_trips(frame):
+    for index in (pd.Index(["가", "나", "다"], dtype=object), pd.Index([10, 5, 20]), pd.RangeIndex(4, 10, 2)):
+        df = frame.set_axis(index)
+        out = load_workbook_blob(dump_workbook("d", [], {"t": df}))["tables"]["t"]
+        pd.testing.assert_frame_equal(out, df)
+
+
+def test_goal_table_round_trips(goal_frame):
+    table = parse_goal_table(goal_frame)
+    raw = dump_workbook("d", ["최대선_최소선"], {"goal_df": goal_frame, "goal_table": table})
+    tables = load_workbook_blob(raw)["tables"]
+    pd.testing.assert_frame_equal(tables["goal_df"], goal_frame)
+    pd.testing.assert_frame_equal(tables["goal_table"], table)
+
+
+def test_unsupported_values_are_not_stored(tmp_path):
+    cache = DiskCache(tmp_path)
+    df = pd.DataFrame({"x": pd.Series([object()], dtype=object)})
+    assert cache.put("d", [], {"t": df}) is False
+    assert cache.stats()["disk_skipped"] == 1
+    assert not list(tmp_path.iterdir())
+
+
+def test_get_returns_what_put_stored(tmp_path, frame):
+    cache = DiskCache(tmp_path)
+    assert cache.get("d") is None
+    assert cache.put("d", ["시트"], {"t": frame})
+    pd.testing.assert_frame_equal(cache.get("d")["tables"]["t"], frame)
+    assert cache.stats()["disk_hits"] == 1 and cache.stats()["disk_misses"] == 1
+
+
+@pytest.mark.parametrize("damage", ["flip", "truncate", "digest"])
+def test_corrupt_entry_is_removed(tmp_path, frame, damage):
+    cache = DiskCache(tmp_path)
+    cache.put("d", [], {"t": frame})
+    path = cache.path("d")
+    raw = bytearray(path.read_bytes())
+    if damage == "flip":
+        raw[-1] ^= 0xFF
+    elif damage == "truncate":
+        raw = raw[:_HEAD.size - 1]
+    else:  # 다른 워크북의 캐시 파일이 이 이름으로 놓인 경우
+        raw = bytearray(dump_workbook("other", [], {"t": frame}))
+    path.write_bytes(bytes(raw))
+    assert cache.get("d") is None
+    assert not path.exists()
+    assert cache.stats()["disk_corrupt"] == 1
+
+
+def test_oldest_entries_are_evicted(tmp_path, frame):
+    one = len(dump_workbook("a", [], {"t": frame}))
+    cache = DiskCache(tmp_path, max_bytes=one * 2)
+    for i, digest in enumerate(["a", "b"]):
+        cache.put(digest, [], {"t": frame})
+        os.utime(cache.path(digest), (1000 + i, 1000 + i))
+    cache.put("c", [], {"t": frame})
+    assert sorted(p.stem for p in tmp_path.iterdir()) == ["b", "c"]
+    assert cache.stats()["disk_evictions"] == 1
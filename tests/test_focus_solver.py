@@ -0,0 +1,91 @@
+from coverage_model import CoverageModel
+from focus_solver import ADD_COST, DISPLACE_COST, PROMOTE_COST, solve_focus_placement
+from goal_registry import GoalRegistry
+from planner import _build_virtual_plan
+
+WEEKS = ["W1", "W2", "W3"]
+
+
+def _plan(**weeks):
+    """W1=(focus 수, routine ID들) 식으로 솔버 입력 만들기 (나머지 주는 비어 있음)"""
+    out = {wk: ((), ()) for wk in WEEKS}
+    for wk, (n_focus, routine) in weeks.items():
+        out[wk] = (("x",) * n_focus, tuple(routine))
+    return out
+
+
+def test_missing_goals_go_to_free_slots():
+    res = solve_focus_placement(WEEKS, _plan(W1=(2, ()), W2=(1, ())), [0, 1])
+    assert res["swaps"] == [] and res["unplaced"] == []
+    assert sorted(wk for wk, _ in res["suggestions"]) == ["W2", "W3"]
+    assert res["cost"] == 2 * ADD_COST
+
+
+def test_routine_goal_is_promoted_in_its_week():
+    res = solve_focus_placement(WEEKS, _plan(W2=(1, (0,))), [0])
+    assert res["swaps"] == [("W2", 0)] and res["suggestions"] == []
+    assert res["cost"] == PROMOTE_COST
+
+
+def test_full_week_displaces_an_existing_focus():
+    weeks = ["W1"]
+    res = solve_focus_placement(weeks, {"W1": (("a", "b"), (0,))}, [0])
+    assert res["swaps"] == [("W1", 0)]
+    assert res["cost"] == DISPLACE_COST
+
+
+def test_protected_focus_is_not_displaced():
+    weeks = ["W1"]
+    plan = {"W1": (("a", "b"), (0, 1))}
+    res = solve_focus_placement(weeks, plan, [0, 1], protected={"W1": 2})
+    assert res["swaps"] == [] and res["unplaced"] == [0, 1]
+    # 보호되지 않은 포커스 하나만큼은 밀어낼 수 있음
+    res = solve_focus_placement(weeks, plan, [0, 1], protected={"W1": 1})
+    assert len(res["swaps"]) == 1 and len(res["unplaced"]) == 1
+
+
+def test_week_prefs_pick_the_preferred_week():
+    res = solve_focus_placement(WEEKS, _plan(), [0], week_prefs={0: {"W3": -5}})
+    assert res["suggestions"] == [("W3", 0)]
+    assert res["cost"] == ADD_COST - 5
+
+
+def test_conflicts_exclude_weeks():
+    res = solve_focus_placement(WEEKS, _plan(W3=(1, ())), [0], conflicts={0: {"W1", "W2"}})
+    assert res["suggestions"] == [("W3", 0)]
+    res = solve_focus_placement(WEEKS, _plan(), [0], conflicts={0: set(WEEKS)})
+    assert res["suggestions"] == [] and res["unplaced"] == [0]
+
+
+def test_goals_beyond_capacity_stay_unplaced():
+    res = solve_focus_placement(["W1"], {}, [0, 1, 2], capacity=2)
+    assert len(res["suggestions"]) == 2 and res["unplaced"] == [2]
+
+
+def _max_labels(month_goals):
+    return [g["label"] for g in month_goals.values() if g["kind"] == "max"]
+
+
+def test_coverage_keeps_sole_focus_of_max_goal(october_weeks, month_goals):
+    """주 하나에만 포커스로 있는 최대선 두 개로 꽉 찬 주는 승격 자리로 쓰지 않음"""
+    weeks = dict(list(october_weeks.items())[:1])
+    wk = next(iter(weeks.values()))
+    a, b, c = _max_labels(month_goals)[:3]
+    registry = GoalRegistry.from_month_goals(month_goals)
+    model = CoverageModel(weeks, registry)
+    model.sync({wk: {"focus": [a, b], "routine": [c]}})
+    res = model.result()
+    assert res["swaps"] == []
+    assert registry.key(registry.id_of(c)) in res["unplaced"]
+
+
+def test_virtual_plan_keeps_sole_focus_when_promoting(october_weeks, month_goals):
+    w1, w2 = list(october_weeks.values())[:2]
+    a, b, c = _max_labels(month_goals)[:3]
+    registry = GoalRegistry.from_month_goals(month_goals)
+    base = {w1: {"focus": [a, b], "routine": [c]}, w2: {"focus": [b], "routine": []}}
+    for drop in ("last", "first", "redundant"):
+        virtual, applied = _build_virtual_plan(base, [], [(w1, registry.key(registry.id_of(c)))],
+                                               month_goals, registry, drop=drop)
+        assert list(virtual[w1]["focus"]) == [a, c]
+        assert ("drop", w1, b, "과밀 조정(2개 제한)") in applied
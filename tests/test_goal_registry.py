@@ -0,0 +1,38 @@
+from goal_registry import GoalRegistry, _normalize_text
+
+
+def test_ids_follow_month_goal_order(month_goals):
+    registry = GoalRegistry.from_month_goals(month_goals)
+    assert len(registry) == len(month_goals)
+    for gid, (key, g) in enumerate(month_goals.items()):
+        assert registry.id_of_key(key) == gid
+        assert (registry.key(gid), registry.label(gid), registry.kind(gid)) == (key, g["label"], g["kind"])
+
+
+def test_label_lookup_normalizes_once(month_goals, monkeypatch):
+    registry = GoalRegistry.from_month_goals(month_goals)
+    gid = registry.id_of("논문 - 초안 작성")
+    assert gid is not None
+    assert registry.id_of(" 논문 -  초안 작성 ") == gid  # 공백 차이
+    assert registry.id_of("목표 밖 라벨") is None
+
+    calls = []
+    monkeypatch.setattr("goal_registry._normalize_text", lambda s: calls.append(s) or _normalize_text(s))
+    for _ in range(3):
+        registry.id_of(" 논문 -  초안 작성 ")
+        registry.id_of("목표 밖 라벨")
+    assert calls == []  # 이미 본 라벨(목표가 아닌 것 포함)은 다시 정규화하지 않음
+
+
+def test_add_keeps_the_first_goal_for_a_key():
+    registry = GoalRegistry()
+    a = registry.add("운동 - 달리기", "운동 - 달리기", "max")
+    assert registry.add("운동 - 달리기", "운동 -  달리기", "min") == a
+    assert len(registry) == 1 and registry.kind(a) == "max"
+
+
+def test_encode_plan_skips_non_goal_labels(month_goals):
+    registry = GoalRegistry.from_month_goals(month_goals)
+    labels = [g["label"] for g in month_goals.values()]
+    plan = {"W1": {"focus": [labels[0], "메모"], "routine": labels[1:3]}, "W2": {}}
+    assert registry.encode_plan(plan) == {"W1": ((0,), (1, 2)), "W2": ((), ())}
@@ -0,0 +1,51 @@
+from goal_registry import _normalize_text
+from goal_table import goals_for_month, parse_goal_table
+from planner import build_month_goals, parse_goals
+
+
+def _cell_options(month_df):
+    """최소선 → 최대선 셀마다 parse_goals (build_month_goals와 같은 셀 단위 소주제)"""
+    blocks = month_df["최소선"].dropna().tolist() + month_df["최대선"].dropna().tolist()
+    return [f"{s} - {i}" for text in blocks for s, i in parse_goals(str(text))]
+
+
+def test_month_goals_match_build_month_goals(goal_frame):
+    table = parse_goal_table(goal_frame)
+    for month in ("10월", "11월"):
+        _, goals = goals_for_month(table, month)
+        expected = build_month_goals(goal_frame[goal_frame["월"] == month])
+        assert goals == expected
+        # 최대선 → 최소선 순서(사전 순서)까지 같아야 커버리지 표가 같음
+        assert list(goals) == list(expected)
+        kinds = [g["kind"] for g in goals.values()]
+        assert kinds == ["max"] * kinds.count("max") + ["min"] * kinds.count("min")
+
+
+def test_options_match_legacy_parse(goal_frame):
+    table = parse_goal_table(goal_frame)
+    for month in ("10월", "11월"):
+        options, _ = goals_for_month(table, month)
+        assert options == _cell_options(goal_frame[goal_frame["월"] == month])
+
+
+def test_section_does_not_carry_into_next_cell(goal_frame):
+    """셀을 이어 붙여 파싱하던 예전 화면과 달리, 소주제 없는 항목은 앞 셀의 소주제를 물려받지 않음"""
+    options, goals = goals_for_month(parse_goal_table(goal_frame), "10월")
+    assert "기타 - 소주제 없는 항목" in options
+    assert "식단 - 소주제 없는 항목" not in options
+    assert {_normalize_text(o) for o in options} <= set(goals)
+
+
+def test_each_cell_matches_parse_goals(goal_frame):
+    table = parse_goal_table(goal_frame)
+    cells = [v for col in ("최대선", "최소선") for v in goal_frame[col].dropna()]
+    for i, text in enumerate(cells):
+        rows = table[table["cell"] == i]
+        assert list(zip(rows["section"], rows["item"])) == parse_goals(str(text))
+
+
+def test_blank_and_missing_cells_add_no_goals(goal_frame):
+    table = parse_goal_table(goal_frame)
+    assert not (table["item"] == "").any()
+    # 프로젝트가 빈(병합 셀) 행은 셀이 비어 있어 목표가 없음
+    assert table["project"].notna().all()
@@ -0,0 +1,66 @@
+import io
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from planner import GOAL_COLUMNS, GOAL_SHEET, load_goal_workbook
+
+
+def _read_excel(data, header=0):
+    """예전 화면이 쓰던 방식 (시트 전체를 읽은 뒤 열 고르기)"""
+    df = pd.read_excel(io.BytesIO(data), sheet_name=GOAL_SHEET, header=header)
+    return df[GOAL_COLUMNS].dropna(subset=["월"])
+
+
+def _xlsx(rows, sheet=GOAL_SHEET):
+    wb = Workbook()
+    wb.active.title = "표지"
+    ws = wb.create_sheet(sheet)
+    for row in rows:
+        ws.append(row)
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def test_matches_read_excel(goal_xlsx):
+    sheets, df = load_goal_workbook(goal_xlsx)
+    assert sheets == ["메모", GOAL_SHEET]
+    pd.testing.assert_frame_equal(df, _read_excel(goal_xlsx))
+
+
+def test_header_below_title_rows_and_extra_columns():
+    data = _xlsx([
+        ["2025 목표"],
+        [],
+        ["비고", "프로젝트", "월", "최대선", "최소선", "측정지표", "월"],  # 같은 이름은 첫 칸
+        ["x", "건강", "10월", "[운동]\n• 달리기", None, 3.0, "무시"],
+        ["y", "건강", None, "월이 빈 행", None, None, None],
+        ["z", "공부", "11월", "NA", "#N/A", "N/A", None],
+        [None, "공부", "12월", " ", "null", 2.5, None],
+    ])
+    _, df = load_goal_workbook(data)
+    expected = _read_excel(data, header=2)
+    pd.testing.assert_frame_equal(df, expected)
+    assert df.index.tolist() == [0, 2, 3]
+    assert df["측정지표"].tolist()[0] == 3 and pd.isna(df.loc[2, "최대선"])
+
+
+def test_dropped_rows_keep_column_dtype():
+    """'월'이 빈 행에만 있는 문자열도 열 dtype에 반영 (read_excel은 dropna 전에 dtype을 정함)"""
+    data = _xlsx([
+        GOAL_COLUMNS,
+        ["건강", "10월", None, None, 1],
+        [None, None, None, None, "문자"],
+    ])
+    pd.testing.assert_frame_equal(load_goal_workbook(data)[1], _read_excel(data))
+
+
+def test_missing_sheet_and_columns():
+    with pytest.raises(ValueError):
+        load_goal_workbook(_xlsx([GOAL_COLUMNS], sheet="다른 시트"))
+    with pytest.raises(KeyError):
+        load_goal_workbook(_xlsx([["프로젝트", "월", "최대선"]]))
+    with pytest.raises(KeyError):
+        load_goal_workbook(_xlsx([["제목 없음"]]))
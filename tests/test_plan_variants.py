@@ -0,0 +1,36 @@
+from plan_variants import PlanVariant, PlanVariants, changed_weeks
+
+
+def _plan():
+    return {"W1": {"focus": ["A"], "routine": ["R"]}, "W2": {"focus": ["B"], "routine": []}}
+
+
+def test_add_does_not_rename_a_shared_variant():
+    variants = PlanVariants()
+    base = variants.base(_plan())
+    shared = base.derive({"W2": {"focus": ["C"], "routine": []}}, name="시나리오 1", log=[("add", "W2", "C", "")])
+    stored = variants.add("내 계획", shared)
+    again = variants.add(variants.unique_name("내 계획"), shared)
+    assert shared.name == "시나리오 1"
+    assert (stored.name, again.name) == ("내 계획", "내 계획 (2)")
+    assert variants.names() == ["내 계획", "내 계획 (2)"]
+    # 이름만 다르고 내용/부모/로그는 같음
+    assert dict(stored) == dict(shared) and stored.parent is base and stored.log == shared.log
+    assert changed_weeks(stored, base) == ["W2"]
+
+
+def test_add_keeps_the_same_object_when_the_name_matches():
+    variants = PlanVariants()
+    v = PlanVariant.freeze(_plan(), name="가상 1")
+    assert variants.add("가상 1", v) is v
+
+
+def test_base_shares_unchanged_weeks():
+    variants = PlanVariants()
+    first = variants.base(_plan())
+    plan = _plan()
+    plan["W1"]["focus"] = ["A", "D"]
+    second = variants.base(plan)
+    assert second.parent is first and list(second.own) == ["W1"]
+    assert variants.base(plan) is second  # 바뀐 게 없으면 새 노드를 만들지 않음
+    assert second.to_dict() == plan and first.to_dict() == _plan()
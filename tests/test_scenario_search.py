@@ -0,0 +1,91 @@
+import statistics
+
+import pytest
+
+from focus_solver import FOCUS_CAPACITY
+
+from goal_registry import GoalRegistry
+from plan_variants import PlanVariant
+from planner import _build_virtual_plan, compute_coverage
+from scenario_search import (
+    W_BALANCE, W_CHURN, W_COVERAGE, apply_scenario, generate_scenarios, result_rows, score_plan, search_scenarios,
+)
+
+
+@pytest.fixture
+def scenario_inputs(october_weeks, month_goals):
+    """최대선 일부는 routine에만, 첫 주는 포커스가 꽉 찬 계획 → 추가/승격 제안이 모두 생김"""
+    labels = [g["label"] for g in month_goals.values() if g["kind"] == "max"]
+    w = list(october_weeks.values())
+    base = {
+        w[0]: {"focus": labels[:2], "routine": [labels[2]]},
+        w[1]: {"focus": [], "routine": [labels[3]]},
+    }
+    registry = GoalRegistry.from_month_goals(month_goals)
+    cov = compute_coverage(october_weeks, base, month_goals, registry=registry)
+    assert cov["suggestions"] and cov["swaps"]
+    return october_weeks, base, cov, month_goals, registry
+
+
+def test_generate_scenarios_is_seeded_and_starts_with_current():
+    specs = generate_scenarios(3, 2, 10, seed=7)
+    assert specs == generate_scenarios(3, 2, 10, seed=7)
+    assert specs[0] == {"id": 0, "order": None, "swap_order": None, "drop": "last", "promote": None}
+    assert all(sorted(s["order"]) == [0, 1, 2] and len(s["promote"]) == 2 for s in specs[1:])
+
+
+def test_current_scenario_matches_virtual_plan(scenario_inputs):
+    weeks, base, cov, month_goals, registry = scenario_inputs
+    spec = generate_scenarios(len(cov["suggestions"]), len(cov["swaps"]), 1)[0]
+    got, applied = apply_scenario(PlanVariant.freeze(base), cov["suggestions"], cov["swaps"], month_goals,
+                                  registry, spec)
+    want, want_applied = _build_virtual_plan(base, cov["suggestions"], cov["swaps"], month_goals, registry)
+    assert got.to_dict() == want.to_dict() and applied == want_applied
+
+
+def test_score_plan_components(october_weeks, month_goals):
+    registry = GoalRegistry.from_month_goals(month_goals)
+    labels = [g["label"] for g in month_goals.values() if g["kind"] == "max"]
+    week_keys = list(october_weeks.values())
+    base = PlanVariant.freeze({week_keys[0]: {"focus": [labels[0]], "routine": []}})
+    # 아무것도 안 바꾸면 변경량 0
+    same = score_plan(week_keys, base, base, registry)
+    assert same["changes"] == 0 and same["coverage"] == round(1 / len(labels), 4)
+
+    # 모든 최대선을 주마다 고르게 → 커버리지 1, 균형 1
+    plan = {wk: {"focus": [], "routine": []} for wk in week_keys}
+    for i, label in enumerate(labels):
+        plan[week_keys[i % len(week_keys)]]["focus"].append(label)
+    full = score_plan(week_keys, base, base.derive(plan, "full"), registry)
+    assert full["coverage"] == 1.0
+    assert full["changes"] == len(labels) - 1 and full["churn"] == len(labels) - 1
+    balance = 1 - statistics.pstdev(len(plan[wk]["focus"]) for wk in week_keys) / FOCUS_CAPACITY
+    assert full["balance"] == round(balance, 4)
+    assert full["score"] == round(100 * (W_COVERAGE + W_BALANCE * balance - W_CHURN * full["churn"]), 2)
+
+
+def test_search_ranks_unique_plans(scenario_inputs):
+    weeks, base, cov, month_goals, registry = scenario_inputs
+    res = search_scenarios(weeks, base, cov, month_goals, registry, n=40, top_k=3, seed=1, workers=1)
+    assert res["evaluated"] == 40 and 1 <= res["unique"] <= 40
+    results = res["results"]
+    assert [r["rank"] for r in results] == list(range(1, len(results) + 1))
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+    # 상위 후보끼리 계획이 겹치지 않음
+    plans = [r["variant"].to_dict() for r in results]
+    assert all(plans[i] != plans[j] for i in range(len(plans)) for j in range(i))
+    # 결과의 점수는 부모에서 다시 만든 계획의 점수와 같음
+    week_keys = list(weeks.values())
+    for r in results:
+        assert score_plan(week_keys, PlanVariant.freeze(base), r["variant"], registry)["score"] == r["score"]
+    rows = result_rows(res)
+    assert [row["순위"] for row in rows] == [r["rank"] for r in results]
+
+
+def test_pool_matches_serial(scenario_inputs):
+    weeks, base, cov, month_goals, registry = scenario_inputs
+    serial = search_scenarios(weeks, base, cov, month_goals, registry, n=40, top_k=5, seed=3, workers=1)
+    pooled = search_scenarios(weeks, base, cov, month_goals, registry, n=40, top_k=5, seed=3, workers=2)
+    assert pooled["unique"] == serial["unique"]
+    assert [(r["spec"]["id"], r["score"]) for r in pooled["results"]] == \
+        [(r["spec"]["id"], r["score"]) for r in serial["results"]]
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from state_snapshot import (
+    LazySection, SnapshotError, SnapshotReader, convert, json_to_snapshot, materialize, snapshot_to_json,
+)
+from state_store import _SEQ_FIELD
+
+
+def _to_snap(tmp_path, state, seq=0):
+    src, snap = tmp_path / "s.json", tmp_path / "s.snap"
+    src.write_text(json.dumps({**state, _SEQ_FIELD: seq}, ensure_ascii=False), encoding="utf-8")
+    assert json_to_snapshot(src, snap) == snap.stat().st_size
+    return snap
+
+
+def test_json_to_snapshot_and_back(tmp_path, serialized_state):
+    snap = _to_snap(tmp_path, serialized_state, 42)
+    with SnapshotReader(snap) as reader:
+        assert reader.seq == 42
+        assert reader.load() == serialized_state
+        lazy = reader.lazy_state()
+        assert isinstance(lazy["weekly_plan"], LazySection)
+        assert list(lazy["completed_by_day"]) == list(serialized_state["completed_by_day"])
+        assert materialize(lazy) == serialized_state
+    back = tmp_path / "back.json"
+    convert("to-json", snap, back)
+    assert json.loads(back.read_text(encoding="utf-8")) == {**serialized_state, _SEQ_FIELD: 42}
+    assert snapshot_to_json(snap, back) == back.stat().st_size
+
+
+def test_partial_load_by_week(tmp_path, serialized_state):
+    snap = _to_snap(tmp_path, serialized_state)
+    wk = list(serialized_state["weekly_plan"])[1]  # "|"가 들어 있는 주 키
+    with SnapshotReader(snap) as reader:
+        part = reader.load(sections=["weekly_plan", "completed_by_day"], weeks={wk})
+    assert part == {
+        "weekly_plan": {wk: serialized_state["weekly_plan"][wk]},
+        "completed_by_day": {k: v for k, v in serialized_state["completed_by_day"].items() if k.startswith(wk + "|")},
+    }
+    assert len(part["completed_by_day"]) == 2
+
+
+def test_lazy_section_edits_stay_in_memory(tmp_path, serialized_state):
+    snap = _to_snap(tmp_path, serialized_state)
+    w1, w2 = serialized_state["weekly_plan"]
+    with SnapshotReader(snap) as reader:
+        lazy = reader.lazy_state()
+        lazy["weekly_plan"][w2] = {"focus": ["새 포커스"], "routine": []}
+        del lazy["weekly_plan"][w1]
+        assert materialize(lazy)["weekly_plan"] == {w2: {"focus": ["새 포커스"], "routine": []}}
+        assert reader.load()["weekly_plan"] == serialized_state["weekly_plan"]
+
+
+def test_not_a_snapshot(tmp_path):
+    bad = tmp_path / "bad.snap"
+    bad.write_bytes(b"NOTSNAP" + b"\0" * 64)
+    with pytest.raises(SnapshotError):
+        SnapshotReader(bad)
+    with pytest.raises(ValueError):
+        convert("sideways", bad, tmp_path / "x")
@@ -0,0 +1,76 @@
+import json
+import sqlite3
+
+from state_sqlite import ConnectionPool, SQLiteStateStore
+
+_OLD_WEEKLY_PLAN = """
+CREATE TABLE weekly_plan (
+    user TEXT NOT NULL, month TEXT NOT NULL, week TEXT NOT NULL,
+    focus TEXT NOT NULL, routine TEXT NOT NULL,
+    PRIMARY KEY (user, month, week)
+) WITHOUT ROWID"""
+
+
+def _old_db(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute(_OLD_WEEKLY_PLAN)
+    conn.executemany(
+        "INSERT INTO weekly_plan VALUES (?,?,?,?,?)",
+        [(u, m, wk, json.dumps(f, ensure_ascii=False), json.dumps(r, ensure_ascii=False)) for u, m, wk, f, r in rows],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _sel(*focus):
+    return {"focus": list(focus), "routine": []}
+
+
+def test_old_schema_is_migrated_and_round_trips(tmp_path):
+    db = tmp_path / "state.db"
+    _old_db(db, [
+        ("a", "9월", "2025-W40", ["9월 값"], []),
+        ("a", "10월", "2025-W40", ["10월 값"], []),   # 같은 주는 숫자로 뒤 달(10월 > 9월)을 남김
+        ("a", "10월", "2025-W42", ["달리기"], []),
+        ("a", "11월", "2025-W45", ["수영"], []),
+        ("b", "10월", "2025-W40", ["다른 사용자"], []),
+    ])
+    pool = ConnectionPool(db, size=2)
+    with pool.connection() as conn:
+        pk = [row[1] for row in conn.execute("PRAGMA table_info(weekly_plan)") if row[5]]
+    assert pk == ["user", "week"]
+
+    a = SQLiteStateStore(pool, "a")
+    assert a.load()["weekly_plan"] == {
+        "2025-W40": _sel("10월 값"), "2025-W42": _sel("달리기"), "2025-W45": _sel("수영"),
+    }
+    assert list(a.load(month="10월")["weekly_plan"]) == ["2025-W40", "2025-W42"]
+    assert list(a.load(month="11월")["weekly_plan"]) == ["2025-W45"]
+    assert SQLiteStateStore(pool, "b").load()["weekly_plan"] == {"2025-W40": _sel("다른 사용자")}
+
+    # 고친 주만 이번 달로 옮겨지고, 나머지 주는 원래 달에 남음
+    plan = a.load()
+    plan["weekly_plan"]["2025-W45"] = _sel("수영", "독서")
+    assert a.save(plan, month="10월") == 1
+    assert a.load(month="10월")["weekly_plan"] == {
+        "2025-W40": _sel("10월 값"), "2025-W42": _sel("달리기"), "2025-W45": _sel("수영", "독서"),
+    }
+    assert "weekly_plan" not in a.load(month="11월")
+
+    # 이미 옮긴 DB를 다시 열어도 그대로
+    again = SQLiteStateStore(ConnectionPool(db, size=1), "a")
+    assert again.load() == a.load()
+
+
+def test_fresh_db_round_trips_all_sections(tmp_path):
+    store = SQLiteStateStore(ConnectionPool(tmp_path / "new.db", size=1), "a")
+    state = {
+        "weekly_plan": {"2025-W40": _sel("A")},
+        "day_detail": {"2025-W40": {"월": {"main": ["5km"], "routine": ["물"]}}},
+        "completed_by_day": {"2025-W40|특별|2025-10-01": "5"},  # 주 키에 "|"가 있어도 마지막 "|"로 나눔
+        "weekly_review": {"2025-W40": "좋았음"},
+        "settings": {"theme": "dark"},
+    }
+    store.save(state, month="10월")
+    assert SQLiteStateStore(store.pool, "a").load() == state
+    assert store.masks_between("2025-10-01", "2025-10-02")[0][:2] == ("2025-W40|특별", "2025-10-01")
@@ -0,0 +1,107 @@
+import copy
+import json
+
+import pytest
+
+from state_store import JournalStateStore, StateStore, _user_path, get_state_store
+
+
+def test_backend_missing_a_method_fails_on_creation():
+    class NoReset(StateStore):
+        def load(self, month=None):
+            return {}
+
+        def save(self, payload, month=None):
+            return 0
+
+    with pytest.raises(TypeError):
+        NoReset()
+
+
+def test_journal_store_is_a_state_store(tmp_path):
+    assert isinstance(JournalStateStore(tmp_path / "state.json"), StateStore)
+
+
+def test_users_with_similar_names_get_separate_files(tmp_path):
+    users = ["a b", "a.b", "a_b", "a%20b", "김철수"]
+    paths = {_user_path(tmp_path / "state.json", u) for u in users}
+    assert len(paths) == len(users)
+    assert _user_path(tmp_path / "state.json", "default") == tmp_path / "state.json"
+
+    for i, u in enumerate(users):
+        store = get_state_store(tmp_path / "state.json", user=u, backend="journal")
+        store.save({"weekly_plan": {"2025-W40": {"focus": [f"goal-{i}"], "routine": []}}})
+    for i, u in enumerate(users):
+        fresh = JournalStateStore(_user_path(tmp_path / "state.json", u))
+        assert fresh.load()["weekly_plan"]["2025-W40"]["focus"] == [f"goal-{i}"]
+
+
+def _journal_lines(store):
+    return store.journal_path.read_bytes().splitlines()
+
+
+def test_save_appends_only_changes_and_replays(tmp_path, serialized_state):
+    store = JournalStateStore(tmp_path / "state.json", fsync=False)
+    assert store.save(serialized_state) > 0
+    assert store.save(copy.deepcopy(serialized_state)) == 0  # 바뀐 게 없으면 I/O 없음
+    n = len(_journal_lines(store))
+
+    state = copy.deepcopy(serialized_state)
+    w1 = next(iter(state["weekly_plan"]))
+    state["weekly_plan"][w1]["routine"].append("영어 - 단어 20개")
+    state["day_detail"][w1]["수"] = {"main": ["초안"], "routine": []}
+    assert store.save(state) == 2  # 주 하나, 요일 하나
+    assert len(_journal_lines(store)) == n + 2
+    assert JournalStateStore(tmp_path / "state.json").load() == state
+
+
+def test_legacy_checks_are_journaled_per_toggle(tmp_path, serialized_state):
+    store = JournalStateStore(tmp_path / "state.json", fsync=False)
+    store.save(serialized_state)
+    state = copy.deepcopy(serialized_state)
+    key = next(k for k, v in state["completed_by_day"].items() if isinstance(v, list))
+    state["completed_by_day"][key] = [state["completed_by_day"][key][1], "메인: 새 항목"]
+    assert store.save(state) == 2
+    ops = [json.loads(line)["op"] for line in _journal_lines(store)[-2:]]
+    assert sorted(ops) == ["add", "discard"]
+    assert JournalStateStore(tmp_path / "state.json").load() == state
+
+
+def test_torn_last_line_is_dropped_and_truncated(tmp_path, serialized_state):
+    store = JournalStateStore(tmp_path / "state.json", fsync=False)
+    store.save(serialized_state)
+    size = store.journal_path.stat().st_size
+    with open(store.journal_path, "ab") as f:
+        f.write('{"op": "set", "k": "weekly_review", "p": ["x"], "v": "쓰다 만'.encode())
+    fresh = JournalStateStore(tmp_path / "state.json", fsync=False)
+    assert fresh.load() == serialized_state
+    assert fresh.journal_path.stat().st_size == size
+
+    state = copy.deepcopy(serialized_state)
+    state["weekly_review"]["2025-W42"] = "다음 줄"
+    assert fresh.save(state) == 1
+    assert JournalStateStore(tmp_path / "state.json").load() == state
+
+
+@pytest.mark.parametrize("fmt", ["binary", "json"])
+def test_compaction_folds_the_journal_into_a_snapshot(tmp_path, serialized_state, fmt):
+    store = JournalStateStore(tmp_path / "state.json", compact_records=3, fsync=False, snapshot_format=fmt)
+    state = copy.deepcopy(serialized_state)
+    store.save(state)  # 레코드가 3개를 넘어 바로 합침
+    snapshot = store.snap_path if fmt == "binary" else store.path
+    assert snapshot.exists() and store.journal_path.stat().st_size == 0
+
+    state["weekly_review"]["2025-W42"] = "합친 뒤"
+    store.save(state)
+    fresh = JournalStateStore(tmp_path / "state.json", snapshot_format=fmt)
+    assert fresh.load() == state
+    w1 = next(iter(state["weekly_plan"]))
+    assert fresh.load(weeks=[w1])["weekly_plan"] == {w1: state["weekly_plan"][w1]}
+
+
+def test_reset_removes_everything(tmp_path, serialized_state):
+    store = JournalStateStore(tmp_path / "state.json", compact_records=3, fsync=False)
+    store.save(serialized_state)
+    store.reset()
+    assert list(tmp_path.iterdir()) == []
+    assert JournalStateStore(tmp_path / "state.json").load() == {}
@@ -0,0 +1,53 @@
+import json
+
+from tracing import Tracer, session_tracer, waterfall_frame
+
+
+def test_disabled_tracer_records_nothing(tmp_path):
+    tracer = Tracer("app", enabled=False, jsonl_path=str(tmp_path / "t.jsonl"))
+    tracer.begin_run()
+    with tracer.span("a"):
+        tracer.count("goals", 3)
+    assert tracer.end_run() is None and tracer.runs() == []
+    assert not (tmp_path / "t.jsonl").exists()
+
+
+def test_runs_keep_nested_spans_counters_and_history(tmp_path):
+    path = tmp_path / "t.jsonl"
+    tracer = Tracer("app", enabled=True, history=2, jsonl_path=str(path))
+    for i in range(3):
+        tracer.begin_run()
+        with tracer.span("바깥"):
+            with tracer.span("안쪽"):
+                tracer.count("goals", 2)
+            tracer.count("goals")
+        tracer.end_run()
+    runs = tracer.runs()
+    assert [r["run"] for r in runs] == [2, 3]  # 최근 history회만
+    run = runs[-1]
+    assert [(s["name"], s["depth"]) for s in run["spans"]] == [("바깥", 0), ("안쪽", 1)]
+    assert run["counters"] == {"goals": 3}
+    outer, inner = run["spans"]
+    assert outer["start_ms"] <= inner["start_ms"] and inner["ms"] <= outer["ms"] <= run["total_ms"]
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [r["run"] for r in lines] == [1, 2, 3] and "_t0" not in lines[0]
+
+
+def test_unfinished_run_is_closed_by_the_next_one():
+    tracer = Tracer("app", enabled=True, jsonl_path=None)
+    tracer.begin_run()
+    with tracer.span("st.stop 전"):
+        pass
+    tracer.begin_run("fragment")  # st.stop으로 end_run을 못 부른 경우
+    assert tracer.active and len(tracer.runs()) == 1
+    tracer.end_run()
+    frame = waterfall_frame(tracer.runs())
+    assert frame["단계"].tolist() == ["st.stop 전"]
+    assert tracer.runs()[-1]["scope"] == "fragment"
+
+
+def test_session_tracer_is_one_per_session_and_app():
+    state = {}
+    assert session_tracer(state, "a") is session_tracer(state, "a")
+    assert session_tracer(state, "a") is not session_tracer(state, "b")
+    assert session_tracer({}, "a") is not session_tracer(state, "a")
@@ -0,0 +1,134 @@
+import io
+import random
+
+import pandas as pd
+import pytest
+
+import week_csv as wc
+from week_csv import (
+    DAYS_KR, WEEK_COLUMNS, blob_digest, cached_preview, cached_week, get_header_resolver, get_week_cache,
+    load_week_like, read_csv_preview, sniff_encoding,
+)
+from workbook_cache import content_hash
+
+
+def test_week_columns_are_normalized_and_sorted(week_csv):
+    out = load_week_like(week_csv)
+    assert list(out.columns) == [name for _, name in WEEK_COLUMNS]
+    assert list(out["요일"]) == ["월", "화", "수", "금", "일"]
+    assert isinstance(out["요일"].dtype, pd.CategoricalDtype) and list(out["요일"].cat.categories) == DAYS_KR
+    assert (out["자동 제안(배경)"] == "").all()  # 원본에 없는 컬럼
+    assert out.set_index("요일").loc["화", "상세 플랜(배경)"] == ""  # 빈 칸
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 50_000])
+def test_chunked_reads_keep_values_as_text(week_csv, chunksize):
+    out = load_week_like(week_csv, chunksize=chunksize).set_index("요일")
+    # 덩어리마다 dtype을 추론하면 "1"이 "1.0"이 될 수 있음
+    assert out.loc["금", "상세 플랜(메인)"] == "1"
+    assert out.loc["화", "상세 플랜(메인)"] == "1.0"
+    pd.testing.assert_frame_equal(load_week_like(week_csv, chunksize=chunksize), load_week_like(week_csv))
+
+
+def test_cp949_file_and_file_objects(week_csv):
+    text = week_csv.decode("utf-8-sig")
+    cp949 = text.encode("cp949")
+    assert sniff_encoding(io.BytesIO(cp949)) == "cp949"
+    pd.testing.assert_frame_equal(load_week_like(io.BytesIO(cp949)), load_week_like(week_csv))
+
+
+def test_sniff_ignores_a_character_cut_at_the_boundary():
+    raw = ("a" * ((1 << 16) - 1) + "가").encode("utf-8")  # "가"(3바이트)가 앞부분 경계에 걸림
+    assert sniff_encoding(io.BytesIO(raw)) == "utf-8-sig"
+
+
+def test_preview_reads_only_the_first_rows(week_csv_rows):
+    body = "\n".join(",".join(r[:2]) for r in week_csv_rows * 2000)
+    raw = ("날짜,요일\n" + body + "\n깨진,줄,입니다,\"닫히지 않은").encode("utf-8")
+    preview = read_csv_preview(raw, nrows=3)
+    assert len(preview) == 3 and list(preview.columns) == ["날짜", "요일"]
+
+
+def test_missing_day_column_is_an_error():
+    with pytest.raises(ValueError, match="요일"):
+        load_week_like("날짜,메인\n2025-10-01,x\n".encode("utf-8"))
+
+
+def _blob(data, name="week.csv"):
+    return {"name": name, "bytes": data}
+
+
+def test_same_content_is_parsed_once(week_csv, monkeypatch):
+    calls = []
+    real = wc.load_week_like
+    monkeypatch.setattr(wc, "load_week_like", lambda data, **kw: calls.append(1) or real(data, **kw))
+    data = week_csv + b"\n"  # 다른 테스트의 캐시 항목과 겹치지 않게
+    first = cached_week(_blob(data))
+    again = cached_week(_blob(bytes(data), name="다시 올린 파일.csv"))
+    assert again is first and calls == [1]
+    assert cached_week(_blob(data + b"\n")) is not first
+
+    blob = _blob(data)
+    assert blob_digest(blob) == content_hash(data) and blob["digest"] == content_hash(data)
+
+
+def test_preview_rows_and_aliases_are_separate_entries(week_csv):
+    data = week_csv.replace("포커스".encode(), "할 일".encode())
+    assert len(cached_preview(_blob(data), nrows=2)) == 2
+    assert len(cached_preview(_blob(data), nrows=4)) == 4
+    # 사용자 별칭을 추가하면 다른 리졸버 → 같은 파일도 다시 매핑
+    plain = cached_week(_blob(data)).frame
+    aliased = cached_week(_blob(data), get_header_resolver({"main": ["할 일"]})).frame
+    # 기본 별칭만으로는 "메인"이 들어 있는 첫 컬럼(자동 제안)으로 부분 일치
+    assert plain["상세 플랜(메인)"].equals(plain["자동 제안(메인)"])
+    assert aliased.set_index("요일").loc["금", "상세 플랜(메인)"] == "1"
+
+
+def test_derived_task_table_is_kept_on_the_entry(week_csv):
+    entry = cached_week(_blob(week_csv))
+    built = []
+    make = lambda frame: built.append(1) or len(frame)  # noqa: E731
+    assert get_week_cache().derive(entry, ("tasks", "W1"), make) == 5
+    assert get_week_cache().derive(entry, ("tasks", "W1"), make) == 5
+    assert get_week_cache().derive(entry, ("tasks", "W2"), make) == 5
+    assert len(built) == 2
+
+
+def _legacy_pick(cols, keys):
+    """예전 _pick: 별칭 순서대로 완전일치 → 컬럼 순서대로 부분포함"""
+    by_norm = {wc._norm_header(c): c for c in cols}
+    for k in keys:
+        if wc._norm_header(k) in by_norm:
+            return by_norm[wc._norm_header(k)]
+    for c in cols:
+        if any(wc._norm_header(k) in wc._norm_header(c) for k in keys):
+            return c
+    return None
+
+
+def test_resolver_matches_the_old_pick():
+    rng = random.Random(11)
+    pool = [a for keys in wc.HEADER_ALIASES.values() for a in keys] + [
+        "Day ", "오늘 메인 할일", "배경_메모", "DATE(yyyy-mm-dd)", "자동 제안 (메인)", "비고", "메인", "상세플랜(배경)",
+    ]
+    resolver = wc.HeaderResolver(wc.HEADER_ALIASES)
+    for _ in range(300):
+        cols = rng.sample(pool, rng.randint(1, 7))
+        expected = {field: _legacy_pick(cols, keys) for field, keys in wc.HEADER_ALIASES.items()}
+        assert resolver.resolve(cols) == expected, cols
+
+
+def test_resolver_remembers_headers_and_user_aliases_come_last():
+    resolver = wc.HeaderResolver(wc.HEADER_ALIASES)
+    cols = ["요일", "할 일", "배경"]
+    first = resolver.resolve(cols)
+    first["main"] = "바꿔도"
+    assert resolver.resolve(cols)["main"] is None  # 기억한 결과는 사본으로 돌려줌
+    assert len(resolver._memo) == 1
+
+    extra = get_header_resolver({"main": "할 일", "모르는 필드": ["x"]})
+    assert extra is get_header_resolver({"main": ["할 일"]})
+    assert extra.signature != get_header_resolver().signature
+    assert extra.resolve(cols)["main"] == "할 일"
+    # 기본 별칭이 있으면 사용자 별칭보다 먼저
+    assert extra.resolve(["요일", "할 일", "메인"])["main"] == "메인"
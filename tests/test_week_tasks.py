@@ -0,0 +1,78 @@
+import pandas as pd
+
+from week_csv import load_week_like
+from week_tasks import (
+    KIND_MAIN, KIND_ROUTINE, TASK_COLUMNS, _stable_task_key, build_task_table, day_slices, week_dates, week_days,
+)
+
+
+def _legacy_split(s):
+    """예전 _parse_pipe_or_lines (셀마다 파이썬으로 쪼갬)"""
+    if s is None or (isinstance(s, float) and pd.isna(s)):
+        return []
+    s = str(s)
+    if "|" in s:
+        parts = [x.strip() for x in s.split("|")]
+    else:
+        parts = []
+        for sep in ["\n", ","]:
+            if sep in s:
+                parts = [x.strip() for x in s.split(sep)]
+                break
+        if not parts:
+            parts = [s.strip()]
+    return [x for x in parts if x]
+
+
+def _legacy_tasks(B_df, week_id):
+    """예전 B_map(iterrows) → (요일, kind, text, key) 목록"""
+    b_map = {}
+    for _, row in B_df.iterrows():
+        d = str(row["요일"]) if row["요일"] == row["요일"] else ""
+        if d:
+            b_map[d] = {"main": _legacy_split(row.get("상세 플랜(메인)", "")),
+                        "routine": _legacy_split(row.get("상세 플랜(배경)", ""))}
+    out = []
+    for d in [d for d in ("월", "화", "수", "목", "금", "토", "일") if d in b_map]:
+        for kind, name in ((KIND_MAIN, "main"), (KIND_ROUTINE, "routine")):
+            out += [(d, kind, t, _stable_task_key(week_id, d, kind, t)) for t in b_map[d][name]]
+    return out
+
+
+def test_task_table_matches_the_row_loop(week_csv):
+    B_df = load_week_like(week_csv)
+    # 같은 요일이 두 번 나오면 마지막 행이 이김
+    B_df = pd.concat([B_df, B_df[B_df["요일"] == "수"].assign(**{"상세 플랜(메인)": "다시 | 쓴 | 수요일"})],
+                     ignore_index=True)
+    tasks = build_task_table(B_df, "W40")
+    assert list(tasks.columns) == TASK_COLUMNS
+    assert list(zip(tasks["day"], tasks["kind"], tasks["text"], tasks["key"])) == _legacy_tasks(B_df, "W40")
+    assert (tasks["label"] == tasks["kind"] + " " + tasks["text"]).all()
+    assert tasks[tasks["day"] == "수"]["text"].tolist()[:3] == ["다시", "쓴", "수요일"]
+
+
+def test_separators_follow_the_old_priority():
+    B_df = pd.DataFrame({
+        "요일": ["월", "화", "수", "목"],
+        "상세 플랜(메인)": ["a, b | c", "a,b\nc", "a, b", "  "],
+        "상세 플랜(배경)": [None, "", "x|", "y"],
+    })
+    tasks = build_task_table(B_df, "W")
+    got = {d: g["text"].tolist() for d, g in tasks.groupby("day", sort=False)}
+    assert got == {"월": ["a, b", "c"], "화": ["a,b", "c"], "수": ["a", "b", "x"], "목": ["y"]}
+
+
+def test_positions_and_day_slices(week_csv):
+    B_df = load_week_like(week_csv)
+    tasks = build_task_table(B_df, "W40")
+    slices = day_slices(tasks)
+    assert list(slices) == week_days(B_df) == ["월", "화", "수", "금", "일"]
+    for d, sl in slices.items():
+        part = tasks.iloc[sl]
+        assert (part["day"] == d).all()
+        assert part["position"].tolist() == list(range(len(part)))
+        # 메인이 배경보다 앞
+        kinds = part["kind"].tolist()
+        assert kinds == sorted(kinds, key=lambda k: k != KIND_MAIN)
+    assert week_dates(B_df)["월"] == "2025-09-29"
+    assert build_task_table(B_df.iloc[0:0], "W40").empty and day_slices(build_task_table(B_df.iloc[0:0], "W")) == {}
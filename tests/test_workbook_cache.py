@@ -0,0 +1,73 @@
+import pandas as pd
+
+from disk_cache import DiskCache
+from goal_table import parse_goal_table
+from workbook_cache import WorkbookCache, content_hash
+
+
+class _Loader:
+    """호출 횟수를 세는 loader (바이트 → (시트 목록, df))"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = 0
+
+    def __call__(self, data):
+        self.calls += 1
+        return ["최대선_최소선"], self.frame.assign(원본=data.decode())
+
+
+def test_same_bytes_load_once(goal_frame):
+    cache, loader = WorkbookCache(disk=None), _Loader(goal_frame)
+    a = cache.get_or_load(b"one", loader)
+    assert cache.get_or_load(b"one", loader) is a
+    assert cache.get_or_load(b"two", loader) is not a
+    assert loader.calls == 2
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 2)
+    assert a.digest == content_hash(b"one")
+
+
+def test_least_recently_used_entry_is_evicted(goal_frame):
+    cache, loader = WorkbookCache(max_entries=2, disk=None), _Loader(goal_frame)
+    a = cache.get_or_load(b"a", loader)
+    cache.get_or_load(b"b", loader)
+    cache.get_or_load(b"a", loader)  # a를 최근 사용으로
+    cache.get_or_load(b"c", loader)
+    assert cache.get(a.digest) is a
+    assert cache.get(content_hash(b"b")) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_ceiling_keeps_only_the_newest(goal_frame):
+    loader = _Loader(goal_frame)
+    cache = WorkbookCache(max_bytes=1, disk=None)
+    cache.get_or_load(b"a", loader)
+    newest = cache.get_or_load(b"b", loader)
+    assert len(cache) == 1 and cache.get(newest.digest) is newest
+    assert cache.total_bytes == newest.nbytes
+
+
+def test_derived_results_are_built_once_and_counted(goal_frame):
+    cache = WorkbookCache(disk=None)
+    entry = cache.get_or_load(b"x", _Loader(goal_frame))
+    before = cache.total_bytes
+    calls = []
+    first = cache.month_goals(entry, "10월", lambda df, m: calls.append(m) or {"month": m})
+    assert cache.month_goals(entry, "10월", lambda df, m: calls.append(m)) is first
+    assert calls == ["10월"] and cache.total_bytes > before
+
+
+def test_disk_cache_skips_the_loader_after_restart(tmp_path, goal_frame):
+    loader = _Loader(goal_frame)
+    first = WorkbookCache(disk=DiskCache(tmp_path))
+    entry = first.get_or_load(b"wb", loader)
+    table = first.derive(entry, "goal_table", parse_goal_table)
+    assert entry.on_disk
+
+    restarted = WorkbookCache(disk=DiskCache(tmp_path))  # 새 프로세스와 같은 상태
+    again = restarted.get_or_load(b"wb", loader)
+    assert loader.calls == 1 and again.on_disk
+    pd.testing.assert_frame_equal(again.frame, entry.frame)
+    built = []
+    pd.testing.assert_frame_equal(restarted.derive(again, "goal_table", lambda df: built.append(1)), table)
+    assert built == []
@@ -1,190 +1,80 @@
 import streamlit as st
 import pandas as pd
 import re
-import calendar
 import datetime
 import hashlib
 import json
 from pathlib import Path
 import streamlit as st
 
-STATE_FILE = Path("state_storage.json")
-STATE_KEYS = ["weekly_plan", "day_detail", "completed_by_day", "weekly_review"]
-
-import unicodedata
-from collections import defaultdict
-
-def _normalize_text(s: str) -> str:
-    # 공백/기호/대소문자 차이로 매칭 실패하지 않게 정규화
-    s = unicodedata.normalize("NFKC", str(s)).strip()
-    s = re.sub(r"\s+", " ", s)
-    return s
-
-def build_month_goals(df):
-    """
-    df의 '최대선','최소선'에서 [소주제] • 항목을 파싱해
-    goal_id -> {label, kind('max'|'min'), section, item} 사전 생성
-    """
-    goals = {}
-    seen = set()
-
-    blocks = []
-    if "최대선" in df.columns:
-        blocks += [("max", x) for x in df["최대선"].dropna().tolist()]
-    if "최소선" in df.columns:
-        blocks += [("min", x) for x in df["최소선"].dropna().tolist()]
-
-    for kind, text in blocks:
-        parsed = parse_goals(str(text))
-        for section, item in parsed:
-            label = f"{section} - {item}"
-            key = _normalize_text(label)
-            if key in seen:  # 중복 제거
-                continue
-            seen.add(key)
-            goals[key] = {
-                "label": label,
-                "kind": kind,          # 'max' or 'min'
-                "section": section,
-                "item": item,
-            }
-    return goals  # key는 정규화 label
-
-def compute_coverage(weeks, weekly_plan, month_goals):
-    """
-    주차별 선택(weekly_plan) 대비 월 목표 커버리지/누락/과밀을 계산
-    - focus는 가중치 2, routine은 가중치 1(필요시 조정)
-    """
-    # 주당 focus 최대 2개 (이미 UI에서 max_selections=2)
-    week_capacity = {wk: 2 for wk in weeks.values()}
-
-    # 목표별 커버 카운트
-    cov = {gid: {"focus": 0, "routine": 0, "weeks": []} for gid in month_goals.keys()}
-
-    # 주차별 현재 focus 개수
-    week_focus_count = defaultdict(int)
-
-    # 매칭
-    for wk in weeks.values():
-        sel = weekly_plan.get(wk, {"focus": [], "routine": []})
-        for bucket, name in [("focus", "focus"), ("routine", "routine")]:
-            for raw in sel.get(name, []):
-                gid = _normalize_text(raw)
-                if gid in cov:
-                    cov[gid][bucket] += 1
-                    if wk not in cov[gid]["weeks"]:
-                        cov[gid]["weeks"].append(wk)
-        week_focus_count[wk] = len(sel.get("focus", []))
-
-    # 최대선 필수 조건(기본 규칙):
-    #   - 각 '최대선'은 적어도 1번은 focus로 등장해야 함
-    #   - 현실성 체크: 총 focus 슬롯 >= 최대선 개수인지 사전 진단
-    num_weeks = len(weeks)
-    total_focus_slots = num_weeks * 2
-    max_goals = [gid for gid, g in month_goals.items() if g["kind"] == "max"]
-    capacity_ok = total_focus_slots >= len(max_goals)
-
-    missing_focus = [gid for gid in max_goals if cov[gid]["focus"] == 0]
-    covered_focus = [gid for gid in max_goals if cov[gid]["focus"] >= 1]
-
-    # 배치 가능한 주(여유 슬롯이 있는 주)를 찾고, 누락된 최대선을 우선 배치 제안
-    free_weeks = [wk for wk, c in week_focus_count.items() if c < 2]
-
-    suggestions = []  # [(week_key, goal_id)]
-    gi = 0
-    for wk in free_weeks:
-        if gi >= len(missing_focus):
-            break
-        suggestions.append((wk, missing_focus[gi]))
-        gi += 1
-
-    # 남은 누락 목표가 있다면: 과밀 주에서 교체 제안(배경 → 포커스로 승격)
-    swaps = []  # [(from_week, goal_id)]  # 과밀 주의 routine을 포커스로 승격 제안
-    if gi < len(missing_focus):
-        # 과밀 주들
-        crowded = [wk for wk, c in week_focus_count.items() if c >= 2]
-        for wk in crowded:
-            # 그 주의 routine 중에서 동일 goal이 있다면 승격 추천
-            rts = weekly_plan.get(wk, {}).get("routine", [])
-            r_norm = set(_normalize_text(x) for x in rts)
-            for gid in missing_focus[gi:]:
-                if gid in r_norm:
-                    swaps.append((wk, gid))
-                    gi += 1
-                    if gi >= len(missing_focus):
-                        break
-            if gi >= len(missing_focus):
-                break
-
-    return {
-        "capacity_ok": capacity_ok,
-        "total_focus_slots": total_focus_slots,
-        "num_max_goals": len(max_goals),
-        "coverage": cov,
-        "missing_focus": missing_focus,
-        "covered_focus": covered_focus,
-        "suggestions": suggestions,
-        "swaps": swaps,
-    }
-
+from state_store import STATE_KEYS, _serialize_state, _deserialize_state, get_state_store
+from goal_table import goals_for_month, parse_goal_table
+from workbook_cache import get_workbook_cache
+from tracing import TRACE_ENABLED, render_trace_panel, session_tracer
+from autosave import SessionFlush, get_autosave
 
-def _serialize_state(s):
-    """st.session_state → JSON 직렬화 가능한 dict로 변환"""
-    out = {}
-    for k in STATE_KEYS:
-        if k not in s:
-            continue
-        v = s[k]
-        # 특수 타입 처리
-        if k == "completed_by_day":
-            # {(week_key, date_str): set(...)} → {"weekKey|date": list(...)}
-            conv = {}
-            for tkey, val in v.items():
-                if isinstance(tkey, tuple):
-                    saved_key = "|".join(list(tkey))
-                else:
-                    saved_key = str(tkey)
-                conv[saved_key] = list(val)  # set → list
-            out[k] = conv
-        else:
-            out[k] = v
-    return out
+STATE_FILE = Path("state_storage.json")
 
-def _deserialize_state(d):
-    """JSON → 세션 상태 복원"""
-    result = {}
-    for k in STATE_KEYS:
-        if k not in d:
-            continue
-        v = d[k]
-        if k == "completed_by_day":
-            # {"weekKey|date": list(...)} → {(weekKey, date): set(...)}
-            conv = {}
-            for skey, lst in v.items():
-                parts = skey.split("|")
-                tkey = tuple(parts) if len(parts) > 1 else (skey,)
-                conv[tkey] = set(lst)
-            result[k] = conv
-        else:
-            result[k] = v
-    return result
+from calendar_index import get_calendar_index
+from coverage_model import CoverageModel
+from day_plans import DayPlanCache, quarter_weeks, to_csv_bytes
+from day_scheduler import schedule_month
+from focus_solver import ADD_COST, DISPLACE_COST, PROMOTE_COST
+from goal_registry import GoalRegistry
+from plan_variants import PlanVariants
+from scenario_search import W_BALANCE, W_CHURN, W_COVERAGE, result_rows, search_scenarios
+from planner import (
+    DAYS_KR, MONTH_MAP, _build_virtual_plan,
+    coverage_rows, find_current_week_label, generate_calendar_weeks,
+    load_goal_workbook, split_auto_items, suggestion_rows, virtual_diff_rows, virtual_plan_rows,
+    week_plan_rows,
+)
+
+def _state_store():
+    # 사용자별 네임스페이스 (백엔드는 TIME_APP_STATE_BACKEND: journal | sqlite)
+    return get_state_store(STATE_FILE, user=st.session_state.get("state_user") or "default")
+
+def _autosave():
+    # 저장소당 쓰기 스레드 1개. 세션이 끝나면 SessionFlush가 대기 중인 기록을 flush
+    writer = get_autosave(_state_store())
+    marker = st.session_state.get("_autosave_flush")
+    if marker is None:
+        marker = st.session_state["_autosave_flush"] = SessionFlush()
+    marker.track(writer)
+    return writer
 
 def load_state():
-    if STATE_FILE.exists():
-        try:
-            data = json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    try:
+        # 대기 중인 자동 저장을 먼저 기록한 뒤 스냅샷 + 저널 재생 (쓰다 만 마지막 기록은 무시)
+        _autosave().flush()
+        data = _state_store().load()
+        if data:
             restored = _deserialize_state(data)
             for k, v in restored.items():
                 st.session_state[k] = v
             st.sidebar.success("저장된 상태를 불러왔어요.")
-        except Exception as e:
-            st.sidebar.warning(f"상태 불러오기 오류: {e}")
+    except Exception as e:
+        st.sidebar.warning(f"상태 불러오기 오류: {e}")
 
 def save_state():
     try:
+        # 직렬화만 하고 쓰기 스레드에 넘김 (디스크 I/O는 화면 재실행 밖에서, 몰린 요청은 하나로 병합)
         payload = _serialize_state(st.session_state)
-        STATE_FILE.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-        st.sidebar.info("상태 저장 완료.")
+        writer = _autosave()
+        writer.submit(payload, month=st.session_state.get("plan_month"))
+        stats = writer.snapshot()
+        # 지난 재실행 이후 백그라운드에서 실제로 기록된 양
+        seen = st.session_state.get("_autosave_seen", (0, 0))
+        now = (stats["records"], writer.store.bytes_written)
+        st.session_state["_autosave_seen"] = now
+        tracer.count("records_persisted", max(0, now[0] - seen[0]))
+        tracer.count("bytes_persisted", max(0, now[1] - seen[1]))
+        st.sidebar.caption(
+            f"💾 자동 저장: 기록 {stats['written']}회 · 병합 {stats['coalesced']} · 버림 {stats['dropped']}"
+            + (" · 대기 중" if stats["pending"] else "")
+        )
+        if stats["last_error"]:
+            st.sidebar.error(f"상태 저장 실패: {stats['last_error']}")
     except Exception as e:
         st.sidebar.error(f"상태 저장 실패: {e}")
 
@@ -192,91 +82,14 @@ def reset_state():
     for k in STATE_KEYS:
         if k in st.session_state:
             del st.session_state[k]
-    if STATE_FILE.exists():
-        STATE_FILE.unlink(missing_ok=True)
+    writer = _autosave()
+    writer.discard()
+    writer.flush()  # 이미 쓰는 중인 기록이 끝난 뒤 초기화
+    _state_store().reset()
     st.sidebar.warning("상태를 초기화했어요.")
 
 
 
-# 오늘이 포함된 주차 자동 탐색
-def find_current_week_label(weeks_dict):
-    for label in weeks_dict.keys():
-        date_range = label.split("(")[1].strip(")")
-        start_str, end_str = date_range.split("~")
-        start_month, start_day = map(int, start_str.split("/"))
-        end_month, end_day = map(int, end_str.split("/"))
-        start_date = datetime.date(today_date.year, start_month, start_day)
-        end_date = datetime.date(today_date.year, end_month, end_day)
-        if start_date <= today_date <= end_date:
-            return label
-    return None
-
-def parse_goals(text: str):
-    """
-    문자열에서 [소주제]와 • 항목들을 매핑하여 리스트로 반환
-    """
-    results = []
-    current_section = None
-
-    # 줄 단위로 분리
-    lines = text.strip().splitlines()
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # [소주제] 탐지
-        header_match = re.match(r"\[(.*?)\]", line)
-        if header_match:
-            current_section = header_match.group(1).strip()
-            # 헤더에 바로 붙은 bullet이 있는 경우 ([박사] • ~)
-            after = line[header_match.end():].strip()
-            if after.startswith("•"):
-                item = after.lstrip("•").strip()
-                results.append((current_section, item))
-            continue
-
-        # 일반 bullet 항목
-        if line.startswith("•"):
-            item = line.lstrip("•").strip()
-            section = current_section if current_section else "기타"
-            results.append((section, item))
-
-    return results
-
-# --- [2] 주차 계산 함수 ---
-def generate_calendar_weeks(year: int, month: int):
-    """
-    실제 달력 기준 (월요일~일요일)으로 주차 계산
-    월 경계 포함, 예: 9/30(월)~10/6(일)
-    """
-    weeks = {}
-
-    # 이번 달 1일과 마지막 날
-    first_day = datetime.date(year, month, 1)
-    last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
-
-    # 이번 달 첫 주의 월요일 찾기 (1일 이전일 수도 있음)
-    start_of_first_week = first_day - datetime.timedelta(days=first_day.weekday())
-
-    current_start = start_of_first_week
-    week_num = 1
-
-    while current_start <= last_day:
-        current_end = current_start + datetime.timedelta(days=6)
-        label = f"{week_num}주차 ({current_start.month}/{current_start.day}~{current_end.month}/{current_end.day})"
-        weeks[label] = f"week{week_num}"
-        current_start += datetime.timedelta(days=7)
-        week_num += 1
-
-    return weeks
-
-
-# -------
-month_map = {"1월": 1, "2월": 2, "3월": 3, "4월": 4, "5월": 5, "6월": 6,
-              "7월": 7, "8월": 8, "9월": 9, "10월": 10, "11월": 11, "12월": 12}
-
 # --- 현재 날짜 및 주차 판별 ---
 today_date = datetime.date.today()
 today_name = today_date.strftime("%A")  
@@ -286,26 +99,46 @@ st.set_page_config(page_title="Time Focus Flow", layout="wide")
 
 st.title("🧠 주간 시간관리 웹앱")
 st.markdown("분기/월 목표에서 이번 주의 메인 목표를 선택하고, 실행 배경을 설계하세요.")
+st.sidebar.text_input("👤 사용자", value="default", key="state_user")
+
+# 단계별 시간 측정 (켜져 있을 때만 기록)
+tracer = session_tracer(st.session_state, "time_app")
+tracer.enabled = st.sidebar.checkbox("⏱ 단계별 시간 보기", value=TRACE_ENABLED, key="trace_on")
+trace_box = st.sidebar.container()
+tracer.begin_run()
+
+
+def finish_trace():
+    """이번 재실행 기록을 마감하고 사이드바에 최근 재실행 워터폴 표시"""
+    tracer.end_run()
+    if tracer.enabled:
+        with trace_box.expander("⏱ 최근 재실행", expanded=True):
+            render_trace_panel(st, tracer)
 
 # 1. 엑셀 업로드
 uploaded_file = st.file_uploader("📁 엑셀 파일 업로드", type=["xlsx"])
 
 if uploaded_file:
+    # 같은 파일이면 캐시에서 (위젯 클릭마다 openpyxl 재파싱하지 않음)
+    wb_cache = get_workbook_cache()
+    with tracer.span("xlsx 읽기"):
+        data = uploaded_file.getvalue()
+        wb_entry = wb_cache.get_or_load(data, load_goal_workbook)
+    tracer.count("upload_bytes", len(data))
     with st.expander("🔍 시트 미리보기"):
-        sheet_names = pd.ExcelFile(uploaded_file).sheet_names
-        st.write("엑셀 시트 목록:", sheet_names)
+        st.write("엑셀 시트 목록:", wb_entry.sheet_names)
     # 시트 불러오기
-    df = pd.read_excel(uploaded_file, sheet_name="최대선_최소선")
-    df = df[["프로젝트", "월", "최소선", "최대선", "측정지표"]].dropna(subset=["월"])
+    df = wb_entry.frame
 
     # Streamlit 설정
     st.set_page_config(page_title="월별 포커스 & 주간 설정", layout="wide")
     st.title("🧠 월별 포커스 선택 및 주간 메인/배경 구성")
 
     selected_month = st.selectbox("📅 월을 선택하세요", sorted(df["월"].dropna().unique()))
+    st.session_state["plan_month"] = selected_month
 
     year = datetime.date.today().year
-    month_num = month_map[selected_month]
+    month_num = MONTH_MAP[selected_month]
 
     weeks = generate_calendar_weeks(year, month_num)
 
@@ -313,40 +146,51 @@ if uploaded_file:
     # 2. 해당 월 목표표 보기
     filtered = df[df["월"] == selected_month].reset_index(drop=True)
     st.markdown("### 🔍 해당 월의 목표 목록")
-    st.dataframe(filtered[["프로젝트", "최대선", "최소선"]], use_container_width=True)
+    with tracer.span("목표 표 렌더"):
+        st.dataframe(filtered[["프로젝트", "최대선", "최소선"]], use_container_width=True)
 
 
     st.markdown(f"### 🗓 {selected_month}의 주차별 일정 ({len(weeks)}주차)")
 
     # --- [4] 목표 데이터 파싱 ---
-    filtered = df[df["월"] == selected_month].reset_index(drop=True)
-    text_blocks = filtered["최소선"].dropna().tolist() + filtered["최대선"].dropna().tolist()
-    parsed = parse_goals("\n".join(map(str, text_blocks)))
-    all_goals = [f"{section} - {item}" for section, item in parsed]
+    # 시트 전체를 한 번에 파싱한 테이블을 워크북당 1회 만들고, 월 전환은 필터만
+    with tracer.span("목표 파싱"):
+        goal_table = wb_cache.derive(wb_entry, "goal_table", parse_goal_table)
+        all_goals, month_goals = wb_cache.month_goals(
+            wb_entry, selected_month, lambda _df, m: goals_for_month(goal_table, m)
+        )
+        # 목표 ID 레지스트리 (라벨 정규화는 라벨당 1회)
+        goal_registry = wb_cache.derive(
+            wb_entry, ("registry", selected_month), lambda _df: GoalRegistry.from_month_goals(month_goals)
+        )
+
+    tracer.count("goals", len(month_goals))
+    tracer.count("weeks", len(weeks))
 
     # --- [5] 주차별 선택 UI ---
     if "weekly_plan" not in st.session_state:
         st.session_state.weekly_plan = {}
 
-    for label, key in weeks.items():
-        c1, c2, c3 = st.columns([1.5, 3, 3])
-        with c1:
-            st.markdown(f"**📌 {label}**")
-        with c2:
-            focus = st.multiselect(
-                "메인 포커스 (1-2개)",
-                options=all_goals,
-                max_selections=2,
-                key=f"{key}_focus"
-            )
-        with c3:
-            routine = st.multiselect(
-                "백그라운드 배경 (최대 5개)",
-                options=all_goals,
-                max_selections=5,
-                key=f"{key}_routine"
-            )
-        st.session_state.weekly_plan[key] = {"focus": focus, "routine": routine}
+    with tracer.span("주차 선택 UI"):
+        for label, key in weeks.items():
+            c1, c2, c3 = st.columns([1.5, 3, 3])
+            with c1:
+                st.markdown(f"**📌 {label}**")
+            with c2:
+                focus = st.multiselect(
+                    "메인 포커스 (1-2개)",
+                    options=all_goals,
+                    max_selections=2,
+                    key=f"{key}_focus"
+                )
+            with c3:
+                routine = st.multiselect(
+                    "백그라운드 배경 (최대 5개)",
+                    options=all_goals,
+                    max_selections=5,
+                    key=f"{key}_routine"
+                )
+            st.session_state.weekly_plan[key] = {"focus": focus, "routine": routine}
 
     current_week_label = find_current_week_label(weeks)
 
@@ -367,14 +211,22 @@ if uploaded_file:
         })
 
     summary_df = pd.DataFrame(summary_data)
-    st.dataframe(summary_df, use_container_width=True)
+    with tracer.span("주간 요약 렌더"):
+        st.dataframe(summary_df, use_container_width=True)
 
     st.markdown("## 🔎 최대선 커버리지 피드백")
 
     # --- 요기부터: "이번달 주간 요약(summary_df)" 바로 밑에 붙이기 ---
 
-    month_goals = build_month_goals(filtered)  # 위에서 만든 filtered(선택 월 df) 사용
-    cov_res = compute_coverage(weeks, st.session_state.weekly_plan, month_goals)
+    # 커버리지 모델은 세션에 유지하고 선택이 바뀐 주만 반영 (월/워크북이 바뀌면 새로 만듦)
+    with tracer.span("compute_coverage"):
+        cov_model = st.session_state.get("_coverage_model")
+        if cov_model is None or not cov_model.matches(weeks, goal_registry):
+            cov_model = st.session_state["_coverage_model"] = CoverageModel(weeks, goal_registry)
+        deltas = cov_model.deltas
+        tracer.count("coverage_weeks_changed", cov_model.sync(st.session_state.weekly_plan))
+        tracer.count("coverage_deltas", cov_model.deltas - deltas)
+        cov_res = cov_model.result()
 
     # 1) 용량 진단
     if not cov_res["capacity_ok"]:
@@ -388,19 +240,10 @@ if uploaded_file:
         )
 
     # 2) 커버리지 표
-    rows = []
-    for gid, g in month_goals.items():
-        cv = cov_res["coverage"][gid]
-        rows.append({
-            "구분": "최대선" if g["kind"]=="max" else "최소선",
-            "목표": g["label"],
-            "포커스 횟수": cv["focus"],
-            "배경 횟수": cv["routine"],
-            "배치 주": ", ".join(cv["weeks"]) if cv["weeks"] else "-",
-            "상태": ("누락(포커스 미배정)" if (g["kind"]=="max" and cv["focus"]==0) else "OK")
-        })
+    rows = coverage_rows(month_goals, cov_res)
     cov_df = pd.DataFrame(rows).sort_values(["구분","상태","목표"])
-    st.dataframe(cov_df, use_container_width=True)
+    with tracer.span("커버리지 렌더"):
+        st.dataframe(cov_df, use_container_width=True)
 
     # 3) 누락 경고
     missing_max_labels = [month_goals[gid]["label"] for gid in cov_res["missing_focus"]]
@@ -413,14 +256,11 @@ if uploaded_file:
     # ====== 원본 유지: 제안만 적용한 '가상 계획' 생성/표시/다운로드 ======
 
     st.markdown("#### 👀 제안 미리보기")
-    preview_rows = []
-    for wk, gid in cov_res["suggestions"]:
-        preview_rows.append({"주차": wk, "조치": "add", "대상": month_goals[gid]["label"], "설명": "빈 슬롯에 최대선 배치"})
-    for wk, gid in cov_res["swaps"]:
-        preview_rows.append({"주차": wk, "조치": "promote", "대상": month_goals[gid]["label"], "설명": "과밀 주 routine→focus 승격"})
+    preview_rows = suggestion_rows(cov_res, month_goals)
 
     if preview_rows:
         suggest_df = pd.DataFrame(preview_rows)
+        st.caption(f"배치 비용: {cov_res['placement_cost']} (추가 {ADD_COST} · 승격 {PROMOTE_COST} · 밀어내기 승격 {DISPLACE_COST})")
         st.dataframe(suggest_df, use_container_width=True)
         st.download_button(
             "📥 제안 미리보기 CSV", suggest_df.to_csv(index=False).encode("utf-8-sig"),
@@ -429,76 +269,42 @@ if uploaded_file:
     else:
         st.caption("현재 자동 제안 없음.")
 
-    # ---------- 핵심: 원본을 복사해 '가상 계획'만 생성 ----------
-    def _normalize_text(s: str) -> str:
-        import unicodedata, re
-        s = unicodedata.normalize("NFKC", str(s)).strip()
-        s = re.sub(r"\s+", " ", s)
-        return s
-
-    def _snapshot_weekly_plan(plan_dict):
-        snap = {}
-        for wk, v in plan_dict.items():
-            snap[wk] = {"focus": list(v.get("focus", [])), "routine": list(v.get("routine", []))}
-        return snap
-
-    def _build_virtual_plan(base_plan, suggestions, swaps, month_goals):
-        """원본은 그대로 두고, 제안을 적용한 가상 계획과 로그를 반환"""
-        virtual = _snapshot_weekly_plan(base_plan)  # 깊은 복사
-        applied = []
-
-        # 1) 빈 슬롯 add
-        for wk, gid in suggestions:
-            label = month_goals[gid]["label"]
-            plan = virtual.get(wk, {"focus": [], "routine": []})
-            if label not in plan["focus"] and len(plan["focus"]) < 2:
-                plan["focus"].append(label)
-                applied.append(("add", wk, label, "빈 슬롯에 최대선 배치"))
-            virtual[wk] = plan
-
-        # 2) routine→focus 승격 (2개 제한 유지, 넘치면 앞쪽 것을 잘라 2개만)
-        for wk, gid in swaps:
-            label = month_goals[gid]["label"]
-            plan = virtual.get(wk, {"focus": [], "routine": []})
-            plan["routine"] = [x for x in plan.get("routine", []) if _normalize_text(x) != gid]
-            if label not in plan["focus"]:
-                plan["focus"].append(label)
-                if len(plan["focus"]) > 2:
-                    # 정책: 가장 최근 2개만 유지
-                    dropped = plan["focus"][:-2]
-                    plan["focus"] = plan["focus"][-2:]
-                    for dlab in dropped:
-                        applied.append(("drop", wk, dlab, "과밀 조정(2개 제한)"))
-                applied.append(("promote", wk, label, "routine→focus 승격"))
-            virtual[wk] = plan
-
-        return virtual, applied
-
     # ---------- 버튼: 가상 계획 만들기(원본 불변) ----------
     st.markdown("#### ✅ 제안 반영 시뮬레이션 (원본은 변경되지 않음)")
 
+    # 가상 계획은 원본 위에 바뀐 주만 덮어쓴 변형 (세션에 이름 붙여 여러 개 보관, 원본과 구조 공유)
+    variants = st.session_state.get("_plan_variants")
+    if variants is None:
+        variants = st.session_state["_plan_variants"] = PlanVariants()
+
+    variant_name = st.text_input("가상 계획 이름", placeholder=f"가상 {len(variants) + 1}", key="variant_name")
     if st.button("제안 반영한 '가상 계획' 생성"):
-        original = _snapshot_weekly_plan(st.session_state.weekly_plan)
-        virtual_plan, applied_log = _build_virtual_plan(original, cov_res["suggestions"], cov_res["swaps"], month_goals)
-
-        # 주차별 diff
-        diff_rows = []
-        for wk in weeks.values():
-            b_focus = set(original.get(wk, {}).get("focus", []))
-            a_focus = set(virtual_plan.get(wk, {}).get("focus", []))
-            added = sorted(list(a_focus - b_focus))
-            removed = sorted(list(b_focus - a_focus))
-            diff_rows.append({
-                "주차": wk,
-                "추가된 포커스": " | ".join(added) if added else "-",
-                "제거된 포커스(가상)": " | ".join(removed) if removed else "-",
-                "가상 계획 포커스": " | ".join(virtual_plan.get(wk, {}).get("focus", [])) if virtual_plan.get(wk) else "-",
-                "가상 계획 배경":  " | ".join(virtual_plan.get(wk, {}).get("routine", [])) if virtual_plan.get(wk) else "-",
-            })
+        original = variants.base(st.session_state.weekly_plan)
+        with tracer.span("가상 계획"):
+            virtual_plan, _ = _build_virtual_plan(original, cov_res["suggestions"], cov_res["swaps"], month_goals, goal_registry)
+        name = variants.unique_name(variant_name.strip() or f"가상 {len(variants) + 1}")
+        variants.add(name, virtual_plan)
+        st.session_state["variant_pick"] = name
+        st.success(f"가상 계획 '{name}'이 생성되었습니다. (원래 계획은 그대로입니다)")
+
+    if len(variants):
+        names = variants.names()
+        vc1, vc2 = st.columns(2)
+        with vc1:
+            picked = st.selectbox("🗂 저장된 가상 계획", names, key="variant_pick")
+        with vc2:
+            base_label = "생성 당시 원본"
+            compare = st.selectbox("비교 기준", [base_label] + [n for n in names if n != picked], key="variant_compare")
+        virtual_plan = variants.get(picked)
+        original = virtual_plan.parent if compare == base_label else variants.get(compare)
+        applied_log = list(virtual_plan.log)
+        st.caption(f"저장된 가상 계획 {len(variants)}개 · 보관 중인 주 {variants.stored_weeks()}개 (바뀐 주만 저장)")
+
+        # 주차별 diff (덮어쓴 주만 비교)
+        diff_rows = virtual_diff_rows(weeks, original, virtual_plan)
         diff_df = pd.DataFrame(diff_rows)
 
-        st.success("가상 계획이 생성되었습니다. (원래 계획은 그대로입니다)")
-        st.markdown("##### 🔁 반영 결과(diff, 원본 vs. 가상)")
+        st.markdown(f"##### 🔁 반영 결과(diff, {compare} vs. {picked})")
         st.dataframe(diff_df, use_container_width=True)
         st.download_button(
             "📥 반영 결과(diff) CSV", diff_df.to_csv(index=False).encode("utf-8-sig"),
@@ -507,14 +313,7 @@ if uploaded_file:
 
         # 가상 계획 전체 표(주차별 포커스/배경)
         st.markdown("##### 🗂 가상 계획(제안 반영본) 일람")
-        plan_rows = []
-        for label, wk in weeks.items():
-            v = virtual_plan.get(wk, {"focus": [], "routine": []})
-            plan_rows.append({
-                "주차": label,
-                "포커스(가상)": " | ".join(v.get("focus", [])) or "-",
-                "배경(가상)":  " | ".join(v.get("routine", [])) or "-",
-            })
+        plan_rows = virtual_plan_rows(weeks, virtual_plan)
         virtual_df = pd.DataFrame(plan_rows)
         st.dataframe(virtual_df, use_container_width=True)
         st.download_button(
@@ -534,6 +333,45 @@ if uploaded_file:
         else:
             st.caption("실행된 가상 조치가 없습니다.")
 
+        if st.button("🗑 이 가상 계획 삭제", key="variant_drop"):
+            variants.remove(picked)
+            st.session_state.pop("variant_pick", None)
+            st.session_state.pop("variant_compare", None)
+            st.rerun()
+
+    # ---------- 시나리오 탐색: 적용 순서/drop 정책/승격 조합을 바꾼 후보들을 점수로 비교 ----------
+    with st.expander("🎲 시나리오 탐색 (가상 계획 후보 비교)"):
+        sc1, sc2 = st.columns(2)
+        with sc1:
+            n_scenarios = st.number_input("후보 수", min_value=10, max_value=2000, value=200, step=50, key="scenario_n")
+        with sc2:
+            top_k = st.number_input("상위 k", min_value=1, max_value=20, value=5, key="scenario_k")
+        st.caption(f"점수 = 최대선 커버리지 × {W_COVERAGE} + 주별 균형 × {W_BALANCE} − 변경량 × {W_CHURN} (×100)")
+        search_key = (selected_month, cov_model.version)
+        if st.button("시나리오 탐색 실행", key="scenario_run"):
+            with tracer.span("시나리오 탐색"):
+                search = search_scenarios(weeks, st.session_state.weekly_plan, cov_res, month_goals, goal_registry,
+                                          n=int(n_scenarios), top_k=int(top_k))
+            st.session_state["_scenario_search"] = (search_key, search)
+            tracer.count("scenarios", search["evaluated"])
+
+        saved = st.session_state.get("_scenario_search")
+        if saved:
+            key_then, search = saved
+            if key_then != search_key:
+                st.caption("⚠️ 계획이 바뀌었습니다. 최신 계획으로 보려면 다시 실행하세요.")
+            st.caption(f"후보 {search['evaluated']}개 평가 · 서로 다른 계획 {search['unique']}개")
+            st.dataframe(pd.DataFrame(result_rows(search)), use_container_width=True)
+            if search["results"]:
+                tabs = st.tabs([f"{r['rank']}위" for r in search["results"]])
+                for tab, r in zip(tabs, search["results"]):
+                    with tab:
+                        st.markdown(f"**{r['name']}** · 점수 {r['score']}")
+                        st.dataframe(pd.DataFrame(r["diff_rows"]), use_container_width=True)
+                        if st.button("가상 계획으로 저장", key=f"scenario_save_{r['rank']}"):
+                            variants.add(variants.unique_name(f"시나리오 {r['rank']}위"), r["variant"])
+                            st.rerun()
+
     # def _normalize_text(s: str) -> str:
     #     import unicodedata, re
     #     s = unicodedata.normalize("NFKC", str(s)).strip()
@@ -689,89 +527,25 @@ if uploaded_file:
         plan = {"focus": [], "routine": []}
     # ---
 
-    DAYS_KR = ["월", "화", "수", "목", "금", "토", "일"]
-
     # --- (전제) 주차 선택: 해당 주만 보이도록 ---
-    # weeks = {"1주차 (10/7~10/13)": "week1", ...} 가 이미 있다고 가정
+    # weeks = {"1주차 (10/6~10/12)": "2025-W41", ...} 가 이미 있다고 가정
     selected_week_label = st.selectbox("📆 체크할 주 차를 선택하세요", list(weeks.keys()))
     selected_week_key = weeks[selected_week_label]
 
-    # 주차 라벨에서 날짜 범위 파싱 (옵션)
-    def parse_week_dates(week_label: str, year: int = None):
-        if year is None:
-            year = datetime.date.today().year
-        rng = week_label.split("(")[1].strip(")")
-        start_str, end_str = rng.split("~")
-        sm, sd = map(int, start_str.split("/"))
-        em, ed = map(int, end_str.split("/"))
-        start = datetime.date(year, sm, sd)
-        end = datetime.date(year, em, ed)
-        days = [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
-        # 길이가 7이 아닐 수 있어도 표시 맞춤
-        while len(days) < 7:
-            days.append(days[-1] + datetime.timedelta(days=1))
-        return days[:7]
-
-    week_dates = parse_week_dates(selected_week_label)
+    # 주 키 → 날짜 7일 (달력 인덱스 조회)
+    week_dates = get_calendar_index().dates_of(selected_week_key)
 
     st.markdown(f"### 🗓 {selected_week_label} — 월-일 가로 블록 + 상세 플랜")
 
     # --- 이 주의 메인/배경 가져오기 ---
     plan = st.session_state.weekly_plan.get(selected_week_key, {"focus": [], "routine": []})
-    mains = plan.get("focus", [])[:2]  # 메인 최대 2개
-    routines = plan.get("routine", [])
+    mains = plan.get("focus", [])
 
     if not mains:
         st.info("이 주차에 메인이 없습니다. 먼저 ‘주차별 메인/배경’을 선택해주세요.")
+        finish_trace()
         st.stop()
 
-    main_a = mains[0]
-    main_b = mains[1] if len(mains) > 1 else None
-
-    # --- 자동 배치 로직 ---
-    def auto_place_blocks(main_a: str, main_b: str | None, routines: list[str]):
-        """
-        월/수/금 → A, 화/목/금 → B, 금요일은 마무리/체크업,
-        토/일은 미완료 보완/보충. 배경은 요일별로 순환 삽입.
-        """
-        day_blocks = {d: [] for d in DAYS_KR}
-
-        # 메인 배치
-        assign_map = {
-            "월": [("메인", main_a)],
-            "화": [("메인", main_b if main_b else main_a)],
-            "수": [("메인", main_a)],
-            "목": [("메인", main_b if main_b else main_a)],
-            "금": [("메인-마무리/체크업", main_a)]
-        }
-        if main_b:
-            assign_map["금"].append(("메인-마무리/체크업", main_b))
-
-        # 적용
-        for d, items in assign_map.items():
-            for tag, title in items:
-                if title:
-                    # 스텝 라벨 없이 핵심만 (UI엔 스텝 숨김)
-                    day_blocks[d].append(f"{tag}: {title}")
-
-        # 주말: 보완/보충/회고 제안
-        day_blocks["토"].append("보완/보충: 이번 주 미완료 항목 처리")
-        day_blocks["일"].append("회고/정리: 다음 주 준비")
-
-        # 배경을 요일별로 고르게 순환 삽입
-        if routines:
-            ri = 0
-            for d in DAYS_KR:
-                # 금요일엔 '마무리'가 있으니 배경은 1개만 제안
-                if d == "금":
-                    day_blocks[d].append(f"배경: {routines[ri % len(routines)]}"); ri += 1
-                else:
-                    # 평일 1~2개, 주말 1개 정도로 제안 (필요시 조절 가능)
-                    day_blocks[d].append(f"배경: {routines[ri % len(routines)]}"); ri += 1
-
-        return day_blocks
-
-    default_blocks = auto_place_blocks(main_a, main_b, routines)
 
     # --- ‘빈 플랜 박스’(상세 계획) + 자동 제안 블록 병기 ---
     # --- 상세 플랜 저장 구조: { week_key: { day: {"main":[], "routine":[]} } } ---
@@ -791,83 +565,74 @@ if uploaded_file:
                     "routine": val.get("routine", [])
                 }
 
-    cols = st.columns(7)
-    for i, d in enumerate(DAYS_KR):
-        with cols[i]:
-            date_tag = f" ({week_dates[i].month}/{week_dates[i].day})" if week_dates else ""
-            st.markdown(f"**{d}{date_tag}**")
-
-            # 자동 제안 → 메인/배경 분리해서 보여주기
-            auto_items = default_blocks.get(d, []) if isinstance(default_blocks, dict) else []
-            auto_main = [x for x in auto_items if not x.startswith("배경:")]
-            auto_routine = [x for x in auto_items if x.startswith("배경:")]
-
-            if auto_main or auto_routine:
-                st.caption("🔹 자동 제안")
-                if auto_main:
-                    st.write("- " + " | ".join(auto_main))
-                if auto_routine:
-                    st.write("- : " + " | ".join(auto_routine))
-                    st.write("- " + " | ".join(auto_routine))
-
-            # ✏️ 상세 플랜(메인/배경) 두 칸
-            st.caption("✏️ 오늘 상세 플랜")
-            c_main, c_routine = st.columns(2)
-
-            # 현재 값 불러오기
-            cur_main = st.session_state.day_detail[selected_week_key][d]["main"]
-            cur_routine = st.session_state.day_detail[selected_week_key][d]["routine"]
-
-            with c_main:
-                main_text = st.text_area(
-                    "메인", value="\n".join(cur_main),
-                    key=f"detail::{selected_week_key}::{d}::main",
-                    height=120, placeholder="메인 관련 상세 계획 (한 줄에 한 항목)"
-                )
-            with c_routine:
-                routine_text = st.text_area(
-                    "배경", value="\n".join(cur_routine),
-                    key=f"detail::{selected_week_key}::{d}::routine",
-                    height=120, placeholder="배경 관련 상세 계획 (한 줄에 한 항목)"
-                )
-
-            st.session_state.day_detail[selected_week_key][d]["main"] = [
-                t.strip() for t in main_text.splitlines() if t.strip()
-            ]
-            st.session_state.day_detail[selected_week_key][d]["routine"] = [
-                t.strip() for t in routine_text.splitlines() if t.strip()
-            ]
+    # --- 자동 배치 (day_scheduler: 한 달치를 한 번에, 이미 적은 상세 플랜은 그 요일의 부하로 반영) ---
+    # 방금 고친 text_area 값은 session_state에 먼저 들어와 있으므로 이 주는 위젯 값으로 셈
+    detail_now = {
+        d: {part: [t for t in st.session_state.get(f"detail::{selected_week_key}::{d}::{part}",
+                                                   "\n".join(v[part])).splitlines() if t.strip()]
+            for part in ("main", "routine")}
+        for d, v in st.session_state.day_detail[selected_week_key].items()
+    }
+    with tracer.span("요일 자동 배치"):
+        month_blocks = schedule_month(
+            st.session_state.weekly_plan, weeks.values(),
+            {**st.session_state.day_detail, selected_week_key: detail_now},
+        )
+    default_blocks = month_blocks.get(selected_week_key, {})
+
+    with tracer.span("요일 그리드(text_area)"):
+        cols = st.columns(7)
+        for i, d in enumerate(DAYS_KR):
+            with cols[i]:
+                date_tag = f" ({week_dates[i].month}/{week_dates[i].day})" if week_dates else ""
+                st.markdown(f"**{d}{date_tag}**")
+
+                # 자동 제안 → 메인/배경 분리해서 보여주기
+                auto_main, auto_routine = split_auto_items(default_blocks, d)
+
+                if auto_main or auto_routine:
+                    st.caption("🔹 자동 제안")
+                    if auto_main:
+                        st.write("- " + " | ".join(auto_main))
+                    if auto_routine:
+                        st.write("- : " + " | ".join(auto_routine))
+                        st.write("- " + " | ".join(auto_routine))
+
+                # ✏️ 상세 플랜(메인/배경) 두 칸
+                st.caption("✏️ 오늘 상세 플랜")
+                c_main, c_routine = st.columns(2)
+
+                # 현재 값 불러오기
+                cur_main = st.session_state.day_detail[selected_week_key][d]["main"]
+                cur_routine = st.session_state.day_detail[selected_week_key][d]["routine"]
+
+                with c_main:
+                    main_text = st.text_area(
+                        "메인", value="\n".join(cur_main),
+                        key=f"detail::{selected_week_key}::{d}::main",
+                        height=120, placeholder="메인 관련 상세 계획 (한 줄에 한 항목)"
+                    )
+                with c_routine:
+                    routine_text = st.text_area(
+                        "배경", value="\n".join(cur_routine),
+                        key=f"detail::{selected_week_key}::{d}::routine",
+                        height=120, placeholder="배경 관련 상세 계획 (한 줄에 한 항목)"
+                    )
+
+                st.session_state.day_detail[selected_week_key][d]["main"] = [
+                    t.strip() for t in main_text.splitlines() if t.strip()
+                ]
+                st.session_state.day_detail[selected_week_key][d]["routine"] = [
+                    t.strip() for t in routine_text.splitlines() if t.strip()
+                ]
 
     st.markdown("### ✅ 이 주 요약표 (당신이 적은 상세 플랜 기준)")
     st.markdown("---")        
-    rows = []
-    for i, d in enumerate(DAYS_KR):
-        date_str = f"{week_dates[i].month}/{week_dates[i].day}" if week_dates else "-"
-
-        # 자동 제안(메인/배경 분리)
-        auto_items = default_blocks.get(d, []) if isinstance(default_blocks, dict) else []
-        auto_main = [x for x in auto_items if not x.startswith("배경:")]
-        auto_routine = [x for x in auto_items if x.startswith("배경:")]
-
-        # 상세 플랜(메인/배경)
-        detail_main = st.session_state.day_detail[selected_week_key][d]["main"]
-        detail_routine = st.session_state.day_detail[selected_week_key][d]["routine"]
-
-        # 최종 ‘해야할 일’은 상세 우선, 없으면 자동 제안 사용
-        final_main = detail_main if detail_main else auto_main
-        final_routine = detail_routine if detail_routine else auto_routine
-
-        rows.append({
-            "요일": d,
-            "날짜": date_str,
-            "자동 제안(메인)": " | ".join(auto_main) if auto_main else "-",
-            "자동 제안(배경)": " | ".join(auto_routine) if auto_routine else "-",
-            "상세 플랜(메인)": " | ".join(detail_main) if detail_main else "-",
-            "상세 플랜(배경)": " | ".join(detail_routine) if detail_routine else "-",
-        })
+    rows = week_plan_rows(default_blocks, st.session_state.day_detail[selected_week_key], week_dates)
 
     week_df = pd.DataFrame(rows)
-    st.dataframe(week_df, use_container_width=True)
+    with tracer.span("주간 요약표 렌더"):
+        st.dataframe(week_df, use_container_width=True)
 
     # (선택) CSV 다운로드
     csv = week_df.to_csv(index=False).encode("utf-8-sig")
@@ -878,6 +643,31 @@ if uploaded_file:
         mime="text/csv"
     )
 
+    # --- 월/분기 전체 상세 플랜 (주마다 캐시 → 바뀐 주만 다시 계산, 한 파일로 내보내기) ---
+    st.markdown("### 📦 월/분기 전체 상세 플랜")
+    c_scope, c_build = st.columns([2, 1])
+    with c_scope:
+        scope = st.radio("범위", ["이번 달", "이번 분기"], horizontal=True, key="day_plan_scope")
+    with c_build:
+        build_all = st.checkbox("전체 표 만들기", key="day_plan_build")
+    if build_all:
+        span_weeks = weeks if scope == "이번 달" else quarter_weeks(year, month_num)
+        day_plans = st.session_state.get("_day_plans")
+        if day_plans is None:
+            day_plans = st.session_state["_day_plans"] = DayPlanCache()
+        with tracer.span("월/분기 상세 플랜 표"):
+            plan_table = day_plans.table(span_weeks, st.session_state.weekly_plan, st.session_state.day_detail)
+        tracer.count("day_plan_weeks_built", day_plans.last_built)
+        st.caption(f"{len(span_weeks)}주 · {len(plan_table)}행 (이번에 다시 만든 주 {day_plans.last_built}개)")
+        st.dataframe(plan_table, use_container_width=True, hide_index=True)
+        span_name = selected_month if scope == "이번 달" else f"{year}-Q{(month_num - 1) // 3 + 1}"
+        st.download_button(
+            "📥 전체 상세 플랜 CSV 다운로드",
+            data=to_csv_bytes(plan_table),
+            file_name=f"day_plans_{span_name}.csv",
+            mime="text/csv",
+        )
+
 
 
     # # ---
@@ -1063,4 +853,6 @@ if uploaded_file:
 #     load_state()
 #     st.session_state["state_loaded_once"] = True
 # 페이지 맨 끝 (모든 UI 렌더 후)
-save_state()
+with tracer.span("save_state"):
+    save_state()
+finish_trace()
@@ -0,0 +1,185 @@
+"""
+재실행(rerun) 단위 단계별 시간 측정
+
+  tracer = session_tracer(st.session_state, "time_app")
+  tracer.begin_run()
+  with tracer.span("xlsx 읽기"):
+      ...
+  tracer.count("goals", len(goals))
+  tracer.end_run()          # 기록 보관(최근 N회) + JSONL 추가(설정 시)
+
+- 꺼져 있으면 span()은 미리 만든 빈 컨텍스트를 돌려주고 count()는 바로 반환 → 비용 거의 없음
+- TIME_APP_TRACE=1 이면 기본으로 켜짐, TIME_APP_TRACE_FILE=경로 이면 재실행마다 한 줄씩 추가
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+TRACE_ENABLED = os.environ.get("TIME_APP_TRACE", "") not in ("", "0")
+TRACE_FILE = os.environ.get("TIME_APP_TRACE_FILE") or None
+TRACE_HISTORY = 20
+
+_FILE_LOCK = threading.Lock()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start", "depth")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.depth = self.tracer._depth
+        self.tracer._depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        tracer = self.tracer
+        tracer._depth -= 1
+        run = tracer._run
+        if run is not None:
+            t0 = run["_t0"]
+            run["spans"].append({
+                "name": self.name,
+                "start_ms": (self.start - t0) * 1e3,
+                "ms": (end - self.start) * 1e3,
+                "depth": self.depth,
+            })
+        return False
+
+
+class Tracer:
+    def __init__(self, app: str, enabled: bool = TRACE_ENABLED, history: int = TRACE_HISTORY,
+                 jsonl_path: str = TRACE_FILE):
+        self.app = app
+        self.enabled = enabled
+        self.jsonl_path = jsonl_path
+        self.history = deque(maxlen=history)
+        self._run = None
+        self._seq = 0
+        self._depth = 0
+
+    @property
+    def active(self) -> bool:
+        """기록 중인 재실행이 있는지"""
+        return self._run is not None
+
+    def begin_run(self, scope: str = "script"):
+        """새 재실행 시작(scope: "script" 전체 / "fragment" 부분). 끝나지 않은 이전 실행(st.stop 등)은 여기서 마감"""
+        if self._run is not None:
+            self.end_run()
+        self._depth = 0
+        if not self.enabled:
+            return
+        self._seq += 1
+        self._run = {
+            "app": self.app,
+            "run": self._seq,
+            "scope": scope,
+            "ts": time.time(),
+            "_t0": time.perf_counter(),
+            "spans": [],
+            "counters": {},
+        }
+
+    def span(self, name: str):
+        if self._run is None:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def count(self, name: str, n=1):
+        run = self._run
+        if run is None:
+            return
+        run["counters"][name] = run["counters"].get(name, 0) + n
+
+    def end_run(self):
+        run = self._run
+        if run is None:
+            return None
+        self._run = None
+        run["total_ms"] = (time.perf_counter() - run.pop("_t0")) * 1e3
+        run["spans"].sort(key=lambda s: s["start_ms"])
+        self.history.append(run)
+        if self.jsonl_path:
+            line = json.dumps(run, ensure_ascii=False) + "\n"
+            with _FILE_LOCK, open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write(line)
+        return run
+
+    def runs(self) -> list:
+        return list(self.history)
+
+
+def session_tracer(state, app: str) -> Tracer:
+    """세션 상태(st.session_state 등 dict 비슷한 것)에 보관된 세션별 Tracer"""
+    key = f"_tracer::{app}"
+    tracer = state.get(key)
+    if tracer is None:
+        tracer = Tracer(app)
+        state[key] = tracer
+    return tracer
+
+
+def waterfall_frame(runs: list):
+    """최근 실행들 → (실행, 단계, 시작/끝 ms) 긴 형식 표"""
+    import pandas as pd
+
+    rows = []
+    for run in runs:
+        label = f"#{run['run']}{'*' if run.get('scope') == 'fragment' else ''} ({run['total_ms']:.0f}ms)"
+        for s in run["spans"]:
+            rows.append({
+                "실행": label,
+                "단계": "  " * s["depth"] + s["name"],
+                "시작(ms)": round(s["start_ms"], 2),
+                "끝(ms)": round(s["start_ms"] + s["ms"], 2),
+                "소요(ms)": round(s["ms"], 2),
+            })
+    return pd.DataFrame(rows, columns=["실행", "단계", "시작(ms)", "끝(ms)", "소요(ms)"])
+
+
+def render_trace_panel(container, tracer: Tracer, last: int = 5):
+    """사이드바 등에 최근 last회 재실행의 워터폴 + 카운터 표시"""
+    runs = tracer.runs()[-last:]
+    if not runs:
+        container.caption("기록된 재실행이 없습니다.")
+        return
+    import altair as alt
+    import pandas as pd
+
+    df = waterfall_frame(runs)
+    if not df.empty:
+        chart = (
+            alt.Chart(df)
+            .mark_bar()
+            .encode(
+                x=alt.X("시작(ms):Q", title="ms"),
+                x2="끝(ms):Q",
+                y=alt.Y("단계:N", sort=None, title=None),
+                row=alt.Row("실행:N", sort="descending", title=None),
+                tooltip=["단계", "소요(ms)", "시작(ms)"],
+            )
+            .properties(height=alt.Step(14))
+        )
+        container.altair_chart(chart)
+    counters = pd.DataFrame([{"실행": f"#{r['run']}", **r["counters"]} for r in runs])
+    container.dataframe(counters, hide_index=True)
@@ -1,10 +1,17 @@
 import streamlit as st
 import pandas as pd
 import datetime
-import hashlib
-import io
+import json
+import numpy as np
 from pathlib import Path
-import re
+
+from tracing import TRACE_ENABLED, render_trace_panel, session_tracer
+from check_analytics import GROUP_COLUMNS, completion_rates
+from check_log import get_event_log, mask_events, seen_events
+from completion import as_mask, done_counts, has_bit, mask_bits, popcount, set_bit
+from week_csv import DAYS_KR, HEADER_ALIASES, cached_preview, cached_week, get_header_resolver, get_week_cache
+from week_tasks import build_task_table, day_slices, week_dates, week_days
+from workbook_cache import content_hash
 
 # ================================================
 # 듀얼 CSV 체크앱 (심플)
@@ -17,125 +24,6 @@ st.set_page_config(page_title="주간 체크리스트 — 듀얼 CSV(심플)", l
 st.title("✅ 주간 체크리스트 — 듀얼 CSV (심플)")
 st.caption("A(virtual)는 그냥 표로 보여주고, B(week)만 체크/진행률에 사용합니다.")
 
-DAYS_KR = ["월","화","수","목","금","토","일"]
-
-# ---------------------
-# Helpers
-# ---------------------
-def _parse_pipe_or_lines(s: str):
-    if s is None or (isinstance(s, float) and pd.isna(s)):
-        return []
-    s = str(s)
-    if "|" in s:
-        parts = [x.strip() for x in s.split("|")]
-    else:
-        parts = []
-        for sep in ["\n", ","]:
-            if sep in s:
-                parts = [x.strip() for x in s.split(sep)]
-                break
-        if not parts:
-            parts = [s.strip()]
-    return [x for x in parts if x]
-
-def _stable_task_key(week_id: str, day: str, prefix: str, text: str) -> str:
-    raw = f"{week_id}|{day}|{prefix}|{text}"
-    return "chk_" + hashlib.md5(raw.encode("utf-8")).hexdigest()
-
-# B용(week.csv) 유연 로더 — 최소 요건: 요일 + (메인 칼럼 하나) + (배경 칼럼 하나)
-HEADER_ALIASES = {
-    "day": ["요일", "day", "일자"],
-    "main": ["상세 플랜(메인)", "메인", "main", "포커스", "focus"],
-    "routine": ["상세 플랜(배경)", "배경", "routine", "background"],
-}
-_DEF_MAIN = "상세 플랜(메인)"
-_DEF_ROUT = "상세 플랜(배경)"
-
-def _norm_header(s: str) -> str:
-    s = str(s).strip().lower()
-    s = re.sub(r"\s+", "", s)
-    return s.replace("_", "")
-
-def _pick(df: pd.DataFrame, keys: list[str]):
-    # 완전일치 → 부분포함 순
-    cols = list(df.columns)
-    by_norm = {_norm_header(c): c for c in cols}
-    for k in keys:
-        if _norm_header(k) in by_norm:
-            return by_norm[_norm_header(k)]
-    for c in cols:
-        nc = _norm_header(c)
-        if any(_norm_header(k) in nc for k in keys):
-            return c
-    return None
-
-def load_week_like(file) -> pd.DataFrame:
-    """
-    CSV를 읽어 아래 6개 컬럼을 '항상' 갖도록 정규화해서 돌려줍니다.
-      - 요일, 날짜, 자동 제안(메인), 자동 제안(배경), 상세 플랜(메인), 상세 플랜(배경)
-    원본 CSV에 없으면 빈 문자열("")로 채우고, 헤더는 유연하게 매핑합니다.
-    """
-    file.seek(0)
-    try:
-        df = pd.read_csv(file, encoding="utf-8-sig")
-    except UnicodeDecodeError:
-        file.seek(0)
-        df = pd.read_csv(file, encoding="utf-8")
-
-    # ---- 컬럼 후보 (유연 매핑) ----
-    # 요일/메인/배경은 기존 별칭 사용
-    day_aliases  = HEADER_ALIASES["day"]          # ["요일","day","일자"]
-    main_aliases = HEADER_ALIASES["main"]         # ["상세 플랜(메인)","메인","main","포커스","focus"]
-    rout_aliases = HEADER_ALIASES["routine"]      # ["상세 플랜(배경)","배경","routine","background"]
-
-    # 추가: 날짜/자동제안 별칭
-    date_aliases      = ["날짜", "date", "일자", "날짜(yyyy-mm-dd)", "날짜(YYYY-MM-DD)"]
-    auto_main_aliases = ["자동 제안(메인)", "자동제안(메인)", "자동제안메인", "제안(메인)", "제안메인", "auto_main", "suggest_main"]
-    auto_rout_aliases = ["자동 제안(배경)", "자동제안(배경)", "자동제안배경", "제안(배경)", "제안배경", "auto_routine", "suggest_routine"]
-
-    # ---- 유연 매핑 픽 ----
-    day_col       = _pick(df, day_aliases)
-    date_col      = _pick(df, date_aliases)
-    main_col      = _pick(df, main_aliases)
-    rout_col      = _pick(df, rout_aliases)
-    auto_main_col = _pick(df, auto_main_aliases)
-    auto_rout_col = _pick(df, auto_rout_aliases)
-
-    # ---- 필수 최소 요건: '요일'은 있어야 함 ----
-    if day_col is None:
-        raise ValueError(f"B 파일에 '요일'에 해당하는 칼럼이 없습니다. CSV 헤더: {list(df.columns)}")
-
-    # ---- 누락된 컬럼은 빈 문자열로 만들어 채워 넣기 ----
-    if date_col is None:
-        df["__날짜__"] = ""
-        date_col = "__날짜__"
-    if main_col is None:
-        df["__상세메인__"] = ""
-        main_col = "__상세메인__"
-    if rout_col is None:
-        df["__상세배경__"] = ""
-        rout_col = "__상세배경__"
-    if auto_main_col is None:
-        df["__자동메인__"] = ""
-        auto_main_col = "__자동메인__"
-    if auto_rout_col is None:
-        df["__자동배경__"] = ""
-        auto_rout_col = "__자동배경__"
-
-    # ---- 출력 스키마 구성 ----
-    out = df[[day_col, date_col, auto_main_col, auto_rout_col, main_col, rout_col]].copy()
-    out.columns = ["요일", "날짜", "자동 제안(메인)", "자동 제안(배경)", "상세 플랜(메인)", "상세 플랜(배경)"]
-
-    # ---- 정리/정렬 ----
-    out = out.fillna("")
-    # 요일 카테고리 정렬 (존재하는 행만 반영)
-    cat = pd.CategoricalDtype(categories=DAYS_KR, ordered=True)
-    out["요일"] = pd.Categorical(out["요일"].astype(str).str.strip(), dtype=cat)
-    out = out.sort_values("요일").reset_index(drop=True)
-
-    return out
-
-
 # ---------------------
 # Sidebar — A/B 업로드 및 고정
 # ---------------------
@@ -148,7 +36,7 @@ with st.sidebar:
         upB = st.file_uploader("B: week.csv (요일/메인/배경)", type=["csv"], key="uB")
 
     if "persist_A" not in st.session_state:
-        st.session_state.persist_A = None  # {name, bytes}
+        st.session_state.persist_A = None  # {name, bytes, digest}
     if "persist_B" not in st.session_state:
         st.session_state.persist_B = None
 
@@ -156,12 +44,14 @@ with st.sidebar:
     with c1:
         if st.button("A 저장/갱신", use_container_width=True) and upA is not None:
             upA.seek(0)
-            st.session_state.persist_A = {"name": upA.name, "bytes": upA.read()}
+            data = upA.read()
+            st.session_state.persist_A = {"name": upA.name, "bytes": data, "digest": content_hash(data)}
             st.success(f"A 고정: {upA.name}")
     with c2:
         if st.button("B 저장/갱신", use_container_width=True) and upB is not None:
             upB.seek(0)
-            st.session_state.persist_B = {"name": upB.name, "bytes": upB.read()}
+            data = upB.read()
+            st.session_state.persist_B = {"name": upB.name, "bytes": data, "digest": content_hash(data)}
             st.success(f"B 고정: {upB.name}")
     with c3:
         if st.button("모두 해제", use_container_width=True):
@@ -171,17 +61,55 @@ with st.sidebar:
 
     st.caption("A는 표로만 보여주고, B만 체크/진행률에 사용합니다. 업로드된 파일은 변경 전까지 유지됩니다.")
 
-# 준비된 바이트 → 파일핸들
+    # 내보낸 도구마다 헤더 이름이 다르면 별칭을 추가 (기본 별칭 뒤에 붙음)
+    with st.expander("🔤 B 헤더 별칭 추가", expanded=False):
+        alias_text = st.text_area(
+            "JSON (필드: day / date / main / routine / auto_main / auto_routine)",
+            placeholder='{"main": ["할 일"], "routine": ["루틴"]}',
+            key="header_alias_text",
+        )
+        header_aliases = {}
+        if alias_text.strip():
+            try:
+                header_aliases = json.loads(alias_text)
+                if not isinstance(header_aliases, dict):
+                    raise ValueError("객체({필드: [별칭...]}) 형식이어야 합니다.")
+                unknown = [f for f in header_aliases if f not in HEADER_ALIASES]
+                if unknown:
+                    st.caption(f"알 수 없는 필드는 무시: {unknown}")
+            except ValueError as e:
+                st.warning(f"별칭 JSON 오류: {e}")
+                header_aliases = {}
+
+    # 단계별 시간 측정 (켜져 있을 때만 기록)
+    trace_on = st.checkbox("⏱ 단계별 시간 보기", value=TRACE_ENABLED, key="trace_on")
+    trace_box = st.container()
+
+tracer = session_tracer(st.session_state, "week2daily")
+tracer.enabled = trace_on
+tracer.begin_run()
+
+
+def finish_trace():
+    """이번 재실행 기록을 마감하고 사이드바에 최근 재실행 워터폴 표시 (*는 체크리스트만 다시 그린 실행)"""
+    tracer.end_run()
+    if tracer.enabled:
+        with trace_box.expander("⏱ 최근 재실행", expanded=True):
+            render_trace_panel(st, tracer)
+
+
+# 고정된 바이트 (해석 결과는 내용 해시로 캐시)
 A_blob = st.session_state.get("persist_A")
 B_blob = st.session_state.get("persist_B")
 A_name = A_blob["name"] if A_blob else None
 B_name = B_blob["name"] if B_blob else None
-A_file = io.BytesIO(A_blob["bytes"]) if A_blob else None
-B_file = io.BytesIO(B_blob["bytes"]) if B_blob else None
 
 if "completed_by_day" not in st.session_state:
     st.session_state.completed_by_day = {}
 
+# 체크 토글 기록 (추가 전용, 기간별 달성률 집계용)
+event_log = get_event_log()
+
 # ---------------------
 # 상단 고정: 두 파일 모두 보여주기 (A는 그대로 df, B는 요약표)
 # ---------------------
@@ -199,24 +127,26 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# A 표 미리읽기 (그대로 표시)
+# A 표 미리읽기 (그대로 표시) — 보여줄 행만 읽음
+A_PREVIEW_ROWS = 50
 A_df = None
-if A_file is not None:
+if A_blob is not None:
     try:
-        A_file.seek(0)
-        try:
-            A_df = pd.read_csv(A_file, encoding="utf-8-sig")
-        except UnicodeDecodeError:
-            A_file.seek(0)
-            A_df = pd.read_csv(A_file)
+        with tracer.span("A 미리보기"):
+            A_df = cached_preview(A_blob, nrows=A_PREVIEW_ROWS)
+        tracer.count("bytes_A", len(A_blob["bytes"]))
     except Exception as e:
         st.warning(f"A 파일 읽기 오류: {e}")
 
 # B 요약표 구성(요일/메인/배경이 있는 경우)
 B_df = None
-if B_file is not None:
+B_entry = None
+if B_blob is not None:
     try:
-        B_df = load_week_like(B_file)
+        with tracer.span("B 해석"):
+            B_entry = cached_week(B_blob, get_header_resolver(header_aliases))
+            B_df = B_entry.frame
+        tracer.count("bytes_B", len(B_blob["bytes"]))
     except Exception as e:
         st.warning(f"B 파일 해석 오류: {e}")
 
@@ -225,7 +155,8 @@ st.markdown("<div class='sticky-plan'>", unsafe_allow_html=True)
 
 if A_df is not None:
     st.markdown(f"**📌 A(virtual) — {A_name}**")
-    st.dataframe(A_df.head(50), use_container_width=True)
+    st.dataframe(A_df, use_container_width=True)
+    st.caption(f"앞 {A_PREVIEW_ROWS}행만 미리보기")
     st.download_button("📥 A 다운로드", data=A_blob.get("bytes", b""), file_name=A_name or "virtual.csv", mime="text/csv", key="dlA")
 else:
     st.markdown("**📌 A(virtual)**: (파일 없음 또는 읽기 실패)")
@@ -244,101 +175,146 @@ st.markdown("</div>", unsafe_allow_html=True)
 # ---------------------
 if B_df is None:
     st.info("B(week) 파일이 있어야 체크리스트를 사용할 수 있어요.")
+    finish_trace()
     st.stop()
 
-# 요일 → 태스크 매핑 (B)
-B_map = {}
-ordered_days = []
-for _, row in B_df.iterrows():
-    d = str(row["요일"]) if row["요일"] == row["요일"] else ""
-    if not d:
-        continue
-    mains = _parse_pipe_or_lines(row.get(_DEF_MAIN, ""))
-    routines = _parse_pipe_or_lines(row.get(_DEF_ROUT, ""))
-    B_map[d] = {"main": mains, "routine": routines}
-    if d not in ordered_days:
-        ordered_days.append(d)
-ordered_days = [d for d in DAYS_KR if d in ordered_days]
-
-# 오늘 요일 자동 인식 (수동 변경 가능)
-_today = datetime.date.today()
-auto_idx = min(_today.weekday(), 6)
-sel_day = st.radio(
-    "🗓 오늘 요일 선택",
-    ordered_days,
-    index=ordered_days.index(DAYS_KR[auto_idx]) if DAYS_KR[auto_idx] in ordered_days else 0,
-    horizontal=True,
-)
-
+# 요일별 태스크 테이블 (B 파일·week_id당 한 번만 만들어 캐시 항목에 보관)
 week_id = Path(B_name or "week").stem
-main_tasks = B_map[sel_day]["main"]
-routine_tasks = B_map[sel_day]["routine"]
-all_tasks = [("[메인]", t) for t in main_tasks] + [("[배경]", t) for t in routine_tasks]
-
-if (week_id, sel_day) not in st.session_state.completed_by_day:
-    st.session_state.completed_by_day[(week_id, sel_day)] = set()
-completed = st.session_state.completed_by_day[(week_id, sel_day)]
-
-st.subheader(f"{sel_day} 체크리스트")
-if not all_tasks:
-    st.info("해당 요일에 등록된 태스크가 없습니다.")
-else:
-    for kind, text in all_tasks:
-        label = f"{kind} {text}"
-        key = _stable_task_key(week_id, sel_day, kind, text)
-        checked = st.checkbox(label, value=(label in completed), key=key)
-        if checked:
-            completed.add(label)
+with tracer.span("태스크 테이블"):
+    tasks, ordered_days, day_dates = get_week_cache().derive(
+        B_entry, ("tasks", week_id),
+        lambda frame: (build_task_table(frame, week_id), week_days(frame), week_dates(frame)),
+    )
+    task_slices = day_slices(tasks)
+tracer.count("tasks", len(tasks))
+
+
+# 체크박스/요일 변경은 이 fragment만 다시 실행 (파일 해석·상단 표는 건드리지 않음)
+@st.fragment
+def checklist_section(tasks: pd.DataFrame, task_slices: dict, ordered_days: list, day_dates: dict, week_id: str):
+    # fragment만 다시 실행될 때는 따로 한 번의 실행으로 기록
+    own_run = not tracer.active
+    if own_run:
+        tracer.begin_run("fragment")
+
+    # 오늘 요일 자동 인식 (수동 변경 가능)
+    _today = datetime.date.today()
+    auto_idx = min(_today.weekday(), 6)
+    sel_day = st.radio(
+        "🗓 오늘 요일 선택",
+        ordered_days,
+        index=ordered_days.index(DAYS_KR[auto_idx]) if DAYS_KR[auto_idx] in ordered_days else 0,
+        horizontal=True,
+    )
+
+    day_tasks = tasks.iloc[task_slices.get(sel_day, slice(0, 0))]
+    completed_by_day = st.session_state.completed_by_day
+
+    # (주, 요일)마다 비트마스크: position번째 비트 = 완료 (과거 라벨 집합은 여기서 변환)
+    completed = as_mask(completed_by_day.get((week_id, sel_day)), day_tasks["label"])
+
+    with tracer.span("체크리스트"):
+        st.subheader(f"{sel_day} 체크리스트")
+        if day_tasks.empty:
+            st.info("해당 요일에 등록된 태스크가 없습니다.")
         else:
-            completed.discard(label)
-
-    pct_day = int(len(completed) / len(all_tasks) * 100) if all_tasks else 0
-    st.progress(pct_day)
-    st.write(f"📊 **{sel_day} 달성률**: {pct_day}%")
-
-# ---------------------
-# 주간 집계 (B 기준)
-# ---------------------
-st.markdown("---")
-st.markdown("### 🧮 주간 진행률 (B 기준)")
-rows = []
-weekly_total = 0
-weekly_done = 0
-for d in ordered_days:
-    tasks_d = [("[메인]", t) for t in B_map[d]["main"]] + [("[배경]", t) for t in B_map[d]["routine"]]
-    total_d = len(tasks_d)
-    done_set = st.session_state.completed_by_day.get((week_id, d), set())
-    done_d = len(done_set)
-    weekly_total += total_d
-    weekly_done += done_d
-    pct_d = int((done_d/total_d)*100) if total_d else 0
-    rows.append({"요일": d, "전체": total_d, "완료": done_d, "달성률(%)": pct_d})
-
-if rows:
-    st.dataframe(pd.DataFrame(rows), use_container_width=True)
-    pct_week = int((weekly_done/weekly_total)*100) if weekly_total else 0
-    st.success(f"**주간 합계** — 완료 {weekly_done} / 전체 {weekly_total} → 달성률 **{pct_week}%**")
-else:
-    st.caption("표시할 주간 집계가 없습니다.")
-
-# ---------------------
-# (선택) 내보내기
-# ---------------------
-with st.expander("📤 현 진행상태 CSV로 내보내기 (B 기준)", expanded=False):
-    out_rows = []
-    for d in ordered_days:
-        tasks_d = [("[메인]", t) for t in B_map[d]["main"]] + [("[배경]", t) for t in B_map[d]["routine"]]
-        done_set = st.session_state.completed_by_day.get((week_id, d), set())
-        for kind, text in tasks_d:
-            label = f"{kind} {text}"
-            out_rows.append({"요일": d, "유형": kind, "할 일": text, "완료": (label in done_set)})
-    if out_rows:
-        out_df = pd.DataFrame(out_rows)
-        st.download_button(
-            "📥 진행상태 CSV 다운로드",
-            data=out_df.to_csv(index=False).encode("utf-8-sig"),
-            file_name=f"progress_{week_id}.csv",
-            mime="text/csv",
+            before = completed
+            for pos, label, key in zip(day_tasks["position"], day_tasks["label"], day_tasks["key"]):
+                checked = st.checkbox(label, value=has_bit(completed, pos), key=key)
+                completed = set_bit(completed, pos, checked)
+
+            # 체크 이벤트 기록: 이 세션에서 처음 보는 날이면 '표시', 바뀐 체크는 체크/해제
+            event_date = day_dates.get(sel_day, sel_day)
+            events = mask_events(week_id, event_date, day_tasks, before, completed)
+            seen = st.session_state.setdefault("_events_seen", set())
+            if (week_id, sel_day) not in seen:
+                seen.add((week_id, sel_day))
+                events = seen_events(week_id, event_date, day_tasks) + events
+            if events:
+                event_log.append(events)
+                tracer.count("check_events", len(events))
+
+            pct_day = int(popcount(completed, len(day_tasks)) / len(day_tasks) * 100)
+            st.progress(pct_day)
+            st.write(f"📊 **{sel_day} 달성률**: {pct_day}%")
+        completed_by_day[(week_id, sel_day)] = completed
+
+    def _day_mask(d):
+        sl = task_slices.get(d, slice(0, 0))
+        return as_mask(completed_by_day.get((week_id, d)), tasks["label"].iloc[sl])
+
+    # ---------------------
+    # 주간 집계 (B 기준)
+    # ---------------------
+    with tracer.span("주간 집계"):
+        st.markdown("---")
+        st.markdown("### 🧮 주간 진행률 (B 기준)")
+        totals = tasks["day"].value_counts()
+        day_totals = [int(totals.get(d, 0)) for d in ordered_days]
+        day_done = done_counts([_day_mask(d) for d in ordered_days], day_totals)
+        rows = [
+            {"요일": d, "전체": total_d, "완료": int(done_d), "달성률(%)": int((done_d/total_d)*100) if total_d else 0}
+            for d, total_d, done_d in zip(ordered_days, day_totals, day_done)
+        ]
+        weekly_total = sum(day_totals)
+        weekly_done = int(day_done.sum())
+
+        if rows:
+            st.dataframe(pd.DataFrame(rows), use_container_width=True)
+            pct_week = int((weekly_done/weekly_total)*100) if weekly_total else 0
+            st.success(f"**주간 합계** — 완료 {weekly_done} / 전체 {weekly_total} → 달성률 **{pct_week}%**")
+        else:
+            st.caption("표시할 주간 집계가 없습니다.")
+
+    # ---------------------
+    # (선택) 내보내기
+    # ---------------------
+    with tracer.span("내보내기"):
+        with st.expander("📤 현 진행상태 CSV로 내보내기 (B 기준)", expanded=False):
+            if not tasks.empty:
+                done = np.zeros(len(tasks), dtype=bool)
+                for d, sl in task_slices.items():
+                    done[sl] = mask_bits(_day_mask(d), sl.stop - sl.start)
+                out_df = pd.DataFrame({"요일": tasks["day"], "유형": tasks["kind"], "할 일": tasks["text"], "완료": done})
+                st.download_button(
+                    "📥 진행상태 CSV 다운로드",
+                    data=out_df.to_csv(index=False).encode("utf-8-sig"),
+                    file_name=f"progress_{week_id}.csv",
+                    mime="text/csv",
+                )
+            else:
+                st.caption("내보낼 데이터가 없습니다.")
+
+    # ---------------------
+    # (선택) 체크 기록 기반 기간별 달성률
+    # ---------------------
+    with st.expander("📈 기간별 달성률 (체크 기록)", expanded=False):
+        c1, c2 = st.columns([1, 2])
+        by = c1.selectbox("묶음", list(GROUP_COLUMNS), format_func=GROUP_COLUMNS.get, key="history_by")
+        span = c2.date_input(
+            "기간", value=(_today - datetime.timedelta(days=90), _today), key="history_range"
         )
-    else:
-        st.caption("내보낼 데이터가 없습니다.")
+        start, end = (span + (None, None))[:2] if isinstance(span, tuple) else (span, span)
+        # 접힌 expander 안도 매번 실행되므로 켰을 때만 집계 (체크 클릭마다 전체 기록을 다시 세지 않도록)
+        # 결과는 기록 수 + 조건이 같으면 재사용
+        if st.checkbox("집계 보기", key="history_on"):
+            events, strings = event_log.read()
+            cache_key = (len(events), by, start, end, _today)
+            cached = st.session_state.get("_history_rates")
+            if cached is not None and cached[0] == cache_key:
+                history = cached[1]
+            else:
+                with tracer.span("기록 집계"):
+                    history = completion_rates((events, strings), by=by, start=start, end=end)
+                st.session_state["_history_rates"] = (cache_key, history)
+            if history.empty:
+                st.caption("기간 안의 체크 기록이 없습니다.")
+            else:
+                st.dataframe(history, hide_index=True, use_container_width=True)
+
+    if own_run:
+        tracer.end_run()
+
+
+checklist_section(tasks, task_slices, ordered_days, day_dates, week_id)
+finish_trace()
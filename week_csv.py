@@ -0,0 +1,296 @@
+"""
+주간 CSV(A=virtual, B=week) 로더 (Streamlit 없이 사용 가능)
+
+- 인코딩은 앞부분 바이트로 한 번만 판별 (실패 시 전체를 다시 파싱하지 않음)
+- A 미리보기: 보여줄 행(nrows)만 읽음 → 파일 크기와 무관
+- B: 헤더만 먼저 읽어 컬럼 매핑을 정하고, 필요한 컬럼만 청크 단위로 읽음
+  (매핑은 미리 컴파일한 별칭 표로 구하고 헤더 튜플별로 기억)
+- 해석 결과는 바이트 해시로 캐시 → 체크박스 재실행 때는 다시 파싱하지 않음
+"""
+import codecs
+import hashlib
+import io
+import json
+import re
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from workbook_cache import WorkbookCache, content_hash
+
+DAYS_KR = ["월", "화", "수", "목", "금", "토", "일"]
+
+# 앞에서부터 시도할 인코딩 (엑셀에서 저장한 CSV는 cp949인 경우가 많음)
+_ENCODINGS = ("utf-8-sig", "cp949")
+_SNIFF_BYTES = 1 << 16
+CHUNK_ROWS = 50_000
+
+# B용(week.csv) 유연 로더 — 최소 요건: 요일 + (메인 칼럼 하나) + (배경 칼럼 하나)
+HEADER_ALIASES = {
+    "day": ["요일", "day", "일자"],
+    "main": ["상세 플랜(메인)", "메인", "main", "포커스", "focus"],
+    "routine": ["상세 플랜(배경)", "배경", "routine", "background"],
+    # 추가: 날짜/자동제안 별칭
+    "date": ["날짜", "date", "일자", "날짜(yyyy-mm-dd)", "날짜(YYYY-MM-DD)"],
+    "auto_main": ["자동 제안(메인)", "자동제안(메인)", "자동제안메인", "제안(메인)", "제안메인", "auto_main", "suggest_main"],
+    "auto_routine": ["자동 제안(배경)", "자동제안(배경)", "자동제안배경", "제안(배경)", "제안배경", "auto_routine", "suggest_routine"],
+}
+
+# 출력 스키마: (별칭 키, 출력 컬럼명)
+WEEK_COLUMNS = [
+    ("day", "요일"),
+    ("date", "날짜"),
+    ("auto_main", "자동 제안(메인)"),
+    ("auto_routine", "자동 제안(배경)"),
+    ("main", "상세 플랜(메인)"),
+    ("routine", "상세 플랜(배경)"),
+]
+
+
+_WS = re.compile(r"\s+")
+
+
+def _norm_header(s: str) -> str:
+    s = str(s).strip().lower()
+    s = _WS.sub("", s)
+    return s.replace("_", "")
+
+
+class _AhoCorasick:
+    """정규화된 별칭들을 한 번에 찾는 오토마톤 (헤더 길이에 비례해 한 번만 훑음)"""
+
+    def __init__(self, patterns: dict):
+        # patterns: 패턴 문자열 → 필드 집합
+        self.goto = [{}]
+        self.fail = [0]
+        outs = [set()]
+        for pat, fields in patterns.items():
+            node = 0
+            for ch in pat:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    outs.append(set())
+                node = nxt
+            outs[node] |= set(fields)
+        # BFS로 실패 링크, 출력은 실패 링크를 따라 합침
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for ch, nxt in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                outs[nxt] |= outs[self.fail[nxt]]
+                queue.append(nxt)
+        self.out = [frozenset(o) for o in outs]
+
+    def fields_in(self, text: str) -> set:
+        """text 안에 부분 문자열로 들어 있는 별칭들의 필드"""
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        found = set()
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+
+class HeaderResolver:
+    """
+    별칭 표를 한 번만 정규화·컴파일해 두고 헤더 → 필드 매핑을 구함
+      1) 완전일치: 필드별 별칭 순서대로 dict 조회
+      2) 부분포함: 헤더마다 오토마톤 한 번 → 컬럼 순서상 첫 컬럼
+    같은 헤더 튜플의 결과는 기억해 둠 (같은 도구에서 내보낸 파일은 매핑을 다시 구하지 않음)
+    """
+
+    MAX_MEMO = 256
+
+    def __init__(self, aliases: dict):
+        self.aliases = {field: list(keys) for field, keys in aliases.items()}
+        self._exact = {field: [_norm_header(k) for k in keys] for field, keys in self.aliases.items()}
+        patterns = {}
+        for field, keys in self._exact.items():
+            for k in keys:
+                if k:
+                    patterns.setdefault(k, set()).add(field)
+        self._automaton = _AhoCorasick(patterns)
+        self.signature = hashlib.sha1(
+            json.dumps(self.aliases, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, columns) -> dict:
+        """헤더 → {필드: 원본 컬럼명 또는 None}"""
+        cols = tuple(columns)
+        fingerprint = tuple(str(c) for c in cols)
+        with self._lock:
+            hit = self._memo.get(fingerprint)
+            if hit is not None:
+                self._memo.move_to_end(fingerprint)
+                return dict(hit)
+        mapping = self._resolve(cols)
+        with self._lock:
+            self._memo[fingerprint] = mapping
+            while len(self._memo) > self.MAX_MEMO:
+                self._memo.popitem(last=False)
+        return dict(mapping)
+
+    def _resolve(self, cols) -> dict:
+        norm = [_norm_header(c) for c in cols]
+        by_norm = {n: c for n, c in zip(norm, cols)}
+        mapping = {}
+        pending = []
+        for field, keys in self._exact.items():
+            mapping[field] = next((by_norm[k] for k in keys if k in by_norm), None)
+            if mapping[field] is None:
+                pending.append(field)
+        if pending:
+            for c, n in zip(cols, norm):
+                found = self._automaton.fields_in(n)
+                for field in [f for f in pending if f in found]:
+                    mapping[field] = c
+                    pending.remove(field)
+                if not pending:
+                    break
+        return mapping
+
+
+_RESOLVER = HeaderResolver(HEADER_ALIASES)
+_RESOLVERS = {}  # 추가 별칭 표(정규화된 JSON) → HeaderResolver
+
+
+def get_header_resolver(extra_aliases: dict = None) -> HeaderResolver:
+    """
+    기본 별칭 + (선택) 사용자 등록 별칭으로 만든 리졸버.
+    사용자 별칭은 같은 필드의 기본 별칭 뒤에 붙어 우선순위가 낮음
+    """
+    if not extra_aliases:
+        return _RESOLVER
+    extra = {}
+    for f, keys in extra_aliases.items():
+        if f in HEADER_ALIASES and keys:
+            extra[f] = [str(keys)] if isinstance(keys, str) else [str(k) for k in keys]
+    key = json.dumps(extra, ensure_ascii=False, sort_keys=True)
+    resolver = _RESOLVERS.get(key)
+    if resolver is None:
+        table = {f: HEADER_ALIASES[f] + [k for k in extra.get(f, []) if k not in HEADER_ALIASES[f]]
+                 for f in HEADER_ALIASES}
+        resolver = _RESOLVERS[key] = HeaderResolver(table)
+    return resolver
+
+
+def _as_buffer(src):
+    """bytes 또는 파일 객체 → 처음으로 되감은 바이너리 버퍼 (bytes는 복사하지 않음)"""
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        return io.BytesIO(src)
+    src.seek(0)
+    return src
+
+
+def sniff_encoding(buf) -> str:
+    """앞부분(_SNIFF_BYTES)만 디코드해 보고 인코딩 결정. 버퍼 위치는 처음으로 되돌림"""
+    head = buf.read(_SNIFF_BYTES)
+    buf.seek(0)
+    for enc in _ENCODINGS:
+        try:
+            # 증분 디코더: 잘린 멀티바이트 글자가 끝에 걸려도 실패로 보지 않음
+            codecs.getincrementaldecoder(enc)().decode(head, final=False)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return _ENCODINGS[0]
+
+
+def read_csv_preview(src, nrows: int = 50) -> pd.DataFrame:
+    """앞 nrows행만 읽어서 반환 (나머지 바이트는 파싱하지 않음)"""
+    buf = _as_buffer(src)
+    enc = sniff_encoding(buf)
+    return pd.read_csv(buf, encoding=enc, nrows=nrows)
+
+
+def resolve_week_columns(columns, resolver: HeaderResolver = None) -> dict:
+    """CSV 헤더 → {별칭 키: 원본 컬럼명 또는 None}"""
+    return (resolver or _RESOLVER).resolve(columns)
+
+
+def load_week_like(src, chunksize: int = CHUNK_ROWS, resolver: HeaderResolver = None) -> pd.DataFrame:
+    """
+    CSV를 읽어 아래 6개 컬럼을 '항상' 갖도록 정규화해서 돌려줍니다.
+      - 요일, 날짜, 자동 제안(메인), 자동 제안(배경), 상세 플랜(메인), 상세 플랜(배경)
+    원본 CSV에 없으면 빈 문자열("")로 채우고, 헤더는 유연하게 매핑합니다.
+    매핑에 쓰인 컬럼만 chunksize행씩 읽으므로 메모리는 결과 크기 수준으로 유지됩니다.
+    """
+    buf = _as_buffer(src)
+    enc = sniff_encoding(buf)
+
+    # ---- 헤더만 읽어 매핑 결정 ----
+    header = pd.read_csv(buf, encoding=enc, nrows=0).columns
+    mapping = resolve_week_columns(header, resolver)
+
+    # ---- 필수 최소 요건: '요일'은 있어야 함 ----
+    if mapping["day"] is None:
+        raise ValueError(f"B 파일에 '요일'에 해당하는 칼럼이 없습니다. CSV 헤더: {list(header)}")
+
+    # 중복 헤더(a, a.1 ...)가 있어도 위치로 고르면 안전
+    positions = sorted({header.get_loc(c) for c in mapping.values() if c is not None})
+    buf.seek(0)
+    parts = []
+    # 덩어리마다 dtype을 따로 추론하면 같은 값이 "1" / "1.0"으로 갈리므로 전부 문자열로 읽음
+    for chunk in pd.read_csv(buf, encoding=enc, usecols=positions, chunksize=chunksize, dtype=str):
+        part = pd.DataFrame(index=chunk.index)
+        for key, name in WEEK_COLUMNS:
+            src_col = mapping[key]
+            # 누락된 컬럼은 빈 문자열로 채워 넣기
+            part[name] = chunk[src_col].fillna("") if src_col is not None else ""
+        part["요일"] = part["요일"].astype(str).str.strip()
+        parts.append(part)
+
+    out = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=[n for _, n in WEEK_COLUMNS])
+
+    # ---- 정리/정렬 ----
+    # 요일 카테고리 정렬 (존재하는 행만 반영)
+    cat = pd.CategoricalDtype(categories=DAYS_KR, ordered=True)
+    out["요일"] = pd.Categorical(out["요일"].astype(str), dtype=cat)
+    out = out.sort_values("요일").reset_index(drop=True)
+    return out
+
+
+# ---- 해석 결과 캐시 (키: "A<행 수>:" / "B<별칭 표 서명>:" + 바이트 해시) ----
+_CACHE = WorkbookCache(max_entries=16)
+
+
+def get_week_cache() -> WorkbookCache:
+    return _CACHE
+
+
+def blob_digest(blob: dict) -> str:
+    """세션에 고정된 {name, bytes} → 내용 해시 (한 번만 계산해 blob에 보관)"""
+    if not blob.get("digest"):
+        blob["digest"] = content_hash(blob["bytes"])
+    return blob["digest"]
+
+
+def cached_preview(blob: dict, nrows: int = 50) -> pd.DataFrame:
+    entry = _CACHE.get_or_load(
+        blob["bytes"], lambda data: ((), read_csv_preview(data, nrows)), digest=f"A{nrows}:{blob_digest(blob)}"
+    )
+    return entry.frame
+
+
+def cached_week(blob: dict, resolver: HeaderResolver = None):
+    """B 해석 결과 캐시 항목 (frame = load_week_like 결과, 파생 결과는 derive로 보관)"""
+    resolver = resolver or _RESOLVER
+    return _CACHE.get_or_load(
+        blob["bytes"],
+        lambda data: ((), load_week_like(data, resolver=resolver)),
+        digest=f"B{resolver.signature}:{blob_digest(blob)}",
+    )
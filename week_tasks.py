@@ -0,0 +1,106 @@
+"""
+B(week.csv) → 긴 형식 태스크 테이블 (요일마다 메인 → 배경 순)
+
+  day, kind("[메인]"|"[배경]"), text, position(요일 안 순서), key(체크박스 키), label("[메인] 텍스트")
+
+셀마다 파이썬으로 쪼개는 대신 구분자를 한꺼번에 "|"로 맞춘 뒤 split/explode로 펼칩니다.
+B 파일(과 week_id)당 한 번만 만들고, 체크리스트/주간 집계/내보내기가 모두 이 테이블을 읽습니다.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from week_csv import DAYS_KR
+
+KIND_MAIN = "[메인]"
+KIND_ROUTINE = "[배경]"
+# (출력 kind, B 컬럼)
+_KIND_COLUMNS = ((KIND_MAIN, "상세 플랜(메인)"), (KIND_ROUTINE, "상세 플랜(배경)"))
+
+TASK_COLUMNS = ["day", "kind", "text", "position", "key", "label"]
+
+
+def _stable_task_key(week_id: str, day: str, prefix: str, text: str) -> str:
+    raw = f"{week_id}|{day}|{prefix}|{text}"
+    return "chk_" + hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def split_tasks(cells: pd.Series) -> pd.Series:
+    """
+    셀 → 태스크 텍스트 (셀 하나당 여러 행, 인덱스는 원래 셀 것 유지)
+    구분자 우선순위: "|" → 줄바꿈 → ","  (셀마다 하나만 사용), 앞뒤 공백 제거 후 빈 항목은 버림
+    """
+    s = cells.where(cells.notna(), "").astype(str)
+    has_pipe = s.str.contains("|", regex=False)
+    has_nl = ~has_pipe & s.str.contains("\n", regex=False)
+    has_comma = ~has_pipe & ~has_nl & s.str.contains(",", regex=False)
+    # "|"가 없는 셀만 바꾸므로 원래 텍스트와 섞이지 않음
+    s = s.mask(has_nl, s.str.replace("\n", "|", regex=False))
+    s = s.mask(has_comma, s.str.replace(",", "|", regex=False))
+    parts = s.str.split("|", regex=False).explode().str.strip()
+    return parts[parts.notna() & (parts != "")]
+
+
+def week_days(B_df: pd.DataFrame) -> list:
+    """B에 행이 있는 요일 (요일 순서)"""
+    present = set(B_df["요일"].dropna().astype(str))
+    return [d for d in DAYS_KR if d in present]
+
+
+def week_dates(B_df: pd.DataFrame) -> dict:
+    """요일 → ISO 날짜 (B의 날짜 칸을 읽을 수 있는 요일만, 같은 요일이 여러 행이면 마지막 행)"""
+    if "날짜" not in B_df.columns:
+        return {}
+    rows = B_df[B_df["요일"].notna()].drop_duplicates("요일", keep="last")
+    dates = pd.to_datetime(rows["날짜"], errors="coerce")
+    return {str(d): ts.date().isoformat() for d, ts in zip(rows["요일"], dates) if not pd.isna(ts)}
+
+
+def build_task_table(B_df: pd.DataFrame, week_id: str) -> pd.DataFrame:
+    """load_week_like 결과 → 태스크 테이블 (TASK_COLUMNS, 요일 → 메인 → 배경 → 셀 안 순서)"""
+    rows = B_df[B_df["요일"].notna()]
+    # 같은 요일이 여러 행이면 마지막 행이 이김 (기존 B_map과 동일)
+    rows = rows.drop_duplicates("요일", keep="last")
+    day = rows["요일"].astype(str)
+
+    parts = []
+    for order, (kind, col) in enumerate(_KIND_COLUMNS):
+        if col not in rows.columns:
+            continue
+        text = split_tasks(rows[col])
+        parts.append(pd.DataFrame({
+            "day": day.loc[text.index].to_numpy(),
+            "kind": kind,
+            "text": text.to_numpy(),
+            "_order": order,
+        }))
+    if not parts:
+        return pd.DataFrame(columns=TASK_COLUMNS)
+    tasks = pd.concat(parts, ignore_index=True)
+    if tasks.empty:
+        return pd.DataFrame(columns=TASK_COLUMNS)
+
+    day_rank = tasks["day"].map({d: i for i, d in enumerate(DAYS_KR)})
+    tasks = (
+        tasks.assign(_day=day_rank, _seq=np.arange(len(tasks)))
+        .sort_values(["_day", "_order", "_seq"], kind="stable")
+        .reset_index(drop=True)
+    )
+    tasks["position"] = tasks.groupby("day", sort=False).cumcount()
+    tasks["label"] = tasks["kind"] + " " + tasks["text"]
+    # 체크박스 키(md5)는 여기서 한 번에 계산
+    tasks["key"] = [
+        _stable_task_key(week_id, d, k, t) for d, k, t in zip(tasks["day"], tasks["kind"], tasks["text"])
+    ]
+    return tasks[TASK_COLUMNS]
+
+
+def day_slices(tasks: pd.DataFrame) -> dict:
+    """요일 → 테이블 안 [시작, 끝) 구간 (테이블은 요일 순으로 연속)"""
+    if tasks.empty:
+        return {}
+    day = tasks["day"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+    stops = np.r_[starts[1:], len(day)]
+    return {day[a]: slice(int(a), int(b)) for a, b in zip(starts, stops)}
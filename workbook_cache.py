@@ -0,0 +1,188 @@
+"""
+업로드된 목표 엑셀(xlsx)의 해석 결과 캐시
+
+- 키: 업로드 바이트의 sha256 해시 (같은 파일이면 재파싱하지 않음)
+- 값: 시트 목록, 필터된 목표 df, 파생 결과(목표 테이블, 월별 파싱 결과 등)
+- LRU 제거 + 메모리 상한(TIME_APP_CACHE_MB, 기본 256MB)
+- 메모리에 없으면 디스크 캐시(disk_cache.py)를 먼저 확인: 목표 df와 목표 테이블을 이진으로 저장해 두어
+  서버 재시작/배치 작업에서도 같은 파일은 openpyxl을 거치지 않음
+  (디스크 캐시는 loader가 load_goal_workbook, 파생 이름이 persist에 있는 것만 저장한다고 가정)
+Streamlit은 매 상호작용마다 스크립트를 다시 실행하지만, import된 모듈은 유지되므로
+이 모듈의 전역 캐시는 세션/재실행 사이에서 공유됩니다.
+"""
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from disk_cache import default_disk_cache
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get("TIME_APP_CACHE_MB", "256")) * 1024 * 1024)
+DEFAULT_MAX_ENTRIES = 32
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _approx_size(obj, _seen=None) -> int:
+    """dict/list/str 중첩 구조의 대략적인 메모리 사용량(바이트)"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    if hasattr(obj, "memory_usage"):  # DataFrame / Series
+        try:
+            usage = obj.memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+        except Exception:
+            pass
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += _approx_size(k, _seen) + _approx_size(v, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for x in obj:
+            size += _approx_size(x, _seen)
+    return size
+
+
+class WorkbookEntry:
+    """워크북 1개에 대한 캐시 항목 (화면 코드에서는 읽기 전용으로 사용)"""
+    __slots__ = ("digest", "sheet_names", "frame", "derived", "nbytes", "on_disk")
+
+    def __init__(self, digest, sheet_names, frame, derived=None):
+        self.digest = digest
+        self.sheet_names = list(sheet_names)
+        self.frame = frame
+        self.derived = dict(derived or {})  # 이름 → 파생 결과
+        self.nbytes = _approx_size(self.sheet_names) + _approx_size(frame) + _approx_size(self.derived)
+        self.on_disk = False  # 디스크 캐시에 persist 결과까지 저장되어 있는지
+
+
+class WorkbookCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 disk=None, persist=("goal_table",)):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.disk = disk  # DiskCache 또는 None
+        self.persist = tuple(persist)
+        self._entries = OrderedDict()  # digest → WorkbookEntry (뒤쪽일수록 최근 사용)
+        self._lock = threading.RLock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, digest: str):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+            return entry
+
+    def get_or_load(self, data: bytes, loader, digest: str = None):
+        """
+        loader(data) -> (sheet_names, frame)
+        같은 내용의 파일이면 loader를 다시 호출하지 않습니다.
+        digest를 미리 계산해 두었다면 넘겨서 매번 해시하지 않게 할 수 있습니다.
+        """
+        digest = digest or content_hash(data)
+        entry = self.get(digest)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        stored = self.disk.get(digest) if self.disk is not None else None
+        if stored is not None:
+            tables = stored["tables"]
+            entry = WorkbookEntry(digest, stored["sheet_names"], tables.pop("frame"), tables)
+            entry.on_disk = True
+        else:
+            sheet_names, frame = loader(data)
+            entry = WorkbookEntry(digest, sheet_names, frame)
+        with self._lock:
+            old = self._entries.pop(digest, None)
+            if old is not None:
+                self.total_bytes -= old.nbytes
+            self._entries[digest] = entry
+            self.total_bytes += entry.nbytes
+            self._evict(keep=digest)
+        return entry
+
+    def derive(self, entry: WorkbookEntry, name, builder):
+        """
+        워크북에서 파생된 결과를 항목 안에 보관. builder(frame) -> 결과
+        """
+        if name in entry.derived:
+            return entry.derived[name]
+        result = builder(entry.frame)
+        with self._lock:
+            if name not in entry.derived:
+                entry.derived[name] = result
+                added = _approx_size(result)
+                entry.nbytes += added
+                if self._entries.get(entry.digest) is entry:
+                    self.total_bytes += added
+                    self._evict(keep=entry.digest)
+        if name in self.persist:
+            self._persist(entry)
+        return entry.derived[name]
+
+    def _persist(self, entry: WorkbookEntry):
+        """persist 결과가 모두 만들어지면 디스크에 한 번 기록"""
+        if self.disk is None or entry.on_disk or any(n not in entry.derived for n in self.persist):
+            return
+        tables = {"frame": entry.frame, **{n: entry.derived[n] for n in self.persist}}
+        try:
+            entry.on_disk = self.disk.put(entry.digest, entry.sheet_names, tables)
+        except OSError:  # 디스크 캐시는 있으면 좋은 것 — 실패해도 화면은 계속
+            entry.on_disk = False
+
+    def month_goals(self, entry: WorkbookEntry, month, builder):
+        """월별 파싱 결과. builder(frame, month) -> 결과"""
+        return self.derive(entry, ("month", month), lambda frame: builder(frame, month))
+
+    def _evict(self, keep=None):
+        # 오래된 것부터 제거. 방금 쓴 항목(keep)은 상한을 넘더라도 남겨둠
+        while self._entries and (
+            self.total_bytes > self.max_bytes or len(self._entries) > self.max_entries
+        ):
+            digest = next(iter(self._entries))
+            if digest == keep:
+                if len(self._entries) == 1:
+                    break
+                self._entries.move_to_end(digest)
+                continue
+            old = self._entries.pop(digest)
+            self.total_bytes -= old.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        disk = self.disk.stats() if self.disk is not None else {}
+        return {
+            **disk,
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_CACHE = WorkbookCache(disk=default_disk_cache())
+
+
+def get_workbook_cache() -> WorkbookCache:
+    return _CACHE